@@ -1,12 +1,202 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from datetime import datetime
+import bisect
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import threading
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from db import Task, Goal, Event, Base
-import json
+from client import API_BASE_URL, ApiError, BusynessClient
+
+# Seconds between status checks while a calendar sync job runs
+SYNC_POLL_INTERVAL = 1.0
+
+# Threads for API calls; with the change feed's own thread, at most the client's POOL_SIZE
+# so each keeps its own keep-alive connection
+EXECUTOR_WORKERS = 5
+
+# Seconds to wait before reconnecting to the change feed after it drops
+CHANGES_RETRY_INTERVAL = 5.0
+
+FORECAST_RANK = {"Short": 1, "Medium": 2, "Long": 3}
+
+# Rows added to an active list at a time; more are added as it scrolls near the end
+RENDER_CHUNK = 200
+
+
+def task_display_text(task):
+    """One line in the Active Tasks list."""
+    # Priority indicators
+    priority_indicator = "🔥" if task["priority"] >= 8 else "⚡" if task["priority"] >= 6 else "📋"
+
+    display_text = f"{priority_indicator} {task['title']} (Priority: {task['priority']})"
+    if task["due_date"]:
+        display_text += f" - Due: {task['due_date'][:10]}"
+    if task["goal_title"]:
+        display_text += f" - Goal: {task['goal_title']}"
+    return display_text
+
+
+def goal_display_text(goal):
+    """One line in the Active Goals list."""
+    # Priority and forecast indicators
+    priority_indicator = "🎯" if goal["priority"] >= 8 else "📍" if goal["priority"] >= 6 else "📌"
+    forecast_indicator = "🌙" if goal["forecast"] == "Long" else "⛰️" if goal["forecast"] == "Medium" else "🏃" if goal["forecast"] == "Short" else ""
+
+    display_text = f"{priority_indicator} {goal['goal']} (Priority: {goal['priority']})"
+    if goal["forecast"]:
+        display_text += f" - {forecast_indicator} {goal['forecast']} term"
+    return display_text
+
+
+def task_sort_key(task):
+    """Priority desc, newest first (the API's order)."""
+    return (-task["priority"], -task["id"])
+
+
+def goal_sort_key(goal):
+    """Priority desc, then longer forecasts first, newest first (the API's order)."""
+    return (-goal["priority"], -FORECAST_RANK.get(goal["forecast"], 0), -goal["id"])
+
+
+class LazyTreeview(ttk.Frame):
+    """
+    Scrollable single-column Treeview whose row ids are entity primary keys.
+
+    Rows are labelled with text_for(item) and shown in the order set_rows()
+    gets them, which is the API's; set_rows() only creates RENDER_CHUNK rows
+    and the next chunk is created when the view scrolls near its end, so
+    showing 10,000 tasks costs about the same as showing 200. upsert() and
+    remove() change one row in place, finding it by sort_key(item), which
+    must give the same order as the API.
+    """
+
+    def __init__(self, parent, text_for, sort_key, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.tree = ttk.Treeview(self, show="tree", selectmode="browse")
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self._items = []
+        self._text_for = text_for
+        self._sort_key = sort_key
+        self._rendered = 0
+        self._render_pending = False
+
+    def set_rows(self, items):
+        """Replace the rows with items (dicts with an "id"), already in display order."""
+        self.tree.delete(*self.tree.get_children())
+        self._items = list(items)
+        self._rendered = 0
+        self._render_more()
+
+    def upsert(self, item):
+        """Show item in its sorted place, replacing the row with the same key if there is one."""
+        self.remove(item)
+        index = bisect.bisect_left(self._items, self._sort_key(item), key=self._sort_key)
+        self._items.insert(index, item)
+        # Only rows inside the rendered prefix (or at the end of a fully rendered list) get created now
+        if index < self._rendered or self._rendered == len(self._items) - 1:
+            self.tree.insert("", index, iid=str(item["id"]), text=self._text_for(item))
+            self._rendered += 1
+
+    def remove(self, item):
+        """Drop item's row. item must have the sort key it was shown with."""
+        index = bisect.bisect_left(self._items, self._sort_key(item), key=self._sort_key)
+        if index < len(self._items) and self._items[index]["id"] == item["id"]:
+            del self._items[index]
+            if index < self._rendered:
+                self.tree.delete(str(item["id"]))
+                self._rendered -= 1
+
+    def rows(self):
+        """Every item, rendered or not, in display order."""
+        return list(self._items)
+
+    def _render_more(self):
+        self._render_pending = False
+        for item in self._items[self._rendered:self._rendered + RENDER_CHUNK]:
+            self.tree.insert("", tk.END, iid=str(item["id"]), text=self._text_for(item))
+        self._rendered = min(len(self._items), self._rendered + RENDER_CHUNK)
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if float(last) > 0.9 and self._rendered < len(self._items) and not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render_more)
+
+    def selected_id(self):
+        """Primary key of the selected row, or None."""
+        selection = self.tree.selection()
+        return int(selection[0]) if selection else None
+
+    def select_at(self, y):
+        """Select the row under the pointer, so right-click acts on it."""
+        row = self.tree.identify_row(y)
+        if row:
+            self.tree.selection_set(row)
+
+
+class RequestExecutor:
+    """
+    Runs the GUI's network calls on a small thread pool and hands the results
+    back to the Tk main loop.
+
+    Workers share the app's BusynessClient, so they all reuse its keep-alive
+    connections. on_success/on_error callbacks always run on the main thread.
+    shutdown() cancels calls still queued and drops results that arrive later;
+    long-running calls should watch the stopping event.
+    """
+
+    def __init__(self, root, workers=EXECUTOR_WORKERS, on_busy_change=None):
+        self.root = root
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bb-request")
+        self.stopping = threading.Event()
+        self.on_busy_change = on_busy_change
+        self._in_flight = 0  # only touched on the main thread
+
+    def submit(self, fn, *args, on_success=None, on_error=None):
+        """Run fn(*args) on a worker, then on_success(result) or on_error(exception) on the main thread."""
+        if self.stopping.is_set():
+            return None
+        future = self.pool.submit(fn, *args)
+        self._set_in_flight(self._in_flight + 1)
+        future.add_done_callback(lambda f: self.post(self._deliver, f, on_success, on_error))
+        return future
+
+    def post(self, fn, *args):
+        """Schedule fn(*args) on the main loop; safe to call from a worker."""
+        if self.stopping.is_set():
+            return
+        try:
+            self.root.after(0, fn, *args)
+        except (RuntimeError, tk.TclError):
+            # The window closed while the call was running
+            pass
+
+    def shutdown(self):
+        """Cancel queued calls and drop any results still to come."""
+        self.stopping.set()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def _deliver(self, future, on_success, on_error):
+        self._set_in_flight(self._in_flight - 1)
+        if self.stopping.is_set() or future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            if on_success:
+                on_success(future.result())
+        elif on_error:
+            on_error(error)
+        else:
+            raise error
+
+    def _set_in_flight(self, count):
+        was_busy, self._in_flight = self._in_flight > 0, count
+        if self.on_busy_change and was_busy != (count > 0):
+            self.on_busy_change(count > 0)
 
 
 class BusynessBusterApp:
@@ -14,26 +204,69 @@ class BusynessBusterApp:
         self.root = root
         self.root.title("Busyness Buster")
         self.root.geometry("800x600")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # All data goes through the REST API (set BUSYNESS_API_URL for a remote server)
+        self.api = BusynessClient()
 
-        # API base URL
-        self.api_base_url = "http://localhost:8000"
+        # Busy indicator along the bottom of the window, shown while any request runs
+        status_bar = ttk.Frame(self.root, padding=(10, 0, 10, 5))
+        status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.busy_bar = ttk.Progressbar(status_bar, mode="indeterminate", length=120)
+        self.busy_bar.pack(side=tk.RIGHT)
+        self.busy_label = ttk.Label(status_bar, text="")
+        self.busy_label.pack(side=tk.RIGHT, padx=5)
+        self.status_label = ttk.Label(status_bar, text="")
+        self.status_label.pack(side=tk.LEFT)
+
+        # Every network call runs here, never on the Tk main loop
+        self.executor = RequestExecutor(self.root, on_busy_change=self.set_busy)
+        # Row changes seen by the client (our own writes and the server's change feed) come back as deltas
+        self.api.on_change = lambda deltas: self.executor.post(self.apply_deltas, deltas)
 
         # Auth state
-        self.access_token = None
         self.current_user_id = None
         self.current_username = None
 
-        # Database session (initialized after login)
-        self.db_session = None
+        # Rows shown in the Active Items lists, by primary key
+        self.task_rows = {}
+        self.goal_rows = {}
 
         # Show login screen first
         self.show_login_screen()
 
-    def get_auth_headers(self):
-        """Return headers with JWT token for API requests."""
-        if self.access_token:
-            return {"Authorization": f"Bearer {self.access_token}"}
-        return {}
+    def on_close(self):
+        """Stop background requests, then close the window."""
+        self.executor.shutdown()
+        # Cuts off the change feed and any analysis still streaming, so no worker keeps the process alive
+        self.api.close()
+        self.root.destroy()
+
+    def set_busy(self, busy):
+        if busy:
+            self.busy_label.config(text="Working...")
+            self.busy_bar.start(10)
+        else:
+            self.busy_label.config(text="")
+            self.busy_bar.stop()
+
+    def show_request_error(self, error, title="Error", action="Request failed"):
+        """Report an exception raised by a BusynessClient call."""
+        if isinstance(error, requests.exceptions.ConnectionError):
+            messagebox.showerror("Connection Error",
+                f"Could not connect to the server at {API_BASE_URL}.\nMake sure the backend is running.")
+        elif isinstance(error, ApiError):
+            messagebox.showerror(title, f"{action}: {error.detail}")
+        else:
+            messagebox.showerror(title, f"{action}: {str(error)}")
+
+    def _saved(self, message, then=None):
+        """on_success callback for a create, update or delete: run then() and confirm (the lists update themselves)."""
+        def done(_result):
+            if then:
+                then()
+            messagebox.showinfo("Success", message)
+        return done
 
     def show_login_screen(self):
         """Display the login screen."""
@@ -59,8 +292,8 @@ class BusynessBusterApp:
         self.login_password.grid(row=1, column=1, pady=5)
 
         # Login button
-        login_btn = ttk.Button(form_frame, text="Login", command=self.do_login)
-        login_btn.grid(row=2, column=0, columnspan=2, pady=20)
+        self.login_btn = ttk.Button(form_frame, text="Login", command=self.do_login)
+        self.login_btn.grid(row=2, column=0, columnspan=2, pady=20)
 
         # Bind Enter key to login
         self.login_password.bind("<Return>", lambda e: self.do_login())
@@ -78,36 +311,31 @@ class BusynessBusterApp:
             messagebox.showerror("Error", "Please enter username and password")
             return
 
-        try:
-            response = requests.post(
-                f"{self.api_base_url}/auth/login",
-                json={"username": username, "password": password},
-                timeout=5
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                self.access_token = data["access_token"]
-                self.current_user_id = data["user_id"]
-                self.current_username = data["username"]
-
-                # Destroy login screen and initialize main app
-                self.login_frame.destroy()
-                self.initialize_main_app()
-            else:
-                messagebox.showerror("Login Failed", "Invalid username or password")
-
-        except requests.exceptions.ConnectionError:
-            messagebox.showerror("Connection Error",
-                "Could not connect to the server.\nMake sure the backend is running.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Login failed: {str(e)}")
+        self.login_btn.config(state=tk.DISABLED)
+        self.executor.submit(self.api.login, username, password,
+                             on_success=self._on_login, on_error=self._on_login_error)
+
+    def _on_login(self, data):
+        self.current_user_id = data["user_id"]
+        self.current_username = data["username"]
+
+        # Destroy login screen and initialize main app
+        self.login_frame.destroy()
+        self.initialize_main_app()
+        # Its own thread, not the executor: it runs all session, so it would hold a worker and keep the busy bar on
+        threading.Thread(target=self._follow_changes, name="bb-changes", daemon=True).start()
+
+    def _on_login_error(self, error):
+        self.login_btn.config(state=tk.NORMAL)
+        if isinstance(error, ApiError) and error.status_code == 429:
+            messagebox.showerror("Login Failed", error.detail)
+        elif isinstance(error, ApiError):
+            messagebox.showerror("Login Failed", "Invalid username or password")
+        else:
+            self.show_request_error(error, action="Login failed")
 
     def initialize_main_app(self):
         """Initialize the main application after successful login."""
-        # Initialize database connection
-        self.setup_database()
-
         # Create main notebook for tabs
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -121,17 +349,6 @@ class BusynessBusterApp:
         # Update window title with username
         self.root.title(f"Busyness Buster - {self.current_username}")
         
-    def setup_database(self):
-        """Initialize database connection"""
-        try:
-            # Direct database connection for GUI
-            engine = create_engine("sqlite:///busyness.db")
-            SessionLocal = sessionmaker(bind=engine)
-            self.db_session = SessionLocal()
-        except Exception as e:
-            messagebox.showerror("Database Error", f"Failed to connect to database: {str(e)}")
-            self.db_session = None
-            
     def create_tasks_tab(self):
         # Tasks tab
         tasks_frame = ttk.Frame(self.notebook)
@@ -163,7 +380,8 @@ class BusynessBusterApp:
         ttk.Label(input_frame, text="Goal:").grid(row=3, column=0, sticky=tk.W, pady=2)
         self.task_goal_id = ttk.Combobox(input_frame, state="readonly")
         self.task_goal_id.grid(row=3, column=1, sticky=tk.W, padx=(5, 0), pady=2)
-        self.populate_goals_combobox()
+        self.task_goal_id['values'] = ["None"]
+        self.task_goal_id.set("None")  # filled in when the active lists load
         
         # Due date
         ttk.Label(input_frame, text="Due Date:").grid(row=4, column=0, sticky=tk.W, pady=2)
@@ -232,30 +450,30 @@ class BusynessBusterApp:
         tasks_frame = ttk.LabelFrame(paned, text="Active Tasks", padding="5")
         paned.add(tasks_frame, weight=1)
         
-        self.active_tasks_listbox = tk.Listbox(tasks_frame)
-        self.active_tasks_listbox.pack(fill=tk.BOTH, expand=True)
+        self.active_tasks_view = LazyTreeview(tasks_frame, task_display_text, task_sort_key)
+        self.active_tasks_view.pack(fill=tk.BOTH, expand=True)
         
         # Add context menu for tasks
         self.tasks_context_menu = tk.Menu(self.root, tearoff=0)
         self.tasks_context_menu.add_command(label="Edit Task", command=self.edit_selected_task)
         self.tasks_context_menu.add_command(label="Delete Task", command=self.delete_selected_task)
-        self.active_tasks_listbox.bind("<Button-3>", self.show_tasks_context_menu)
+        self.active_tasks_view.tree.bind("<Button-3>", self.show_tasks_context_menu)
         
         # Active goals
         goals_frame = ttk.LabelFrame(paned, text="Active Goals", padding="5")
         paned.add(goals_frame, weight=1)
         
-        self.active_goals_listbox = tk.Listbox(goals_frame)
-        self.active_goals_listbox.pack(fill=tk.BOTH, expand=True)
+        self.active_goals_view = LazyTreeview(goals_frame, goal_display_text, goal_sort_key)
+        self.active_goals_view.pack(fill=tk.BOTH, expand=True)
         
         # Add context menu for goals
         self.goals_context_menu = tk.Menu(self.root, tearoff=0)
         self.goals_context_menu.add_command(label="Edit Goal", command=self.edit_selected_goal)
         self.goals_context_menu.add_command(label="Delete Goal", command=self.delete_selected_goal)
-        self.active_goals_listbox.bind("<Button-3>", self.show_goals_context_menu)
+        self.active_goals_view.tree.bind("<Button-3>", self.show_goals_context_menu)
         
         # Refresh button
-        refresh_btn = ttk.Button(active_frame, text="Refresh", command=self.refresh_active)
+        refresh_btn = ttk.Button(active_frame, text="Refresh", command=lambda: self.refresh_active(reload=True))
         refresh_btn.pack(pady=5)
         
         # Load active items
@@ -281,6 +499,12 @@ class BusynessBusterApp:
         ttk.Label(analysis_section, text="Analyze your productivity patterns").pack(anchor=tk.W)
         analyze_btn = ttk.Button(analysis_section, text="Analyze", command=self.analyze_data)
         analyze_btn.pack(pady=5)
+        week_btn = ttk.Button(analysis_section, text="Review Last 7 Days", command=lambda: self.analyze_data(days=7))
+        week_btn.pack(pady=5)
+        # Off: clear-cut days get a quick local verdict instead of a GPT write-up
+        self.narrative_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(analysis_section, text="Always ask GPT for a full analysis",
+                        variable=self.narrative_var).pack(anchor=tk.W)
         
         # Analysis results
         self.analysis_text = tk.Text(analysis_section, height=15, width=70)
@@ -293,20 +517,11 @@ class BusynessBusterApp:
         self.goal_priority_label.config(text=f"{int(float(value))}")
         
     def populate_goals_combobox(self):
-        """Populate the goals combobox with active goals for current user"""
-        if not self.db_session or not self.current_user_id:
-            return
-
-        try:
-            active_goals = self.db_session.query(Goal).filter(
-                Goal.accomplished == False,
-                Goal.user_id == self.current_user_id
-            ).all()
-            goal_options = ["None"] + [f"{goal.goal} (ID: {goal.id})" for goal in active_goals]
-            self.task_goal_id['values'] = goal_options
+        """Offer the active goals in the new-task goal picker, keeping the current choice if it still exists"""
+        goal_options = ["None"] + [f"{goal['goal']} (ID: {goal['id']})" for goal in self.active_goals_view.rows()]
+        self.task_goal_id['values'] = goal_options
+        if self.task_goal_id.get() not in goal_options:
             self.task_goal_id.set("None")
-        except Exception as e:
-            print(f"Error populating goals: {e}")
         
     def add_task(self):
         title = self.task_title.get().strip()
@@ -336,28 +551,14 @@ class BusynessBusterApp:
                 messagebox.showerror("Error", "Invalid date format. Use YYYY-MM-DD")
                 return
         
-        try:
-            # Create task in database
-            task = Task(
-                title=title,
-                priority=priority,
-                due_date=due_date,
-                completed=False,
-                goal_id=goal_id,
-                user_id=self.current_user_id,
-            )
-
-            self.db_session.add(task)
-            self.db_session.commit()
-            
-            self.clear_task_form()
-            messagebox.showinfo("Success", "Task added successfully!")
-            self.refresh_active()
-            self.populate_goals_combobox()  # Refresh goals list
-            
-        except Exception as e:
-            self.db_session.rollback()
-            messagebox.showerror("Error", f"Failed to add task: {str(e)}")
+        self.executor.submit(self.api.create_task, {
+            "title": title,
+            "priority": priority,
+            "due_date": due_date.isoformat() if due_date else None,
+            "completed": False,
+            "goal_id": goal_id,
+        }, on_success=self._saved("Task added successfully!", then=self.clear_task_form),
+           on_error=lambda e: self.show_request_error(e, action="Failed to add task"))
         
     def add_goal(self):
         title = self.goal_title.get().strip()
@@ -368,27 +569,13 @@ class BusynessBusterApp:
             messagebox.showerror("Error", "Please enter a goal title")
             return
         
-        try:
-            # Create goal in database
-            goal = Goal(
-                goal=title,  # Using 'goal' field as per database schema
-                priority=priority,
-                accomplished=False,
-                forecast=forecast,
-                user_id=self.current_user_id,
-            )
-
-            self.db_session.add(goal)
-            self.db_session.commit()
-            
-            self.clear_goal_form()
-            messagebox.showinfo("Success", "Goal added successfully!")
-            self.refresh_active()
-            self.populate_goals_combobox()  # Refresh goals list
-            
-        except Exception as e:
-            self.db_session.rollback()
-            messagebox.showerror("Error", f"Failed to add goal: {str(e)}")
+        self.executor.submit(self.api.create_goal, {
+            "goal": title,  # Using 'goal' field as per database schema
+            "priority": priority,
+            "accomplished": False,
+            "forecast": forecast,
+        }, on_success=self._saved("Goal added successfully!", then=self.clear_goal_form),
+           on_error=lambda e: self.show_request_error(e, action="Failed to add goal"))
         
     def clear_task_form(self):
         self.task_title.delete(0, tk.END)
@@ -402,140 +589,158 @@ class BusynessBusterApp:
         self.goal_priority.set(6)
         self.goal_forecast.set("Medium")
         
-    def refresh_active(self):
-        """Refresh the active tasks and goals lists with proper ordering"""
-        if not self.db_session or not self.current_user_id:
+    def refresh_active(self, reload=False):
+        """Show the active tasks and goals lists, loading them first if the client doesn't have them (or reload=True)"""
+        if not self.current_user_id:
             return
 
-        # Clear existing items
-        self.active_tasks_listbox.delete(0, tk.END)
-        self.active_goals_listbox.delete(0, tk.END)
+        self.executor.submit(self._load_active, reload, on_success=lambda _: self._show_active(),
+                             on_error=lambda e: self.show_request_error(e, action="Failed to refresh data"))
 
-        try:
-            # Load and display tasks (ordered by priority desc, then goal association)
-            active_tasks = self.db_session.query(Task).filter(
-                Task.completed == False,
-                Task.user_id == self.current_user_id
-            ).order_by(
-                Task.priority.desc(), Task.goal_id.asc().nullsfirst()
-            ).all()
-
-            for task in active_tasks:
-                # Priority indicators
-                priority_indicator = "🔥" if task.priority >= 8 else "⚡" if task.priority >= 6 else "📋"
-
-                display_text = f"{priority_indicator} {task.title} (Priority: {task.priority})"
-                if task.due_date:
-                    display_text += f" - Due: {task.due_date.strftime('%Y-%m-%d')}"
-                if task.goal_id:
-                    goal = self.db_session.query(Goal).filter(Goal.id == task.goal_id).first()
-                    if goal:
-                        display_text += f" - Goal: {goal.goal}"
-
-                self.active_tasks_listbox.insert(tk.END, display_text)
-
-            # Load and display goals (ordered by priority desc, then forecast length)
-            forecast_order = {'Long': 3, 'Medium': 2, 'Short': 1}
-            active_goals = self.db_session.query(Goal).filter(
-                Goal.accomplished == False,
-                Goal.user_id == self.current_user_id
-            ).all()
-            
-            sorted_goals = sorted(active_goals, key=lambda g: (
-                -g.priority,  # Descending priority
-                -(forecast_order.get(g.forecast, 0))  # Descending forecast length
-            ))
-            
-            for goal in sorted_goals:
-                # Priority and forecast indicators
-                priority_indicator = "🎯" if goal.priority >= 8 else "📍" if goal.priority >= 6 else "📌"
-                forecast_indicator = "🌙" if goal.forecast == "Long" else "⛰️" if goal.forecast == "Medium" else "🏃" if goal.forecast == "Short" else ""
-                
-                display_text = f"{priority_indicator} {goal.goal} (Priority: {goal.priority})"
-                if goal.forecast:
-                    display_text += f" - {forecast_indicator} {goal.forecast} term"
-                self.active_goals_listbox.insert(tk.END, display_text)
-                
-        except Exception as e:
-            messagebox.showerror("Database Error", f"Failed to refresh data: {str(e)}")
-                
-    def sync_events(self):
-        """Sync events from Google Calendar using the FastAPI backend"""
-        headers = self.get_auth_headers()
+    def _load_active(self, reload):
+        """Runs on a worker: make sure both lists are in the client's cache"""
+        if reload:
+            self.api.invalidate()
+        # Tasks arrive with their goal titles embedded: one API call per 500 tasks, no per-task lookups
+        self.api.active_tasks()
+        self.api.active_goals()
 
-        def sync_thread():
+    def _show_active(self):
+        # Read the cache here, on the main thread, so deltas posted after this point apply on top of it
+        cached = self.api.cached_active()
+        if cached is None:
+            return  # invalidated again since; the refresh that did it will show the lists
+        tasks, goals = cached
+        self.task_rows = {task["id"]: task for task in tasks}
+        self.active_tasks_view.set_rows(tasks)
+        self.goal_rows = {goal["id"]: goal for goal in goals}
+        self.active_goals_view.set_rows(goals)
+        self.populate_goals_combobox()
+
+    def apply_deltas(self, deltas):
+        """Change just the rows in deltas ([(kind, old, new), ...] from the client) instead of reloading the lists"""
+        if not self.current_user_id:
+            return
+        for kind, old, new in deltas:
+            rows, view = (self.task_rows, self.active_tasks_view) if kind == "task" else (self.goal_rows, self.active_goals_view)
+            if old is not None:
+                rows.pop(old["id"], None)
+                view.remove(old)
+            if new is not None:
+                rows[new["id"]] = new
+                view.upsert(new)
+        if any(kind == "goal" for kind, _, _ in deltas):
+            self.populate_goals_combobox()
+
+    def _follow_changes(self):
+        """Runs on its own thread for the whole session: feed the server's change events to the client's cache"""
+        connected_before = False
+        while not self.executor.stopping.is_set():
             try:
-                response = requests.post(f"{self.api_base_url}/events/sync", headers=headers)
-                
-                if response.status_code == 200:
-                    events = response.json()
-                    self.root.after(0, lambda: messagebox.showinfo("Sync Complete", f"Synced {len(events)} events from Google Calendar!"))
-                elif response.status_code == 401:
-                    # Authentication error - likely stale token
-                    try:
-                        error_detail = response.json().get("detail", "Authentication failed")
-                        self.root.after(0, lambda: messagebox.showerror("Authentication Error", 
-                            f"Google Calendar authentication expired.\n\n{error_detail}\n\n"
-                            "Please delete 'token.json' from your project folder and try again."))
-                    except:
-                        self.root.after(0, lambda: messagebox.showerror("Authentication Error", 
-                            "Google Calendar authentication expired. Please delete 'token.json' and try again."))
-                elif response.status_code == 500:
-                    try:
-                        error_detail = response.json().get("detail", "Unknown server error")
-                        self.root.after(0, lambda: messagebox.showerror("Sync Error", f"Server error: {error_detail}"))
-                    except:
-                        self.root.after(0, lambda: messagebox.showerror("Sync Error", f"Server error: {response.text}"))
-                else:
-                    self.root.after(0, lambda: messagebox.showerror("Sync Error", f"Failed to sync events: {response.text}"))
-                    
-            except requests.exceptions.ConnectionError:
-                self.root.after(0, lambda: messagebox.showerror("Connection Error", 
-                    "Could not connect to the FastAPI server. Make sure it's running on localhost:8000"))
-            except Exception as e:
-                self.root.after(0, lambda: messagebox.showerror("Sync Error", f"Unexpected error: {str(e)}"))
-        
-        # Run sync in background thread to avoid blocking UI
-        thread = threading.Thread(target=sync_thread)
-        thread.daemon = True
-        thread.start()
+                for event, data in self.api.stream_changes():
+                    if self.executor.stopping.is_set():
+                        return
+                    if event == "ready":
+                        self.executor.post(self.show_feed_status, None)
+                        if connected_before:
+                            # Changes were missed while the feed was disconnected
+                            self.executor.post(self.refresh_active, True)
+                        connected_before = True
+                    elif event == "resync":
+                        # Changes were missed while the feed was behind
+                        self.executor.post(self.refresh_active, True)
+                    elif event == "sync.completed":
+                        self.executor.post(self.show_sync_notice, data["data"])
+                    elif event != "keepalive":
+                        self.api.apply_change(event, data)
+            except (requests.exceptions.RequestException, ApiError) as e:
+                self.executor.post(self.show_feed_status, e)
+            self.executor.stopping.wait(CHANGES_RETRY_INTERVAL)
+
+    def show_feed_status(self, error):
+        """Say in the status bar that live updates dropped (error), or clear that once they're back (None)"""
+        if error is not None:
+            detail = "server unreachable" if isinstance(error, requests.exceptions.ConnectionError) else str(error)
+            self.status_label.config(text=f"Live updates disconnected ({detail}); retrying...")
+        elif self.status_label.cget("text").startswith("Live updates disconnected"):
+            self.status_label.config(text="")
+
+    def show_sync_notice(self, job):
+        if job["status"] == "succeeded":
+            counts = job["counts"]
+            self.status_label.config(text=f"Calendar synced: {counts['inserted']} new, {counts['updated']} updated, "
+                                          f"{counts['deleted']} removed")
+        else:
+            self.status_label.config(text="Calendar sync failed")
+
+    def sync_events(self):
+        """Sync events from Google Calendar using the FastAPI backend"""
+        self.executor.submit(self._run_sync_job, on_success=self._show_sync_result,
+                             on_error=lambda e: self.show_request_error(e, title="Sync Error", action="Sync failed"))
         
         messagebox.showinfo("Syncing", "Syncing events from Google Calendar...")
-        
-    def analyze_data(self):
-        """Get AI analysis from the FastAPI backend"""
-        headers = self.get_auth_headers()
 
-        def analyze_thread():
-            try:
-                response = requests.get(f"{self.api_base_url}/analysis/", headers=headers)
-                if response.status_code == 200:
-                    result = response.json()
-                    analysis = result.get("analysis", "No analysis available")
-                    self.root.after(0, lambda: self.display_analysis(analysis))
-                else:
-                    self.root.after(0, lambda: messagebox.showerror("Analysis Error", f"Failed to get analysis: {response.text}"))
-            except requests.exceptions.ConnectionError:
-                self.root.after(0, lambda: messagebox.showerror("Connection Error", 
-                    "Could not connect to the FastAPI server. Make sure it's running on localhost:8000"))
-            except Exception as e:
-                self.root.after(0, lambda: messagebox.showerror("Analysis Error", f"Unexpected error: {str(e)}"))
-        
-        # Run analysis in background thread
-        thread = threading.Thread(target=analyze_thread)
-        thread.daemon = True
-        thread.start()
+    def _run_sync_job(self):
+        """Runs on a worker: start a background sync job, then poll until it finishes or the app closes"""
+        job = self.api.start_sync_job()
+        while job["status"] in ("queued", "running"):
+            if self.executor.stopping.wait(SYNC_POLL_INTERVAL):
+                break
+            job = self.api.get_sync_job(job["id"])
+        return job
+
+    def _show_sync_result(self, job):
+        if job["status"] == "succeeded":
+            counts = job["counts"]
+            messagebox.showinfo("Sync Complete",
+                f"Synced events from Google Calendar!\n\n"
+                f"New: {counts['inserted']}  Updated: {counts['updated']}  "
+                f"Removed: {counts['deleted']}  Unchanged: {counts['unchanged']}")
+        elif job["error_status"] == 401:
+            # Authentication error - likely stale token
+            messagebox.showerror("Authentication Error",
+                f"Google Calendar authentication expired.\n\n{job['error']}\n\n"
+                "Please delete 'token.json' from your project folder and try again.")
+        else:
+            messagebox.showerror("Sync Error", f"Server error: {job['error'] or 'Unknown server error'}")
         
+    def analyze_data(self, days=1):
+        """Get AI analysis from the FastAPI backend (days > 1 reviews that many days up to today)"""
         self.analysis_text.delete("1.0", tk.END)
         self.analysis_text.insert("1.0", "Analyzing your productivity patterns...\nPlease wait...")
-        
-    def display_analysis(self, analysis):
-        """Display the analysis results in the text widget"""
-        self.analysis_text.delete("1.0", tk.END)
-        self.analysis_text.insert("1.0", analysis)
+
+        start_date = datetime.now().date() - timedelta(days=days - 1) if days > 1 else None
+        self.executor.submit(self._stream_analysis, self.narrative_var.get(), start_date,
+                             on_error=lambda e: self.show_request_error(e, title="Analysis Error", action="Failed to get analysis"))
+
+    def _stream_analysis(self, narrative, start_date=None):
+        """Runs on a worker: stream the analysis as server-sent events and render each piece as it arrives"""
+        first = True
+        for event, data in self.api.stream_analysis(narrative, start_date):
+            if self.executor.stopping.is_set():
+                return
+            if event == "done":
+                # A range review ends with each day's summary
+                days = "".join(f"\n\n{day['day']}: {day['summary']}" for day in data.get("days", []))
+                if days:
+                    self.executor.post(self.display_analysis, "\n\nBy day:" + days, True)
+                return
+            if event == "error":
+                self.executor.post(messagebox.showerror, "Analysis Error", data.get("detail", "Unknown error"))
+                return
+            self.executor.post(self.display_analysis, data["text"], not first)
+            first = False
+        
+    def display_analysis(self, analysis, append=False):
+        """Display the analysis results in the text widget (append=True adds a streamed chunk)"""
+        if not append:
+            self.analysis_text.delete("1.0", tk.END)
+        self.analysis_text.insert(tk.END, analysis)
+        self.analysis_text.see(tk.END)
     
     def show_tasks_context_menu(self, event):
         """Show context menu for tasks"""
+        self.active_tasks_view.select_at(event.y)
         try:
             self.tasks_context_menu.tk_popup(event.x_root, event.y_root)
         finally:
@@ -543,6 +748,7 @@ class BusynessBusterApp:
     
     def show_goals_context_menu(self, event):
         """Show context menu for goals"""
+        self.active_goals_view.select_at(event.y)
         try:
             self.goals_context_menu.tk_popup(event.x_root, event.y_root)
         finally:
@@ -550,223 +756,67 @@ class BusynessBusterApp:
     
     def edit_selected_task(self):
         """Edit the selected task"""
-        selection = self.active_tasks_listbox.curselection()
-        if not selection:
+        task = self.task_rows.get(self.active_tasks_view.selected_id())
+        if not task:
             messagebox.showwarning("No Selection", "Please select a task to edit")
             return
-        
-        # Get task ID from the display text
-        task_text = self.active_tasks_listbox.get(selection[0])
-        task_id = self.extract_task_id_from_display(task_text)
-        
-        if task_id:
-            self.open_task_edit_dialog(task_id)
-        else:
-            messagebox.showerror("Error", "Could not identify task ID")
+
+        dialog = TaskEditDialog(self.root, task, self)
+        self.root.wait_window(dialog.dialog)
     
     def delete_selected_task(self):
         """Delete the selected task"""
-        selection = self.active_tasks_listbox.curselection()
-        if not selection:
+        task_id = self.active_tasks_view.selected_id()
+        if task_id is None:
             messagebox.showwarning("No Selection", "Please select a task to delete")
             return
         
-        # Get task ID from the display text
-        task_text = self.active_tasks_listbox.get(selection[0])
-        task_id = self.extract_task_id_from_display(task_text)
-        
-        if task_id:
-            if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this task?"):
-                self.delete_task_by_id(task_id)
-        else:
-            messagebox.showerror("Error", "Could not identify task ID")
+        if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this task?"):
+            self.delete_task_by_id(task_id)
     
     def edit_selected_goal(self):
         """Edit the selected goal"""
-        selection = self.active_goals_listbox.curselection()
-        if not selection:
+        goal = self.goal_rows.get(self.active_goals_view.selected_id())
+        if not goal:
             messagebox.showwarning("No Selection", "Please select a goal to edit")
             return
-        
-        # Get goal ID from the display text
-        goal_text = self.active_goals_listbox.get(selection[0])
-        goal_id = self.extract_goal_id_from_display(goal_text)
-        
-        if goal_id:
-            self.open_goal_edit_dialog(goal_id)
-        else:
-            messagebox.showerror("Error", "Could not identify goal ID")
+
+        dialog = GoalEditDialog(self.root, goal, self)
+        self.root.wait_window(dialog.dialog)
     
     def delete_selected_goal(self):
         """Delete the selected goal"""
-        selection = self.active_goals_listbox.curselection()
-        if not selection:
+        goal_id = self.active_goals_view.selected_id()
+        if goal_id is None:
             messagebox.showwarning("No Selection", "Please select a goal to delete")
             return
         
-        # Get goal ID from the display text
-        goal_text = self.active_goals_listbox.get(selection[0])
-        goal_id = self.extract_goal_id_from_display(goal_text)
-        
-        if goal_id:
-            if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this goal?"):
-                self.delete_goal_by_id(goal_id)
-        else:
-            messagebox.showerror("Error", "Could not identify goal ID")
-    
-    def extract_task_id_from_display(self, task_text):
-        """Extract task ID from display text"""
-        try:
-            # Look for pattern like "Task Title (Priority: X) - Due: YYYY-MM-DD - Goal: Z"
-            # We need to get the task from database to find the ID
-            if not self.db_session:
-                return None
-            
-            # Extract task title (everything before " (Priority:")
-            title_part = task_text.split(" (Priority:")[0]
-            
-            # Find the task in database
-            task = self.db_session.query(Task).filter(Task.title == title_part, Task.completed == False).first()
-            return task.id if task else None
-        except Exception as e:
-            print(f"Error extracting task ID: {e}")
-            return None
-    
-    def extract_goal_id_from_display(self, goal_text):
-        """Extract goal ID from display text"""
-        try:
-            # Look for pattern like "Goal Title (Priority: X) - Y term"
-            if not self.db_session:
-                return None
-            
-            # Extract goal title (everything before " (Priority:")
-            title_part = goal_text.split(" (Priority:")[0]
-            
-            # Find the goal in database
-            goal = self.db_session.query(Goal).filter(
-                Goal.goal == title_part,
-                Goal.accomplished == False,
-                Goal.user_id == self.current_user_id
-            ).first()
-            return goal.id if goal else None
-        except Exception as e:
-            print(f"Error extracting goal ID: {e}")
-            return None
-    
-    def open_task_edit_dialog(self, task_id):
-        """Open edit dialog for a task"""
-        if not self.db_session:
-            messagebox.showerror("Error", "Database connection not available")
-            return
-        
-        # Get task from database
-        task = self.db_session.query(Task).filter(Task.id == task_id).first()
-        if not task:
-            messagebox.showerror("Error", "Task not found")
-            return
-        
-        # Create edit dialog
-        dialog = TaskEditDialog(self.root, task, self)
-        self.root.wait_window(dialog.dialog)
-    
-    def open_goal_edit_dialog(self, goal_id):
-        """Open edit dialog for a goal"""
-        if not self.db_session:
-            messagebox.showerror("Error", "Database connection not available")
-            return
-        
-        # Get goal from database
-        goal = self.db_session.query(Goal).filter(Goal.id == goal_id).first()
-        if not goal:
-            messagebox.showerror("Error", "Goal not found")
-            return
-        
-        # Create edit dialog
-        dialog = GoalEditDialog(self.root, goal, self)
-        self.root.wait_window(dialog.dialog)
+        if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this goal?"):
+            self.delete_goal_by_id(goal_id)
     
     def delete_task_by_id(self, task_id):
         """Delete task by ID using API"""
-        try:
-            response = requests.delete(
-                f"{self.api_base_url}/tasks/{task_id}",
-                headers=self.get_auth_headers()
-            )
-            if response.status_code == 204:
-                messagebox.showinfo("Success", "Task deleted successfully!")
-                self.refresh_active()
-                self.populate_goals_combobox()
-            else:
-                messagebox.showerror("Error", f"Failed to delete task: {response.text}")
-        except requests.exceptions.ConnectionError:
-            messagebox.showerror("Connection Error", "Could not connect to the FastAPI server")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to delete task: {str(e)}")
+        self.executor.submit(self.api.delete_task, task_id,
+                             on_success=self._saved("Task deleted successfully!"),
+                             on_error=lambda e: self.show_request_error(e, action="Failed to delete task"))
 
     def delete_goal_by_id(self, goal_id):
         """Delete goal by ID using API"""
-        try:
-            response = requests.delete(
-                f"{self.api_base_url}/goals/{goal_id}",
-                headers=self.get_auth_headers()
-            )
-            if response.status_code == 204:
-                messagebox.showinfo("Success", "Goal deleted successfully!")
-                self.refresh_active()
-                self.populate_goals_combobox()
-            else:
-                messagebox.showerror("Error", f"Failed to delete goal: {response.text}")
-        except requests.exceptions.ConnectionError:
-            messagebox.showerror("Connection Error", "Could not connect to the FastAPI server")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to delete goal: {str(e)}")
-
-    def update_task_via_api(self, task_id, task_data):
-        """Update task via API"""
-        try:
-            response = requests.patch(
-                f"{self.api_base_url}/tasks/{task_id}",
-                json=task_data,
-                headers=self.get_auth_headers()
-            )
-            if response.status_code == 200:
-                messagebox.showinfo("Success", "Task updated successfully!")
-                self.refresh_active()
-                self.populate_goals_combobox()
-                return True
-            else:
-                messagebox.showerror("Error", f"Failed to update task: {response.text}")
-                return False
-        except requests.exceptions.ConnectionError:
-            messagebox.showerror("Connection Error", "Could not connect to the FastAPI server")
-            return False
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to update task: {str(e)}")
-            return False
-
-    def update_goal_via_api(self, goal_id, goal_data):
-        """Update goal via API"""
-        try:
-            response = requests.patch(
-                f"{self.api_base_url}/goals/{goal_id}",
-                json=goal_data,
-                headers=self.get_auth_headers()
-            )
-            if response.status_code == 200:
-                messagebox.showinfo("Success", "Goal updated successfully!")
-                self.refresh_active()
-                self.populate_goals_combobox()
-                return True
-            else:
-                messagebox.showerror("Error", f"Failed to update goal: {response.text}")
-                return False
-        except requests.exceptions.ConnectionError:
-            messagebox.showerror("Connection Error", "Could not connect to the FastAPI server")
-            return False
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to update goal: {str(e)}")
-            return False
+        self.executor.submit(self.api.delete_goal, goal_id,
+                             on_success=self._saved("Goal deleted successfully!"),
+                             on_error=lambda e: self.show_request_error(e, action="Failed to delete goal"))
+
+    def update_task_via_api(self, task_id, task_data, on_saved=None):
+        """Update task via API; on_saved runs once the server accepted it"""
+        self.executor.submit(self.api.update_task, task_id, task_data,
+                             on_success=self._saved("Task updated successfully!", then=on_saved),
+                             on_error=lambda e: self.show_request_error(e, action="Failed to update task"))
 
+    def update_goal_via_api(self, goal_id, goal_data, on_saved=None):
+        """Update goal via API; on_saved runs once the server accepted it"""
+        self.executor.submit(self.api.update_goal, goal_id, goal_data,
+                             on_success=self._saved("Goal updated successfully!", then=on_saved),
+                             on_error=lambda e: self.show_request_error(e, action="Failed to update goal"))
 
 class TaskEditDialog:
     def __init__(self, parent, task, app):
@@ -792,29 +842,29 @@ class TaskEditDialog:
         
         # Title
         ttk.Label(main_frame, text="Title:").grid(row=0, column=0, sticky=tk.W, pady=2)
-        self.title_var = tk.StringVar(value=self.task.title)
+        self.title_var = tk.StringVar(value=self.task["title"])
         title_entry = ttk.Entry(main_frame, textvariable=self.title_var, width=40)
         title_entry.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=(5, 0), pady=2)
         
         # Priority
         ttk.Label(main_frame, text="Priority:").grid(row=1, column=0, sticky=tk.W, pady=2)
-        self.priority_var = tk.IntVar(value=self.task.priority)
+        self.priority_var = tk.IntVar(value=self.task["priority"])
         priority_scale = ttk.Scale(main_frame, from_=1, to=10, orient=tk.HORIZONTAL, 
                                  variable=self.priority_var, command=self.update_priority_label)
         priority_scale.grid(row=1, column=1, sticky=(tk.W, tk.E), padx=(5, 0), pady=2)
-        self.priority_label = ttk.Label(main_frame, text=str(self.task.priority))
+        self.priority_label = ttk.Label(main_frame, text=str(self.task["priority"]))
         self.priority_label.grid(row=1, column=2, sticky=tk.W, padx=(5, 0), pady=2)
         
         # Due date
         ttk.Label(main_frame, text="Due Date:").grid(row=2, column=0, sticky=tk.W, pady=2)
-        due_date_str = self.task.due_date.strftime("%Y-%m-%d") if self.task.due_date else ""
+        due_date_str = self.task["due_date"][:10] if self.task["due_date"] else ""
         self.due_date_var = tk.StringVar(value=due_date_str)
         due_date_entry = ttk.Entry(main_frame, textvariable=self.due_date_var, width=20)
         due_date_entry.grid(row=2, column=1, sticky=tk.W, padx=(5, 0), pady=2)
         ttk.Label(main_frame, text="(YYYY-MM-DD)").grid(row=2, column=2, sticky=tk.W, padx=(5, 0), pady=2)
         
         # Completed checkbox
-        self.completed_var = tk.BooleanVar(value=self.task.completed)
+        self.completed_var = tk.BooleanVar(value=self.task["completed"])
         completed_check = ttk.Checkbutton(main_frame, text="Completed", variable=self.completed_var)
         completed_check.grid(row=3, column=1, sticky=tk.W, padx=(5, 0), pady=2)
         
@@ -824,29 +874,13 @@ class TaskEditDialog:
         goal_combo = ttk.Combobox(main_frame, textvariable=self.goal_var, state="readonly", width=37)
         goal_combo.grid(row=4, column=1, sticky=tk.W, padx=(5, 0), pady=2)
         
-        # Populate goals for current user
-        goal_options = ["None"]
-        if self.app.db_session and self.app.current_user_id:
-            try:
-                active_goals = self.app.db_session.query(Goal).filter(
-                    Goal.accomplished == False,
-                    Goal.user_id == self.app.current_user_id
-                ).all()
-                goal_options += [f"{goal.goal} (ID: {goal.id})" for goal in active_goals]
-            except Exception as e:
-                print(f"Error loading goals: {e}")
-        
+        # Offer the active goals already loaded into the Active Items list
+        goal_options = ["None"] + [f"{goal['goal']} (ID: {goal['id']})" for goal in self.app.active_goals_view.rows()]
         goal_combo['values'] = goal_options
         
         # Set current goal if exists
-        if self.task.goal_id:
-            current_goal = None
-            if self.app.db_session:
-                current_goal = self.app.db_session.query(Goal).filter(Goal.id == self.task.goal_id).first()
-            if current_goal:
-                goal_combo.set(f"{current_goal.goal} (ID: {current_goal.id})")
-            else:
-                goal_combo.set("None")
+        if self.task["goal_id"] and self.task["goal_title"]:
+            goal_combo.set(f"{self.task['goal_title']} (ID: {self.task['goal_id']})")
         else:
             goal_combo.set("None")
         
@@ -903,9 +937,8 @@ class TaskEditDialog:
         if due_date:
             update_data["due_date"] = due_date.isoformat()
         
-        # Update via API
-        if self.app.update_task_via_api(self.task.id, update_data):
-            self.dialog.destroy()
+        # Update via API; the dialog closes once the server accepts it
+        self.app.update_task_via_api(self.task["id"], update_data, on_saved=self.dialog.destroy)
 
 
 class GoalEditDialog:
@@ -932,28 +965,28 @@ class GoalEditDialog:
         
         # Title
         ttk.Label(main_frame, text="Title:").grid(row=0, column=0, sticky=tk.W, pady=2)
-        self.title_var = tk.StringVar(value=self.goal.goal)
+        self.title_var = tk.StringVar(value=self.goal["goal"])
         title_entry = ttk.Entry(main_frame, textvariable=self.title_var, width=40)
         title_entry.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=(5, 0), pady=2)
         
         # Priority
         ttk.Label(main_frame, text="Priority:").grid(row=1, column=0, sticky=tk.W, pady=2)
-        self.priority_var = tk.IntVar(value=self.goal.priority)
+        self.priority_var = tk.IntVar(value=self.goal["priority"])
         priority_scale = ttk.Scale(main_frame, from_=1, to=10, orient=tk.HORIZONTAL, 
                                  variable=self.priority_var, command=self.update_priority_label)
         priority_scale.grid(row=1, column=1, sticky=(tk.W, tk.E), padx=(5, 0), pady=2)
-        self.priority_label = ttk.Label(main_frame, text=str(self.goal.priority))
+        self.priority_label = ttk.Label(main_frame, text=str(self.goal["priority"]))
         self.priority_label.grid(row=1, column=2, sticky=tk.W, padx=(5, 0), pady=2)
         
         # Forecast
         ttk.Label(main_frame, text="Forecast:").grid(row=2, column=0, sticky=tk.W, pady=2)
-        self.forecast_var = tk.StringVar(value=self.goal.forecast or "Medium")
+        self.forecast_var = tk.StringVar(value=self.goal["forecast"] or "Medium")
         forecast_combo = ttk.Combobox(main_frame, textvariable=self.forecast_var, 
                                     values=["Short", "Medium", "Long"], state="readonly", width=37)
         forecast_combo.grid(row=2, column=1, sticky=tk.W, padx=(5, 0), pady=2)
         
         # Accomplished checkbox
-        self.accomplished_var = tk.BooleanVar(value=self.goal.accomplished)
+        self.accomplished_var = tk.BooleanVar(value=self.goal["accomplished"])
         accomplished_check = ttk.Checkbutton(main_frame, text="Accomplished", variable=self.accomplished_var)
         accomplished_check.grid(row=3, column=1, sticky=tk.W, padx=(5, 0), pady=2)
         
@@ -988,9 +1021,8 @@ class GoalEditDialog:
             "accomplished": accomplished
         }
         
-        # Update via API
-        if self.app.update_goal_via_api(self.goal.id, update_data):
-            self.dialog.destroy()
+        # Update via API; the dialog closes once the server accepts it
+        self.app.update_goal_via_api(self.goal["id"], update_data, on_saved=self.dialog.destroy)
 
 
 def main():
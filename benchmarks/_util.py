@@ -0,0 +1,36 @@
+"""
+Helpers shared by the benchmark scripts and the tests that start servers.
+
+Scripts run as python benchmarks/bench_*.py have this directory on sys.path,
+so they import these as `from _util import ...`.
+"""
+
+import socket
+import time
+
+import requests
+
+
+def free_port() -> int:
+    """A TCP port on 127.0.0.1 that nothing is listening on right now."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(url: str, timeout: float = 30) -> None:
+    """Poll url until a server answers (any status), or raise after timeout seconds."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            requests.get(url, timeout=0.5)
+            return
+        except requests.exceptions.ConnectionError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up")
+
+
+def percentile(values, pct):
+    """The pct-th percentile of values (nearest rank), NaN when there are none."""
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] if values else float("nan")
@@ -0,0 +1,141 @@
+"""
+Load test: /tasks latency while many analyses are in flight.
+
+Starts the stub LLM server and the API (uvicorn) in a scratch directory,
+seeds one user per concurrent analysis (distinct data, so requests are not
+coalesced by the analysis cache), then measures GET /tasks/{id} latency
+alone and again while --analyses GET /analysis/ calls are waiting on the
+stub LLM.
+
+Usage: python benchmarks/bench_analysis_load.py [--analyses 50] [--llm-delay 3.0]
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from _util import wait_for
+from services.auth import hash_password
+
+API_PORT = 8011
+STUB_PORT = 8111
+API = f"http://127.0.0.1:{API_PORT}"
+
+
+def seed(db_path: str, users: int) -> list[int]:
+    """Create users bench0..benchN with one goal and task each. Returns task ids."""
+    hashed = hash_password("bench")  # bcrypt is slow; every user shares one hash
+    conn = sqlite3.connect(db_path)
+    task_ids = []
+    for i in range(users):
+        user_id = conn.execute(
+            "INSERT INTO users (username, hashed_password) VALUES (?, ?)", (f"bench{i}", hashed)
+        ).lastrowid
+        conn.execute(
+            "INSERT INTO goals (goal, priority, accomplished, forecast, user_id) VALUES (?, 5, 0, 'Short', ?)",
+            (f"Goal for user {i}", user_id),
+        )
+        task_ids.append(conn.execute(
+            "INSERT INTO tasks (title, priority, completed, user_id) VALUES (?, 5, 0, ?)",
+            (f"Task for user {i}", user_id),
+        ).lastrowid)
+    conn.commit()
+    conn.close()
+    return task_ids
+
+
+def login(username: str) -> dict:
+    token = requests.post(f"{API}/auth/login", json={"username": username, "password": "bench"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def task_latencies(session: requests.Session, headers: dict, task_id: int, n: int) -> list[float]:
+    latencies = []
+    for _ in range(n):
+        start = time.perf_counter()
+        session.get(f"{API}/tasks/{task_id}", headers=headers).raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(label: str, latencies: list[float]) -> None:
+    latencies = sorted(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{label:28s} p50 {statistics.median(latencies):7.1f} ms   p99 {p99:7.1f} ms   max {latencies[-1]:7.1f} ms")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--analyses", type=int, default=50)
+    arg_parser.add_argument("--llm-delay", type=float, default=3.0)
+    arg_parser.add_argument("--requests", type=int, default=100)
+    args = arg_parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bb-bench-")
+    env = {
+        **os.environ,
+        "PYTHONPATH": REPO_DIR,
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{STUB_PORT}/v1",
+        "OPENAI_API_KEY": "stub",
+        "ANALYSIS_MAX_CONCURRENCY": str(args.analyses),
+    }
+    stub = subprocess.Popen(
+        [sys.executable, os.path.join(REPO_DIR, "benchmarks", "stub_llm_server.py"),
+         "--port", str(STUB_PORT), "--delay", str(args.llm_delay)],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(API_PORT), "--log-level", "warning"],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for(f"{API}/docs")
+        task_ids = seed(os.path.join(workdir, "busyness.db"), args.analyses + 1)
+        probe_task = task_ids[-1]
+
+        probe_headers = login(f"bench{args.analyses}")
+        session = requests.Session()
+        task_latencies(session, probe_headers, probe_task, 10)  # warm up
+        summarize("GET /tasks/{id} idle", task_latencies(session, probe_headers, probe_task, args.requests))
+
+        analysis_headers = [login(f"bench{i}") for i in range(args.analyses)]
+        done = []
+
+        def analyze(headers):
+            start = time.perf_counter()
+            # narrative=true: always go to the (stub) LLM rather than the local verdict
+            requests.get(f"{API}/analysis/", params={"narrative": "true"}, headers=headers,
+                         timeout=120).raise_for_status()
+            done.append(time.perf_counter() - start)
+
+        threads = [threading.Thread(target=analyze, args=(h,)) for h in analysis_headers]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.5)  # let the analyses reach the stub LLM
+
+        summarize(f"GET /tasks/{{id}} + {args.analyses} analyses", task_latencies(session, probe_headers, probe_task, args.requests))
+        print(f"analyses still in flight after probe: {args.analyses - len(done)}")
+
+        for thread in threads:
+            thread.join()
+        print(f"{len(done)} analyses finished, slowest {max(done):.2f} s (stub delay {args.llm_delay} s)")
+    finally:
+        api.terminate()
+        stub.terminate()
+        api.wait()
+        stub.wait()
+
+
+if __name__ == "__main__":
+    main()
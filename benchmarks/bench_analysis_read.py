@@ -0,0 +1,168 @@
+"""
+Per-row cost of loading the analysis inputs: the old ORM + Pydantic path
+versus the Core read layer in services/analysis.py.
+
+Seeds a scratch database with --rows open goals, --rows tasks and --rows
+events today, then times both loaders on the same async session (median of
+--runs) and prints the cost per row returned. The old path runs three ORM
+queries and round-trips every row through TaskRead/GoalRead/EventRead
+model_validate().model_dump(); the new one runs one UNION ALL over the
+needed columns into NamedTuples. Both must build the same prompt.
+
+With --profile, each loader is also run once under cProfile and the top
+functions by internal time are printed.
+
+Usage: python benchmarks/bench_analysis_read.py [--rows 10000] [--runs 5] [--profile]
+"""
+
+import argparse
+import asyncio
+import cProfile
+import os
+import pstats
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+async def legacy_load_analysis_inputs(db, user_id: int):
+    """
+    load_analysis_inputs before the Core read layer: ORM rows, then schema
+    dicts. Tasks at equal priority are ordered by id, as in the new query,
+    so both pick the same ten.
+    """
+    from sqlalchemy import select
+    from sqlalchemy.orm import joinedload
+
+    from db import Event, Goal, Task
+    from schemas import EventRead, GoalRead, TaskRead
+    from services.busyness import day_window
+
+    goals = (await db.scalars(select(Goal).where(
+        Goal.accomplished == False,
+        Goal.user_id == user_id
+    ))).all()
+
+    tasks = (await db.scalars(select(Task).options(joinedload(Task.goal)).where(
+        Task.user_id == user_id
+    ).order_by(Task.priority.desc(), Task.id).limit(10))).all()
+
+    today_start, today_end = day_window()
+    events = (await db.scalars(select(Event).where(
+        Event.start_time >= today_start,
+        Event.start_time < today_end,
+        Event.user_id == user_id
+    ).order_by(Event.start_time))).all()
+
+    tasks_out = [TaskRead.model_validate(t).model_dump() for t in tasks]
+    goals_out = [GoalRead.model_validate(g).model_dump() for g in goals]
+    events_out = [EventRead.model_validate(e).model_dump() for e in events]
+
+    return goals_out, tasks_out, events_out
+
+
+def as_records(goals_out, tasks_out, events_out):
+    """
+    The old loader's dicts as the records build_prompt takes, in the new
+    loader's order (the old goals query had no ORDER BY).
+    """
+    from services.analysis import EventRow, GoalRow, TaskRow
+
+    goals_out = sorted(goals_out, key=lambda g: (-(g["priority"] or 0), g["id"]))
+    tasks_out = sorted(tasks_out, key=lambda t: (-t["priority"], t["due_date"] is not None, t["due_date"], t["id"]))
+    return (
+        [GoalRow(g["goal"], g["priority"], g["forecast"]) for g in goals_out],
+        [TaskRow(t["title"], t["priority"], t["due_date"], t["completed"], t["goal_title"]) for t in tasks_out],
+        [EventRow(e["summary"], e["start_time"], e["end_time"]) for e in events_out],
+    )
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--rows", type=int, default=10000)
+    arg_parser.add_argument("--runs", type=int, default=5)
+    arg_parser.add_argument("--profile", action="store_true")
+    args = arg_parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bb-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'busyness.db')}"
+    os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+    from sqlalchemy import insert
+
+    from db import AsyncSessionLocal, Event, Goal, Task, User, async_engine, engine
+    from services.analysis import load_analysis_inputs
+    from services.busyness import day_window
+    from services.prompt import build_prompt
+
+    forecasts = ["Short", "Medium", "Long"]
+    day_start = day_window()[0].replace(tzinfo=None)
+    step = timedelta(days=1) / args.rows
+    with engine.begin() as conn:
+        user_id = conn.execute(insert(User).values(username="bench", hashed_password="x")).inserted_primary_key[0]
+        conn.execute(insert(Goal), [
+            {"goal": f"Goal {i}: ship the quarterly review", "priority": i % 11, "forecast": forecasts[i % 3],
+             "accomplished": False, "user_id": user_id}
+            for i in range(args.rows)
+        ])
+        conn.execute(insert(Task), [
+            {"title": f"Task {i}: draft notes for the planning meeting", "priority": i % 11,
+             "due_date": day_start + timedelta(days=i % 14), "goal_id": i % args.rows + 1, "user_id": user_id}
+            for i in range(args.rows)
+        ])
+        conn.execute(insert(Event), [
+            {"google_id": f"evt-{i}", "summary": f"Event {i}: focus block", "start_time": day_start + step * i,
+             "end_time": day_start + step * (i + 1), "user_id": user_id}
+            for i in range(args.rows)
+        ])
+
+    loaders = [("ORM + Pydantic", legacy_load_analysis_inputs), ("Core rows", load_analysis_inputs)]
+
+    async def run():
+        results = {}
+        try:
+            async with AsyncSessionLocal() as db:
+                for label, loader in loaders:
+                    await loader(db, user_id)  # warm up statement caches
+                    timings = []
+                    for _ in range(args.runs):
+                        db.expunge_all()
+                        start = time.perf_counter()
+                        inputs = await loader(db, user_id)
+                        timings.append(time.perf_counter() - start)
+                    results[label] = (statistics.median(timings), inputs)
+
+                    if args.profile:
+                        db.expunge_all()
+                        profiler = cProfile.Profile()
+                        profiler.enable()
+                        await loader(db, user_id)
+                        profiler.disable()
+                        print(f"--- {label}: top 12 functions by internal time")
+                        pstats.Stats(profiler, stream=sys.stdout).sort_stats("tottime").print_stats(12)
+        finally:
+            await async_engine.dispose()
+        return results
+
+    results = asyncio.run(run())
+
+    old_inputs, new_inputs = results["ORM + Pydantic"][1], results["Core rows"][1]
+    old_prompt = build_prompt(*as_records(*old_inputs), budget=10 ** 9)
+    new_prompt = build_prompt(*new_inputs, budget=10 ** 9)
+    assert old_prompt.text == new_prompt.text, "loaders disagree"
+
+    rows = sum(len(part) for part in new_inputs)
+    print(f"{rows} rows loaded ({' / '.join(str(len(part)) for part in new_inputs)} goals / tasks / events), "
+          f"median of {args.runs} runs, same prompt from both")
+    baseline = results["ORM + Pydantic"][0]
+    for label, (seconds, _) in results.items():
+        print(f"{label:16s} {seconds * 1000:8.1f} ms  {seconds / rows * 1e6:6.2f} us/row  "
+              f"({baseline / seconds:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+GET /tasks/ under many concurrent connections: sync versus async handlers.
+
+--connections clients each keep one HTTP/1.1 connection open and send
+--requests back-to-back requests on it, all at once, against:
+
+- "sync": the old handler, a plain def route with a sync Session from
+  get_db that runs on FastAPI's threadpool (mounted here just for comparison)
+- "async": GET /tasks/, an async def route on an AsyncSession
+
+The API runs under uvicorn in a child process so the load generator (an
+asyncio client in this process) doesn't share its GIL. Each phase reports
+throughput and latency percentiles of the requests that succeeded, and how
+many failed or were still waiting when the phase's --deadline ran out.
+
+Usage: python benchmarks/bench_async.py [--connections 1000] [--requests 5] [--tasks 2000] [--deadline 60]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from _util import percentile
+
+API_PORT = 8017
+
+
+def serve():
+    import uvicorn
+    from fastapi import Depends, Query
+    from sqlalchemy.orm import Session, joinedload
+
+    from db import Task, get_db
+    from dependencies import CurrentUser, get_current_user
+    from main import app
+    from schemas.tasks import TaskPage
+    from services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate
+
+    @app.get("/bench/sync-tasks", response_model=TaskPage)
+    def sync_tasks(
+        limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        db: Session = Depends(get_db),
+        current_user: CurrentUser = Depends(get_current_user),
+    ):
+        query = db.query(Task).options(joinedload(Task.goal)).filter(Task.user_id == current_user.id)
+        items, next_cursor = paginate(query, "priority", [Task.priority], Task.id, True, None, limit)
+        return {"items": items, "next_cursor": next_cursor}
+
+    # Failed requests are counted by the client; their tracebacks would drown the report
+    uvicorn.run(app, port=API_PORT, log_level="critical", backlog=4096)
+
+
+async def client(path, token, requests, latencies):
+    request = (f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nAuthorization: Bearer {token}\r\n\r\n").encode()
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", API_PORT)
+    except OSError:
+        return
+    try:
+        for _ in range(requests):
+            start = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = next(int(line.split(b":")[1]) for line in head.split(b"\r\n") if line.lower().startswith(b"content-length"))
+            await reader.readexactly(length)
+            if head.startswith(b"HTTP/1.1 200"):
+                latencies.append((time.perf_counter() - start) * 1000)
+    except (OSError, asyncio.IncompleteReadError, StopIteration):
+        pass
+    finally:
+        writer.close()
+
+
+async def run_phase(path, token, connections, requests, deadline):
+    """Latencies of the requests that succeeded before the deadline, and the elapsed time."""
+    latencies = []
+    start = time.perf_counter()
+    clients = [asyncio.create_task(client(path, token, requests, latencies)) for _ in range(connections)]
+    _, pending = await asyncio.wait(clients, timeout=deadline)
+    for task in pending:
+        task.cancel()
+    return latencies, time.perf_counter() - start
+
+
+def start_server():
+    import requests
+
+    server = multiprocessing.Process(target=serve, daemon=True)
+    server.start()
+    while True:
+        try:
+            requests.get(f"http://127.0.0.1:{API_PORT}/docs", timeout=1)
+            return server
+        except requests.ConnectionError:
+            if not server.is_alive():
+                sys.exit(f"API server failed to start (is port {API_PORT} in use?)")
+            time.sleep(0.1)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--connections", type=int, default=1000)
+    arg_parser.add_argument("--requests", type=int, default=5)
+    arg_parser.add_argument("--tasks", type=int, default=2000)
+    arg_parser.add_argument("--limit", type=int, default=20)
+    arg_parser.add_argument("--deadline", type=float, default=60, help="seconds before a phase's unfinished requests count as failed")
+    args = arg_parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bb-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'busyness.db')}"
+    os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+    from sqlalchemy import insert
+
+    from db import SessionLocal, Task, User, engine
+    from services.auth import create_access_token, hash_password
+
+    with SessionLocal() as db:
+        user = User(username="bench", hashed_password=hash_password("bench"))
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    with engine.begin() as conn:
+        conn.execute(insert(Task), [{"title": f"Task {i}", "priority": i % 11, "user_id": user_id} for i in range(args.tasks)])
+    # Don't hand open SQLite connections to the forked server
+    engine.dispose()
+    token = create_access_token(user_id, "bench")
+
+    total = args.connections * args.requests
+    print(f"{args.connections} connections x {args.requests} requests, {args.tasks} tasks, limit {args.limit}, "
+          f"{args.deadline:.0f} s deadline, {os.cpu_count()} CPU(s)")
+    for label, path in (("sync", "/bench/sync-tasks"), ("async", "/tasks/")):
+        path = f"{path}?limit={args.limit}"
+        # A fresh server per phase, so one that stalled can't hold up the next
+        server = start_server()
+        try:
+            # Warm up: fill the auth cache and the connection pool
+            asyncio.run(run_phase(path, token, 50, 2, args.deadline))
+            latencies, elapsed = asyncio.run(run_phase(path, token, args.connections, args.requests, args.deadline))
+        finally:
+            # Not terminate(): uvicorn's graceful shutdown would wait on any stalled requests
+            server.kill()
+            server.join()
+        if not latencies:
+            print(f"{label:6s} no request succeeded within the deadline")
+            continue
+        print(f"{label:6s} {len(latencies) / elapsed:7.0f} req/s   p50 {statistics.median(latencies):8.1f} ms   "
+              f"p99 {percentile(latencies, 99):8.1f} ms   max {max(latencies):8.1f} ms   "
+              f"failed or unfinished {total - len(latencies)}/{total}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Per-request authentication overhead with and without the token cache in
+dependencies.py.
+
+Runs against a scratch SQLite database. Times get_current_user() on its own
+(JWT decode + user lookup versus a cache hit), then GET /tasks/{id} through
+FastAPI's TestClient, once with AUTH_CACHE_TTL=0 and once with the cache on.
+
+Usage: python benchmarks/bench_auth_cache.py [--requests 2000] [--db bench_auth.db]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+
+def summarize(label: str, latencies: list[float]) -> None:
+    latencies = sorted(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{label:32s} mean {statistics.mean(latencies):8.1f} us   "
+          f"p50 {statistics.median(latencies):8.1f} us   p99 {p99:8.1f} us")
+
+
+def time_calls(fn, n: int) -> list[float]:
+    latencies = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1_000_000)
+    return latencies
+
+
+async def time_awaits(fn, n: int) -> list[float]:
+    latencies = []
+    for _ in range(n):
+        start = time.perf_counter()
+        await fn()
+        latencies.append((time.perf_counter() - start) * 1_000_000)
+    return latencies
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--requests", type=int, default=2000)
+    arg_parser.add_argument("--db", default="bench_auth.db")
+    args = arg_parser.parse_args()
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(args.db + suffix):
+            os.remove(args.db + suffix)
+    os.environ["DATABASE_URL"] = f"sqlite:///{args.db}"
+    os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+    from fastapi.security import HTTPAuthorizationCredentials
+    from fastapi.testclient import TestClient
+
+    import dependencies
+    from db import SessionLocal, Task, User
+    from main import app
+    from services.auth import create_access_token
+
+    with SessionLocal() as db:
+        user = User(username="bench", hashed_password="x")
+        db.add(user)
+        db.flush()
+        task = Task(title="bench task", priority=1, user_id=user.id)
+        db.add(task)
+        db.commit()
+        user_id, task_id = user.id, task.id
+
+    token = create_access_token(user_id, "bench")
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    headers = {"Authorization": f"Bearer {token}"}
+    # The context manager runs the app's event loop, which owns the async DB connections
+    with TestClient(app) as client:
+        async def dependency():
+            await dependencies.get_current_user(credentials)
+
+        def request():
+            client.get(f"/tasks/{task_id}", headers=headers).raise_for_status()
+
+        default_ttl = dependencies.AUTH_CACHE_TTL
+        for label, ttl in (("cache off", 0), ("cache on", default_ttl or 300)):
+            dependencies.AUTH_CACHE_TTL = ttl
+            dependencies.invalidate_user(user_id)
+            client.portal.call(time_awaits, dependency, 50)  # warm up (and fill the cache when on)
+            time_calls(request, 50)
+            summarize(f"get_current_user ({label})", client.portal.call(time_awaits, dependency, args.requests))
+            summarize(f"GET /tasks/{{id}} ({label})", time_calls(request, args.requests))
+
+
+if __name__ == "__main__":
+    main()
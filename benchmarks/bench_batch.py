@@ -0,0 +1,86 @@
+"""
+Insert --tasks tasks through POST /tasks/ one at a time versus one
+POST /tasks/batch, against a real API process (uvicorn) in a scratch
+directory.
+
+Usage: python benchmarks/bench_batch.py [--tasks 10000]
+"""
+
+import argparse
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from _util import wait_for
+from schemas.batch import MAX_BATCH_OPERATIONS
+from services.auth import hash_password
+
+API_PORT = 8012
+API = f"http://127.0.0.1:{API_PORT}"
+
+
+def seed_user(db_path: str) -> None:
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO users (username, hashed_password) VALUES (?, ?)", ("bench", hash_password("bench")))
+    conn.commit()
+    conn.close()
+
+
+def count_tasks(db_path: str) -> int:
+    conn = sqlite3.connect(db_path)
+    count = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+    conn.close()
+    return count
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--tasks", type=int, default=10_000)
+    args = arg_parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bb-bench-")
+    db_path = os.path.join(workdir, "busyness.db")
+    env = {**os.environ, "PYTHONPATH": REPO_DIR, "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "unused")}
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(API_PORT), "--log-level", "warning"],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for(f"{API}/docs")
+        seed_user(db_path)
+        session = requests.Session()
+        token = session.post(f"{API}/auth/login", json={"username": "bench", "password": "bench"}).json()["access_token"]
+        session.headers["Authorization"] = f"Bearer {token}"
+        tasks = [{"title": f"Task {i}", "priority": i % 11} for i in range(args.tasks)]
+
+        start = time.perf_counter()
+        for task in tasks:
+            session.post(f"{API}/tasks/", json=task).raise_for_status()
+        single = time.perf_counter() - start
+        print(f"POST /tasks/ x {args.tasks:6d}   {single:7.2f} s   {args.tasks / single:8.0f} tasks/s")
+
+        start = time.perf_counter()
+        for i in range(0, args.tasks, MAX_BATCH_OPERATIONS):
+            operations = [{"op": "create", "data": task} for task in tasks[i:i + MAX_BATCH_OPERATIONS]]
+            result = session.post(f"{API}/tasks/batch", json={"operations": operations}).json()
+            assert result["committed"] and not result["failed"], result
+        batch = time.perf_counter() - start
+        print(f"POST /tasks/batch ({args.tasks:6d})   {batch:7.2f} s   {args.tasks / batch:8.0f} tasks/s   "
+              f"({single / batch:.0f}x)")
+
+        assert count_tasks(db_path) == 2 * args.tasks
+    finally:
+        api.terminate()
+        api.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Keeping the GUI's active lists current: full reloads versus the change feed.
+
+One client follows GET /changes/stream and applies each change event to its
+cached lists (what app.py does); a second client makes --edits single-task
+updates. For each edit the benchmark times how long the first client takes
+to see it, and compares that with a full reload of the lists. At the end the
+delta-maintained cache must match a fresh load. The API runs in-process
+under uvicorn.
+
+Exits non-zero if the caches disagree.
+
+Usage: python benchmarks/bench_changes.py [--tasks 10000] [--goals 50] [--edits 200]
+"""
+
+import argparse
+import os
+import queue
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+API_PORT = 8014
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--tasks", type=int, default=10_000)
+    arg_parser.add_argument("--goals", type=int, default=50)
+    arg_parser.add_argument("--edits", type=int, default=200)
+    args = arg_parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bb-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'busyness.db')}"
+    os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+    import uvicorn
+    from sqlalchemy import insert
+
+    from client import BusynessClient
+    from db import Goal, SessionLocal, Task, User, engine
+    from main import app
+    from services.auth import hash_password
+
+    server = uvicorn.Server(uvicorn.Config(app, port=API_PORT, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    with SessionLocal() as db:
+        user = User(username="bench", hashed_password=hash_password("bench"))
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        goal_ids = [
+            conn.execute(insert(Goal).values(
+                goal=f"Goal {i}", priority=rng.randint(1, 10), accomplished=False,
+                forecast=rng.choice(["Short", "Medium", "Long"]), user_id=user_id,
+            )).inserted_primary_key[0]
+            for i in range(args.goals)
+        ]
+        conn.execute(insert(Task), [
+            {"title": f"Task {i}", "priority": rng.randint(1, 10), "completed": False,
+             "goal_id": rng.choice(goal_ids), "user_id": user_id}
+            for i in range(args.tasks)
+        ])
+
+    base_url = f"http://127.0.0.1:{API_PORT}"
+    deltas = queue.Queue()
+    follower = BusynessClient(base_url, on_change=deltas.put)
+    follower.login("bench", "bench")
+    writer = BusynessClient(base_url)
+    writer.login("bench", "bench")
+
+    # Full reload, as the GUI did after every change before the feed
+    start = time.perf_counter()
+    follower.active_tasks()
+    follower.active_goals()
+    reload_ms = (time.perf_counter() - start) * 1000
+
+    ready = threading.Event()
+
+    def follow():
+        for event, data in follower.stream_changes():
+            if event == "ready":
+                ready.set()
+            elif event != "keepalive":
+                follower.apply_change(event, data)
+
+    threading.Thread(target=follow, daemon=True).start()
+    ready.wait(10)
+
+    task_ids = [task["id"] for task in follower.active_tasks()]
+    latencies = []
+    for i in range(args.edits):
+        task_id = rng.choice(task_ids)
+        start = time.perf_counter()
+        writer.update_task(task_id, {"priority": rng.randint(1, 10), "title": f"Edited {i}"})
+        changes = deltas.get(timeout=10)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert changes[0][2]["id"] == task_id
+
+    # A goal rename reaches every task that embeds its title
+    writer.update_goal(goal_ids[0], {"goal": "Renamed"})
+    while not any(kind == "goal" for kind, _, _ in deltas.get(timeout=10)):
+        pass
+
+    kept = {task["id"]: task for task in follower.active_tasks()}, {goal["id"]: goal for goal in follower.active_goals()}
+    follower.invalidate()
+    fresh = {task["id"]: task for task in follower.active_tasks()}, {goal["id"]: goal for goal in follower.active_goals()}
+    consistent = kept == fresh
+
+    print(f"{args.tasks} tasks, {args.goals} goals")
+    print(f"full reload                 {reload_ms:8.1f} ms")
+    print(f"edit seen via change feed   {statistics.median(latencies):8.1f} ms median, "
+          f"{max(latencies):.1f} ms max over {args.edits} edits (includes the PATCH itself)")
+    print(f"cache matches a fresh load: {'yes' if consistent else 'NO'}")
+
+    server.should_exit = True
+    sys.exit(0 if consistent else 1)
+
+
+if __name__ == "__main__":
+    main()
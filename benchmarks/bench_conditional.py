@@ -0,0 +1,59 @@
+"""
+Polling a single task: plain GET versus conditional GET with If-None-Match.
+
+Creates one task with a long title (so serialization is a visible part of
+the cost) and polls GET /tasks/{id} --polls times each way through
+FastAPI's TestClient, reporting time per request and bytes returned.
+
+Usage: python benchmarks/bench_conditional.py [--polls 2000] [--title-size 4000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--polls", type=int, default=2000)
+    arg_parser.add_argument("--title-size", type=int, default=4000)
+    args = arg_parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bb-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'busyness.db')}"
+    os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+    from fastapi.testclient import TestClient
+
+    from db import SessionLocal, User
+    from main import app
+    from services.auth import hash_password
+
+    with SessionLocal() as db:
+        db.add(User(username="bench", hashed_password=hash_password("bench")))
+        db.commit()
+
+    client = TestClient(app)
+    token = client.post("/auth/login", json={"username": "bench", "password": "bench"}).json()["access_token"]
+    client.headers["Authorization"] = f"Bearer {token}"
+    task = client.post("/tasks/", json={"title": "x" * args.title_size, "priority": 5}).json()
+    url = f"/tasks/{task['id']}"
+    etag = client.get(url).headers["ETag"]
+
+    for label, headers, expected in (("plain GET", {}, 200), ("If-None-Match", {"If-None-Match": etag}, 304)):
+        received = 0
+        start = time.perf_counter()
+        for _ in range(args.polls):
+            response = client.get(url, headers=headers)
+            assert response.status_code == expected
+            received += len(response.content)
+        per_request = (time.perf_counter() - start) / args.polls * 1e6
+        print(f"{label:14s} {per_request:8.0f} µs/request   {received / args.polls:8.0f} body bytes/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Concurrent write throughput: a plain create_engine() (how db.py used to
+configure SQLite, minus echo) versus create_db_engine() (WAL, pragmas,
+pool sizing).
+
+--threads workers each commit --writes small transactions (insert a task,
+update it) through the "API" engine while a second engine on the same file
+plays the GUI, doing the same. Reports writes/s and "database is locked"
+failures for each configuration.
+
+Usage: python benchmarks/bench_db_writes.py [--threads 40] [--writes 50] [--db bench_writes.db]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from db import Base, Task, User, create_db_engine
+
+
+def writer(SessionLocal, user_id: int, writes: int, stats: dict, lock: threading.Lock) -> None:
+    ok = failed = 0
+    for i in range(writes):
+        db = SessionLocal()
+        try:
+            task = Task(title=f"write {i}", priority=1, user_id=user_id)
+            db.add(task)
+            db.commit()
+            task.priority = 2
+            db.commit()
+            ok += 1
+        except OperationalError:
+            db.rollback()
+            failed += 1
+        finally:
+            db.close()
+    with lock:
+        stats["ok"] += ok
+        stats["failed"] += failed
+
+
+def run(label: str, make_engine, path: str, threads: int, writes: int) -> None:
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    api_engine = make_engine(f"sqlite:///{path}")
+    gui_engine = make_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(api_engine)
+    ApiSession = sessionmaker(bind=api_engine, autoflush=False, autocommit=False)
+    GuiSession = sessionmaker(bind=gui_engine, autoflush=False, autocommit=False)
+
+    with ApiSession() as db:
+        user = User(username="bench", hashed_password="x")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+    stats = {"ok": 0, "failed": 0}
+    lock = threading.Lock()
+    workers = [
+        threading.Thread(target=writer, args=(ApiSession if i else GuiSession, user_id, writes, stats, lock))
+        for i in range(threads)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    print(f"{label:18s} {stats['ok'] / elapsed:8.1f} writes/s   "
+          f"ok {stats['ok']:5d}   locked {stats['failed']:5d}   {elapsed:6.2f} s")
+    api_engine.dispose()
+    gui_engine.dispose()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--threads", type=int, default=40)
+    arg_parser.add_argument("--writes", type=int, default=50)
+    arg_parser.add_argument("--db", default="bench_writes.db")
+    args = arg_parser.parse_args()
+
+    run("default engine", lambda url: create_engine(url), args.db, args.threads, args.writes)
+    run("create_db_engine", lambda url: create_db_engine(url, echo=False), args.db, args.threads, args.writes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark for the Google Calendar event upsert used by POST /events/sync.
+
+Pre-populates a scratch SQLite database (default: bench_busyness.db) with
+half of a synthetic calendar, then syncs the full calendar twice:
+once with the old per-event SELECT loop and once with upsert_google_events.
+
+Usage: python benchmarks/bench_event_sync.py [--events 5000] [--db bench_busyness.db]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+
+from db import Base, Event, User
+from services.event_sync import parse_google_event, upsert_google_events
+
+
+def make_google_events(n: int, revision: int = 0) -> list[dict]:
+    """Synthetic Google Calendar event resources."""
+    base = datetime(2025, 1, 6, 8, 0)
+    events = []
+    for i in range(n):
+        start = base + timedelta(minutes=30 * i)
+        events.append({
+            "id": f"bench-{i}",
+            "summary": f"Event {i} rev {revision if i % 10 == 0 else 0}",
+            "start": {"dateTime": start.isoformat() + "-05:00"},
+            "end": {"dateTime": (start + timedelta(minutes=30)).isoformat() + "-05:00"},
+        })
+    return events
+
+
+def per_event_sync(db, user_id: int, google_events) -> None:
+    """The original implementation: one SELECT per incoming event."""
+    for g_event in google_events:
+        row = parse_google_event(g_event)
+        event = db.query(Event).filter(
+            Event.google_id == row["google_id"],
+            Event.user_id == user_id
+        ).first()
+        if event:
+            event.summary = row["summary"]
+            event.start_time = row["start_time"]
+            event.end_time = row["end_time"]
+        else:
+            db.add(Event(**row, user_id=user_id))
+    db.commit()
+
+
+def reset(SessionLocal, user_id: int, n: int) -> None:
+    """Leave the first half of the calendar stored, as if synced before."""
+    with SessionLocal() as db:
+        db.execute(delete(Event).where(Event.user_id == user_id))
+        upsert_google_events(db, user_id, make_google_events(n)[: n // 2])
+        db.commit()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--events", type=int, default=5000)
+    arg_parser.add_argument("--db", default="bench_busyness.db")
+    args = arg_parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{args.db}")
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+    with SessionLocal() as db:
+        user = db.query(User).filter(User.username == "bench").first()
+        if user is None:
+            user = User(username="bench", hashed_password="x")
+            db.add(user)
+            db.commit()
+        user_id = user.id
+
+    incoming = make_google_events(args.events, revision=1)
+
+    reset(SessionLocal, user_id, args.events)
+    with SessionLocal() as db:
+        start = time.perf_counter()
+        per_event_sync(db, user_id, incoming)
+        per_event = time.perf_counter() - start
+
+    reset(SessionLocal, user_id, args.events)
+    with SessionLocal() as db:
+        start = time.perf_counter()
+        counts = upsert_google_events(db, user_id, incoming)
+        db.commit()
+        bulk = time.perf_counter() - start
+
+    print(f"{args.events} events, {args.events // 2} pre-populated")
+    print(f"per-event SELECT: {per_event * 1000:8.1f} ms")
+    print(f"bulk upsert:      {bulk * 1000:8.1f} ms  {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Query plans and timings for the hot queries, with and without the
+composite indexes declared in db.py.
+
+Builds a scratch SQLite database with --rows tasks, goals and events spread
+over --users users, then runs each query with the indexes dropped and again
+with them created, printing EXPLAIN QUERY PLAN and the mean time.
+
+Usage: python benchmarks/bench_indexes.py [--rows 100000] [--users 20] [--db bench_indexes.db]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, text
+
+from db import Base, Event, Goal, Task, User
+
+QUERIES = {
+    "events in a day": (
+        "SELECT id, summary, start_time FROM events "
+        "WHERE user_id = :user_id AND start_time >= :start AND start_time < :end"
+    ),
+    "event upsert lookup": (
+        "SELECT id FROM events WHERE user_id = :user_id AND calendar_id = 'primary' "
+        "AND google_id IN ('g-1', 'g-500', 'g-99999')"
+    ),
+    "active tasks by priority": (
+        "SELECT id, title, priority FROM tasks "
+        "WHERE user_id = :user_id AND completed = 0 ORDER BY priority DESC"
+    ),
+    "active goals by priority": (
+        "SELECT id, goal, priority FROM goals "
+        "WHERE user_id = :user_id AND accomplished = 0 ORDER BY priority DESC"
+    ),
+}
+
+
+def populate(engine, rows: int, users: int) -> None:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    rng = random.Random(42)
+    base = datetime(2025, 1, 1)
+
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"username": f"user{i}", "hashed_password": "x"} for i in range(1, users + 1)])
+        conn.execute(insert(Goal), [
+            {"goal": f"Goal {i}", "priority": rng.randint(0, 10), "accomplished": rng.random() < 0.7,
+             "forecast": rng.choice(["Short", "Medium", "Long"]), "user_id": rng.randint(1, users)}
+            for i in range(rows)
+        ])
+        conn.execute(insert(Task), [
+            {"title": f"Task {i}", "priority": rng.randint(0, 10), "completed": rng.random() < 0.7,
+             "user_id": rng.randint(1, users)}
+            for i in range(rows)
+        ])
+        conn.execute(insert(Event), [
+            {"google_id": f"g-{i}", "summary": f"Event {i}",
+             "start_time": base + timedelta(minutes=rng.randint(0, 365 * 24 * 60)),
+             "user_id": rng.randint(1, users)}
+            for i in range(rows)
+        ])
+
+
+def run(engine, label: str, repeat: int = 20) -> None:
+    params = {"user_id": 1, "start": datetime(2025, 6, 1), "end": datetime(2025, 6, 2)}
+    print(f"--- {label}")
+    with engine.connect() as conn:
+        conn.execute(text("ANALYZE"))
+        for name, sql in QUERIES.items():
+            plan = conn.execute(text("EXPLAIN QUERY PLAN " + sql), params).fetchall()
+            start = time.perf_counter()
+            for _ in range(repeat):
+                conn.execute(text(sql), params).fetchall()
+            elapsed = (time.perf_counter() - start) / repeat * 1000
+            print(f"{name:26s} {elapsed:8.2f} ms   " + " | ".join(row[-1] for row in plan))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--rows", type=int, default=100_000)
+    arg_parser.add_argument("--users", type=int, default=20)
+    arg_parser.add_argument("--db", default="bench_indexes.db")
+    args = arg_parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{args.db}")
+    populate(engine, args.rows, args.users)
+    indexes = [index for table in Base.metadata.sorted_tables for index in table.indexes]
+
+    for index in indexes:
+        index.drop(engine, checkfirst=True)
+    run(engine, f"without indexes ({args.rows} rows per table)")
+
+    for index in indexes:
+        index.create(engine, checkfirst=True)
+    run(engine, f"with indexes ({args.rows} rows per table)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+CRUD latency while a burst of logins runs.
+
+Several threads poll GET /tasks/ and the benchmark records their latency
+while nothing else runs, and again alongside --login-threads clients
+logging in back to back:
+
+- "legacy login": the old route, a sync endpoint that checks the password
+  with bcrypt on the shared threadpool (mounted here just for comparison)
+- "login": POST /auth/login, which checks passwords on the dedicated
+  password executor
+
+The API runs in-process under uvicorn. The login limiter is raised out of
+the way so every attempt does a full bcrypt check.
+
+Usage: python benchmarks/bench_login.py [--rounds 12] [--crud-threads 8] [--login-threads 64] [--seconds 10]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from _util import percentile
+
+API_PORT = 8016
+
+
+def run_phase(base_url, token, args, login_path=None):
+    import requests
+
+    stop = threading.Event()
+    crud_ms = []
+    logins = [0]
+    lock = threading.Lock()
+
+    def crud():
+        session = requests.Session()
+        session.headers["Authorization"] = f"Bearer {token}"
+        while not stop.is_set():
+            start = time.perf_counter()
+            session.get(f"{base_url}/tasks/", params={"limit": 50}).raise_for_status()
+            with lock:
+                crud_ms.append((time.perf_counter() - start) * 1000)
+
+    def login():
+        session = requests.Session()
+        while not stop.is_set():
+            response = session.post(f"{base_url}{login_path}", json={"username": "bench", "password": "bench"}, timeout=300)
+            response.raise_for_status()
+            with lock:
+                logins[0] += 1
+
+    threads = [threading.Thread(target=crud) for _ in range(args.crud_threads)]
+    if login_path:
+        threads += [threading.Thread(target=login) for _ in range(args.login_threads)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return crud_ms, logins[0]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--rounds", type=int, default=12)
+    arg_parser.add_argument("--crud-threads", type=int, default=8)
+    arg_parser.add_argument("--login-threads", type=int, default=64)
+    arg_parser.add_argument("--seconds", type=float, default=10)
+    args = arg_parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bb-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'busyness.db')}"
+    os.environ.setdefault("OPENAI_API_KEY", "unused")
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    os.environ["LOGIN_IP_MAX_ATTEMPTS"] = os.environ["LOGIN_MAX_ATTEMPTS"] = str(10 ** 9)
+
+    import requests
+    import uvicorn
+    from fastapi import APIRouter, Depends, HTTPException
+    from sqlalchemy import insert
+    from sqlalchemy.orm import Session
+
+    from db import SessionLocal, Task, User, engine, get_db
+    from main import app
+    from schemas.auth import LoginRequest, LoginResponse
+    from services.auth import PASSWORD_WORKERS, create_access_token, hash_password, verify_password
+
+    legacy = APIRouter()
+
+    @legacy.post("/bench/legacy-login", response_model=LoginResponse)
+    def legacy_login(payload: LoginRequest, db: Session = Depends(get_db)):
+        user = db.query(User).filter(User.username == payload.username).first()
+        if not user or not verify_password(payload.password, user.hashed_password):
+            raise HTTPException(status_code=401, detail="Invalid username or password")
+        return LoginResponse(access_token=create_access_token(user.id, user.username), user_id=user.id, username=user.username)
+
+    app.include_router(legacy)
+
+    server = uvicorn.Server(uvicorn.Config(app, port=API_PORT, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    with SessionLocal() as db:
+        user = User(username="bench", hashed_password=hash_password("bench"))
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    with engine.begin() as conn:
+        conn.execute(insert(Task), [{"title": f"Task {i}", "priority": i % 11, "user_id": user_id} for i in range(500)])
+
+    base_url = f"http://127.0.0.1:{API_PORT}"
+    token = requests.post(f"{base_url}/auth/login", json={"username": "bench", "password": "bench"}).json()["access_token"]
+
+    print(f"bcrypt cost {args.rounds}, {PASSWORD_WORKERS} password worker(s), {os.cpu_count()} CPU(s), "
+          f"{args.crud_threads} CRUD threads, {args.login_threads} login threads, {args.seconds:.0f} s per phase")
+    for label, path in (("CRUD only", None), ("+ legacy login", "/bench/legacy-login"), ("+ login", "/auth/login")):
+        crud_ms, logins = run_phase(base_url, token, args, path)
+        print(f"{label:16s} CRUD p50 {statistics.median(crud_ms):7.1f} ms  p99 {percentile(crud_ms, 99):8.1f} ms  "
+              f"{len(crud_ms) / args.seconds:6.0f} req/s   logins {logins / args.seconds:5.1f}/s")
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
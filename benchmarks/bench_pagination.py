@@ -0,0 +1,82 @@
+"""
+Page fetch cost at increasing depth: OFFSET pagination versus the keyset
+cursors used by GET /tasks/ (services/pagination.py).
+
+Builds a scratch SQLite database with --rows tasks for a single user (about
+a fifth with no due date), then times fetching one page of --limit rows at
+each depth for the default priority sort and the due_date sort.
+
+Usage: python benchmarks/bench_pagination.py [--rows 200000] [--limit 50] [--db bench_pagination.db]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from db import Base, Task, User
+from services.pagination import encode_cursor, paginate
+
+
+def populate(engine, rows: int) -> None:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    rng = random.Random(42)
+    base = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"username": "bench", "hashed_password": "x"}])
+        conn.execute(insert(Task), [
+            {"title": f"Task {i}", "priority": rng.randint(0, 10), "completed": rng.random() < 0.5,
+             "due_date": None if rng.random() < 0.2 else base + timedelta(minutes=rng.randint(0, 365 * 24 * 60)),
+             "user_id": 1}
+            for i in range(rows)
+        ])
+
+
+def timed(fn, repeat: int = 5) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--rows", type=int, default=200_000)
+    arg_parser.add_argument("--limit", type=int, default=50)
+    arg_parser.add_argument("--db", default="bench_pagination.db")
+    args = arg_parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{args.db}")
+    populate(engine, args.rows)
+    db = sessionmaker(bind=engine)()
+
+    for sort, descending in (("priority", True), ("due_date", False)):
+        column = getattr(Task, sort)
+        query = db.query(Task).filter(Task.user_id == 1)
+        ordered = query.order_by(column.desc() if descending else column.asc(), Task.id.desc() if descending else Task.id.asc())
+        print(f"--- sort={sort} {'desc' if descending else 'asc'}, {args.rows} rows, pages of {args.limit}")
+
+        for depth in (0, 1_000, 10_000, 50_000, args.rows - args.limit):
+            # The cursor a client would hold after paging down to this depth
+            cursor = None
+            if depth:
+                last = ordered.offset(depth - 1).limit(1).one()
+                cursor = encode_cursor(sort, [getattr(last, sort)], last.id)
+
+            offset_ms = timed(lambda: ordered.offset(depth).limit(args.limit).all())
+            keyset_ms = timed(lambda: paginate(query, sort, [column], Task.id, descending, cursor, args.limit))
+            print(f"depth {depth:7d}   offset {offset_ms:8.2f} ms   keyset {keyset_ms:6.2f} ms")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
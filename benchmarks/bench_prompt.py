@@ -0,0 +1,100 @@
+"""
+Analysis prompt size: the old f-string prompt versus services/prompt.py.
+
+Seeds a scratch database with a large user (--goals open goals, --tasks
+tasks linked to them, --events events today), loads the analysis inputs
+the way the API does, and prints the size of the old prompt (the same rows
+as model_dump() dicts embedded as Python reprs) and of the compact prompt
+at a few token budgets. Token counts use the same offline estimate for both.
+
+Usage: python benchmarks/bench_prompt.py [--goals 200] [--tasks 2000] [--events 40]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+import pytz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from legacy_prompt import legacy_inputs, legacy_prompt
+
+
+def seed(goals: int, tasks: int, events: int) -> int:
+    """Create a user with goals open goals, tasks tasks linked to them and events events today. Returns its id."""
+    from sqlalchemy import insert
+
+    from db import Event, Goal, Task, User, engine
+
+    forecasts = ["Short", "Medium", "Long"]
+    day = datetime.now(pytz.timezone("US/Eastern")).replace(hour=8, minute=0, second=0, microsecond=0, tzinfo=None)
+    with engine.begin() as conn:
+        user_id = conn.execute(insert(User).values(username="bench", hashed_password="x")).inserted_primary_key[0]
+        conn.execute(insert(Goal), [
+            {"goal": f"Goal {i}: ship the quarterly {['launch', 'hiring plan', 'budget'][i % 3]} review",
+             "priority": i % 11, "forecast": forecasts[i % 3], "accomplished": False, "user_id": user_id}
+            for i in range(goals)
+        ])
+        conn.execute(insert(Task), [
+            {"title": f"Task {i}: draft notes for the {['design', 'planning', 'retro'][i % 3]} meeting",
+             "priority": i % 11, "due_date": day + timedelta(days=i % 14), "goal_id": i % goals + 1,
+             "user_id": user_id}
+            for i in range(tasks)
+        ])
+        conn.execute(insert(Event), [
+            {"google_id": f"evt-{i}", "summary": f"Event {i}: {['1:1', 'standup', 'focus block'][i % 3]}",
+             "start_time": day + timedelta(minutes=15 * i), "end_time": day + timedelta(minutes=15 * i + 30),
+             "user_id": user_id}
+            for i in range(events)
+        ])
+    return user_id
+
+
+def load_inputs(user_id: int) -> tuple:
+    """The analysis inputs for user_id, loaded the way the API loads them."""
+    from db import async_engine
+    from services.analysis import load_analysis_inputs_async
+
+    async def load():
+        try:
+            return await load_analysis_inputs_async(user_id)
+        finally:
+            await async_engine.dispose()
+
+    return asyncio.run(load())
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--goals", type=int, default=200)
+    arg_parser.add_argument("--tasks", type=int, default=2000)
+    arg_parser.add_argument("--events", type=int, default=40)
+    args = arg_parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bb-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'busyness.db')}"
+    os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+    from services.prompt import PROMPT_TOKEN_BUDGET, build_prompt, estimate_tokens
+
+    user_id = seed(args.goals, args.tasks, args.events)
+    inputs = load_inputs(user_id)
+    goals_out, tasks_out, events_out = inputs
+    print(f"{len(goals_out)} goals, {len(tasks_out)} tasks, {len(events_out)} events in the analysis inputs")
+
+    old = legacy_prompt(*legacy_inputs(user_id, *inputs))
+    old_tokens = estimate_tokens(old)
+    print(f"{'old prompt':24s} {len(old):8d} chars  {old_tokens:7d} tokens")
+    for budget in sorted({PROMPT_TOKEN_BUDGET, 1000, 4000, 10 ** 9}):
+        prompt = build_prompt(*inputs, budget=budget)
+        label = "new, no budget" if budget == 10 ** 9 else f"new, budget {budget}"
+        print(f"{label:24s} {len(prompt.text):8d} chars  {prompt.tokens:7d} tokens  ({old_tokens / prompt.tokens:4.1f}x smaller)"
+              f"  {prompt.items} items, {prompt.omitted} left out")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+OpenAI calls and latency of a multi-day review (GET /analysis/ with a date range).
+
+Starts the stub LLM server, seeds a scratch database with --goals goals,
+--tasks tasks and --events events on each of the last --days days, then
+asks for a review of those days (narrative=true, so every day goes to the
+stub rather than the local verdict) three times: cold, again unchanged,
+and again after adding one event today. For each run it prints the calls
+the stub saw and the wall time. The per-day summaries run
+ANALYSIS_DAY_CONCURRENCY at a time; the last line compares the size of the
+combining prompt with the day prompts it stands in for.
+
+Usage: python benchmarks/bench_range_analysis.py [--days 7] [--events 30] [--goals 50] [--tasks 200] [--llm-delay 1.0]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+import requests
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from _util import wait_for
+
+STUB_PORT = 8112
+STUB = f"http://127.0.0.1:{STUB_PORT}"
+
+
+def stub_calls() -> int:
+    return requests.get(f"{STUB}/calls", timeout=5).json()["calls"]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--days", type=int, default=7)
+    arg_parser.add_argument("--events", type=int, default=30)
+    arg_parser.add_argument("--goals", type=int, default=50)
+    arg_parser.add_argument("--tasks", type=int, default=200)
+    arg_parser.add_argument("--llm-delay", type=float, default=1.0)
+    args = arg_parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bb-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'busyness.db')}"
+    os.environ["OPENAI_BASE_URL"] = f"{STUB}/v1"
+    os.environ["OPENAI_API_KEY"] = "stub"
+
+    stub = subprocess.Popen(
+        [sys.executable, os.path.join(REPO_DIR, "benchmarks", "stub_llm_server.py"),
+         "--port", str(STUB_PORT), "--delay", str(args.llm_delay)],
+        cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for(f"{STUB}/calls")
+
+        from fastapi.testclient import TestClient
+        from sqlalchemy import insert
+
+        from db import Event, Goal, Task, User, engine
+        from main import app
+        from services.analysis import ANALYSIS_DAY_CONCURRENCY, load_analysis_inputs_async
+        from services.auth import create_access_token
+        from services.busyness import day_window, today
+        from services.prompt import DAY_SUMMARY_INSTRUCTIONS, build_prompt
+
+        end = today()
+        days = [end - timedelta(days=i) for i in reversed(range(args.days))]
+        with engine.begin() as conn:
+            user_id = conn.execute(insert(User).values(username="bench", hashed_password="x")).inserted_primary_key[0]
+            conn.execute(insert(Goal), [
+                {"goal": f"Goal {i}: ship the quarterly review", "priority": i % 11, "accomplished": False,
+                 "user_id": user_id}
+                for i in range(args.goals)
+            ])
+            conn.execute(insert(Task), [
+                {"title": f"Task {i}: draft notes for the planning meeting", "priority": i % 11,
+                 "goal_id": i % args.goals + 1, "user_id": user_id}
+                for i in range(args.tasks)
+            ])
+            for day in days:
+                start = day_window(day)[0].replace(tzinfo=None, hour=8)
+                conn.execute(insert(Event), [
+                    {"google_id": f"evt-{day}-{i}", "summary": f"Event {i}: {['standup', 'focus block'][i % 2]}",
+                     "start_time": start + timedelta(minutes=20 * i),
+                     "end_time": start + timedelta(minutes=20 * i + 15), "user_id": user_id}
+                    for i in range(args.events)
+                ])
+
+        headers = {"Authorization": f"Bearer {create_access_token(user_id, 'bench')}"}
+        params = {"start_date": days[0].isoformat(), "end_date": end.isoformat(), "narrative": "true"}
+        print(f"{args.days}-day review, {args.events} events a day, stub delay {args.llm_delay} s, "
+              f"{ANALYSIS_DAY_CONCURRENCY} days summarized at once")
+
+        with TestClient(app) as client:
+            def review(label: str) -> dict:
+                calls = stub_calls()
+                start = time.perf_counter()
+                response = client.get("/analysis/", params=params, headers=headers)
+                seconds = time.perf_counter() - start
+                response.raise_for_status()
+                print(f"{label:32s} {stub_calls() - calls:3d} OpenAI calls  {seconds:6.2f} s")
+                return response.json()
+
+            review("first run")
+            review("again, nothing changed")
+            with engine.begin() as conn:
+                start = day_window(end)[0].replace(tzinfo=None, hour=20)
+                conn.execute(insert(Event).values(google_id="evt-new", summary="Dinner with the team", start_time=start,
+                                                  end_time=start + timedelta(hours=1), user_id=user_id))
+            result = review("again, one event added today")
+
+            day_inputs = [client.portal.call(load_analysis_inputs_async, user_id, day) for day in days]
+            day_tokens = sum(build_prompt(*inputs, day=day, instructions=DAY_SUMMARY_INSTRUCTIONS).tokens
+                             for inputs, day in zip(day_inputs, days))
+            print(f"combining prompt {result['prompt']['tokens']} tokens, "
+                  f"day prompts {day_tokens} tokens together")
+    finally:
+        stub.terminate()
+        stub.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Cost of refreshing the GUI's Active Items lists at growing task counts.
+
+"before" replays the old refresh_active against the database: one query
+for tasks, then one goal lookup per task. "after" is what the app does now:
+BusynessClient pulls the lists from the API (tasks with goal titles
+embedded, goals sorted in SQL) and app.py formats the rows. The API runs
+in-process under uvicorn so every SQL statement can be counted, on the
+sync engine and on the async engine the routes query through.
+
+The "after" column is checked against allowed_statements() and
+--budget-ms per 1000 tasks; tests/test_refresh.py holds the app to the
+same bounds.
+
+Usage: python benchmarks/bench_refresh.py [--tasks 500 2000 10000] [--goals 50] [--budget-ms 250]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+API_PORT = 8013
+
+
+class StatementCounter:
+    def __init__(self, *engines):
+        self.count = 0
+        self._lock = threading.Lock()
+        from sqlalchemy import event
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        with self._lock:
+            self.count += 1
+
+
+def start_api(port: int = API_PORT):
+    """
+    Serve the app on port from a thread and log a client in as a fresh user.
+    DATABASE_URL must be set first. Returns (server, client, user id, counter).
+    """
+    import uvicorn
+
+    from client import BusynessClient
+    from db import SessionLocal, User, async_engine, engine
+    from main import app
+    from services.auth import hash_password
+
+    server = uvicorn.Server(uvicorn.Config(app, port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    with SessionLocal() as db:
+        user = User(username="bench", hashed_password=hash_password("bench"))
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+    api = BusynessClient(f"http://127.0.0.1:{port}")
+    api.login("bench", "bench")
+    # Async engine events fire on its sync_engine
+    return server, api, user_id, StatementCounter(engine, async_engine.sync_engine)
+
+
+def seed(user_id: int, tasks: int, goals: int, rng: random.Random) -> None:
+    """Replace every task and goal with goals random goals and tasks random tasks for user_id."""
+    from sqlalchemy import delete, insert
+
+    from db import Goal, Task, engine
+
+    with engine.begin() as conn:
+        conn.execute(delete(Task))
+        conn.execute(delete(Goal))
+        goal_ids = [
+            conn.execute(insert(Goal).values(
+                goal=f"Goal {i}", priority=rng.randint(1, 10), accomplished=False,
+                forecast=rng.choice(["Short", "Medium", "Long"]), user_id=user_id,
+            )).inserted_primary_key[0]
+            for i in range(goals)
+        ]
+        conn.execute(insert(Task), [
+            {"title": f"Task {i}", "priority": rng.randint(1, 10), "completed": False,
+             "goal_id": rng.choice(goal_ids), "user_id": user_id}
+            for i in range(tasks)
+        ])
+
+
+def refresh(api, counter: StatementCounter) -> tuple[list, list, float, int]:
+    """
+    What the app does to refresh the lists, from a cold client cache.
+    Returns (task rows, goal rows, ms, SQL statements).
+    """
+    from app import goal_display_text, task_display_text
+
+    api.invalidate()
+    counter.count = 0
+    start = time.perf_counter()
+    # Rows are shown in the order the API sends them
+    tasks = api.active_tasks()
+    goals = api.active_goals()
+    rows = [task_display_text(task) for task in tasks] + [goal_display_text(goal) for goal in goals]
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    assert len(rows) == len(tasks) + len(goals)
+    return tasks, goals, elapsed_ms, counter.count
+
+
+def allowed_statements(tasks: int, goals: int) -> int:
+    """One SELECT per page, plus at most two more per list for the page after a cursor."""
+    from client import PAGE_SIZE
+
+    return 3 * (math.ceil(tasks / PAGE_SIZE) + math.ceil(goals / PAGE_SIZE)) + 2
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--tasks", type=int, nargs="+", default=[500, 2000, 10_000])
+    arg_parser.add_argument("--goals", type=int, default=50)
+    arg_parser.add_argument("--budget-ms", type=float, default=250)
+    args = arg_parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bb-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'busyness.db')}"
+    os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+    from db import Goal, SessionLocal, Task
+
+    server, api, user_id, counter = start_api()
+    rng = random.Random(42)
+
+    for n in args.tasks:
+        seed(user_id, n, args.goals, rng)
+
+        # Before: the old refresh_active, straight against the database
+        counter.count = 0
+        start = time.perf_counter()
+        with SessionLocal() as db:
+            tasks = db.query(Task).filter(Task.completed == False, Task.user_id == user_id).order_by(
+                Task.priority.desc(), Task.goal_id.asc().nullsfirst()
+            ).all()
+            for task in tasks:
+                if task.goal_id:
+                    db.query(Goal).filter(Goal.id == task.goal_id).first()
+            db.query(Goal).filter(Goal.accomplished == False, Goal.user_id == user_id).all()
+        before_ms = (time.perf_counter() - start) * 1000
+        before_statements = counter.count
+
+        # After: the client's cache is cold, as it is after any mutation
+        _, _, after_ms, after_statements = refresh(api, counter)
+
+        allowed = allowed_statements(n, args.goals)
+        budget = args.budget_ms * max(n, 1000) / 1000
+        ok = after_statements <= allowed and after_ms <= budget
+
+        print(f"{n:6d} tasks   before {before_ms:8.1f} ms {before_statements:6d} queries   "
+              f"after {after_ms:8.1f} ms {after_statements:4d} queries (limit {allowed}, {budget:.0f} ms)"
+              f"   {'ok' if ok else 'OVER BUDGET'}")
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Latency of the local busyness score (GET /analysis/score).
+
+Seeds a scratch database with --tasks open tasks and --goals goals, then
+for each event count fills today's calendar with that many events and
+times the scorer on its own (services/busyness.score_day on rows already
+loaded) and the whole endpoint through FastAPI's TestClient.
+
+Titles are drawn from a small fixed vocabulary with a skewed word
+frequency, so common words pair many events with many tasks, close to the
+worst case for the scorer.
+
+Usage: python benchmarks/bench_score.py [--events 100,1000,5000] [--tasks 1000] [--goals 100] [--runs 20]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORDS = (
+    "review plan draft email call sync design budget hiring interview report deploy fix write read "
+    "spanish gym run study customer launch roadmap retro standup lunch inbox notes slides demo "
+    "research proposal contract invoice taxes doctor groceries onboarding mentor feedback blog"
+).split()
+
+
+def title(rng: random.Random, words: int) -> str:
+    # Skewed towards the first words, like real titles
+    return " ".join(WORDS[min(int(rng.paretovariate(1.5)) - 1, len(WORDS) - 1)] for _ in range(words))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--events", default="100,1000,5000")
+    arg_parser.add_argument("--tasks", type=int, default=1000)
+    arg_parser.add_argument("--goals", type=int, default=100)
+    arg_parser.add_argument("--runs", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bb-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'busyness.db')}"
+    os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import delete, insert
+
+    from db import Event, Goal, Task, User, engine
+    from main import app
+    from services.auth import create_access_token
+    from services.busyness import day_window, score_day
+
+    rng = random.Random(1)
+    tasks = [namedtuple("T", "id title")(i + 1, title(rng, 3)) for i in range(args.tasks)]
+    goals = [namedtuple("G", "id goal")(i + 1, title(rng, 3)) for i in range(args.goals)]
+    with engine.begin() as conn:
+        user_id = conn.execute(insert(User).values(username="bench", hashed_password="x")).inserted_primary_key[0]
+        conn.execute(insert(Task), [{"title": t.title, "priority": t.id % 11, "user_id": user_id} for t in tasks])
+        conn.execute(insert(Goal), [{"goal": g.goal, "priority": g.id % 11, "accomplished": False, "user_id": user_id}
+                                    for g in goals])
+
+    day_start = day_window()[0].replace(tzinfo=None)
+    headers = {"Authorization": f"Bearer {create_access_token(user_id, 'bench')}"}
+    print(f"{args.tasks} tasks, {args.goals} goals, median of {args.runs} runs")
+    with TestClient(app) as client:
+        for count in (int(n) for n in args.events.split(",")):
+            step = timedelta(days=1) / count
+            rows = [{"google_id": f"evt-{i}", "summary": title(rng, 2), "start_time": day_start + step * i,
+                     "end_time": day_start + step * (i + 1), "user_id": user_id} for i in range(count)]
+            with engine.begin() as conn:
+                conn.execute(delete(Event))
+                conn.execute(insert(Event), rows)
+            events = [namedtuple("E", "id summary start_time end_time")(i, r["summary"], r["start_time"], r["end_time"])
+                      for i, r in enumerate(rows)]
+
+            scorer_ms, endpoint_ms = [], []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                score = score_day(day_start.date(), events, tasks, goals)
+                scorer_ms.append((time.perf_counter() - start) * 1000)
+
+                start = time.perf_counter()
+                response = client.get("/analysis/score", headers=headers)
+                endpoint_ms.append((time.perf_counter() - start) * 1000)
+                response.raise_for_status()
+
+            print(f"{count:6d} events   scorer {statistics.median(scorer_ms):7.1f} ms   "
+                  f"GET /analysis/score {statistics.median(endpoint_ms):7.1f} ms   "
+                  f"linked {score.score:.0%} ({score.verdict})")
+
+
+if __name__ == "__main__":
+    main()
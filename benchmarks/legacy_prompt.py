@@ -0,0 +1,45 @@
+"""
+The analysis prompt as gpt_analyze built it before services/prompt.py, kept
+to measure the compact prompt against (benchmarks/bench_prompt.py and
+tests/test_prompt_budget.py).
+"""
+
+
+def legacy_prompt(goals_out, tasks_out, events_out) -> str:
+    """The prompt gpt_analyze used to send (PROMPT_VERSION 1)."""
+    return f"""
+    Unaccomplished Goals:
+    {goals_out}
+
+    Top Tasks for the Week (max 10, by priority):
+    {tasks_out}
+
+    Today's Planned Work:
+    {events_out}
+
+    Please analyze whether today's work align with my tasks and goals,
+    and point out anything that looks like busywork rather than working towards my tasks , and thus my important goals ! The idea is to identify 'busyness' (bad) versus 'business' (good).
+
+    Finish with a sentence that gives a final verdict on if today's plan is good, and if not what changes to make to nudge me towards acutally accomplishing my goals. Identify any flaws on the daily work side, how tasks are organized and related to goals, or even hihg level goals.
+
+    """
+
+
+def legacy_inputs(user_id: int, goals, tasks, events) -> tuple:
+    """The analysis inputs as the old prompt embedded them: schema dicts of the same rows."""
+    from sqlalchemy import select
+
+    from db import Event, Goal, SessionLocal, Task
+    from schemas import EventRead, GoalRead, TaskRead
+
+    with SessionLocal() as db:
+        goal_rows = db.scalars(select(Goal).where(Goal.user_id == user_id, Goal.accomplished == False)).all()
+        task_rows = db.scalars(select(Task).where(Task.user_id == user_id)
+                               .order_by(Task.priority.desc(), Task.id).limit(len(tasks))).all()
+        event_rows = db.scalars(select(Event).where(Event.user_id == user_id)
+                                .order_by(Event.start_time).limit(len(events))).all()
+        return (
+            [GoalRead.model_validate(g).model_dump() for g in goal_rows],
+            [TaskRead.model_validate(t).model_dump() for t in task_rows],
+            [EventRead.model_validate(e).model_dump() for e in event_rows],
+        )
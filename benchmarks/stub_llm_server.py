@@ -0,0 +1,99 @@
+"""
+Local stand-in for the OpenAI chat completions API.
+
+Answers POST /v1/chat/completions with a canned analysis, either as one JSON
+response or streamed as server-sent event chunks (stream=true), after a
+configurable delay, and counts the calls at GET /calls. Point the backend
+at it to exercise /analysis/ and /analysis/stream without an API key:
+
+Usage:
+    python benchmarks/stub_llm_server.py [--port 8100] [--delay 2.0] [--chunk-delay 0.05]
+    OPENAI_BASE_URL=http://localhost:8100/v1 OPENAI_API_KEY=stub uvicorn main:app
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+CANNED_ANALYSIS = (
+    "Today's calendar is mostly meetings with no link to your top goals. "
+    "The two focus blocks map to your highest-priority task. "
+    "Verdict: move the status sync to tomorrow and protect the afternoon for deep work."
+)
+
+app = FastAPI(title="Stub LLM")
+app.state.delay = 2.0
+app.state.chunk_delay = 0.05
+app.state.calls = 0
+
+
+def _chunk(completion_id: str, model: str, delta: dict, finish_reason=None) -> str:
+    body = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(body)}\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    app.state.calls += 1
+    body = await request.json()
+    model = body.get("model", "stub")
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+
+    if body.get("stream"):
+        async def chunks():
+            await asyncio.sleep(app.state.chunk_delay)
+            yield _chunk(completion_id, model, {"role": "assistant", "content": ""})
+            for word in CANNED_ANALYSIS.split(" "):
+                await asyncio.sleep(app.state.chunk_delay)
+                yield _chunk(completion_id, model, {"content": word + " "})
+            yield _chunk(completion_id, model, {}, finish_reason="stop")
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    await asyncio.sleep(app.state.delay)
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": CANNED_ANALYSIS},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+@app.get("/calls")
+async def calls():
+    return {"calls": app.state.calls}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--port", type=int, default=8100)
+    arg_parser.add_argument("--delay", type=float, default=2.0, help="seconds before a non-streamed reply")
+    arg_parser.add_argument("--chunk-delay", type=float, default=0.05, help="seconds between streamed chunks")
+    args = arg_parser.parse_args()
+
+    app.state.delay = args.delay
+    app.state.chunk_delay = args.chunk_delay
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+REST client for the Busyness Buster API, used by the Tkinter app.
+
+One pooled requests.Session (keep-alive, shared by every thread) and an
+in-memory cache of active tasks and goals. Once loaded, the cache is kept
+current by applying change events (from /changes/stream, and from this
+client's own writes) row by row; on_change hears about every row that moved.
+close() cuts off open streams and refuses further calls, so worker threads
+blocked on the API return when the app quits.
+"""
+
+import json
+import os
+import socket
+import threading
+from contextlib import contextmanager
+from datetime import date
+
+import requests
+from requests.adapters import HTTPAdapter
+
+API_BASE_URL = os.getenv("BUSYNESS_API_URL", "http://localhost:8000")
+REQUEST_TIMEOUT = 10  # seconds
+POOL_SIZE = 8  # keep-alive connections kept open to the API
+PAGE_SIZE = 500  # the API's maximum page size
+CHANGES_READ_TIMEOUT = 30  # seconds; the server sends a keepalive well within this
+
+
+class ApiError(Exception):
+    """The API answered with an error status."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(f"{status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+class BusynessClient:
+    def __init__(self, base_url: str = API_BASE_URL, timeout: float = REQUEST_TIMEOUT, on_change=None):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.user_id = None
+        self.username = None
+
+        # Called from whichever thread applied a change, with [(kind, old, new), ...]:
+        # old is None for a row that became active, new is None for one that left
+        self.on_change = on_change
+
+        self._lock = threading.Lock()
+        self._tasks = None  # active tasks by id, None until loaded
+        self._goals = None  # active goals by id, None until loaded
+        # Changes that arrive while a list loads, replayed on top of it; None when not loading
+        self._backlog = {"task": None, "goal": None}
+        # Streaming responses being read, so close() can cut them off
+        self._streams = set()
+        self.closed = False
+
+    # --- plumbing ---
+
+    def close(self):
+        """
+        Stop for good: cut off open streams (a thread reading one gets a
+        ConnectionError right away) and close the pooled connections. Calls
+        made afterwards raise ConnectionError.
+        """
+        with self._lock:
+            self.closed = True
+            streams, self._streams = list(self._streams), set()
+        for response in streams:
+            connection = response.raw.connection
+            if connection is not None and connection.sock is not None:
+                try:
+                    # Closing alone doesn't wake a thread blocked in recv(); shutting the socket down does
+                    connection.sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+            response.close()
+        self.session.close()
+
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        if self.closed:
+            raise requests.exceptions.ConnectionError("Client closed")
+        kwargs.setdefault("timeout", self.timeout)
+        response = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+        if response.status_code >= 400:
+            try:
+                detail = response.json().get("detail", response.text)
+            except ValueError:
+                detail = response.text
+            raise ApiError(response.status_code, str(detail))
+        return response
+
+    @contextmanager
+    def _stream(self, path: str, **kwargs):
+        """GET path as a stream that close() can interrupt."""
+        response = self._request("GET", path, stream=True, **kwargs)
+        with self._lock:
+            if self.closed:
+                response.close()
+                raise requests.exceptions.ConnectionError("Client closed")
+            self._streams.add(response)
+        try:
+            with response:
+                yield response
+        finally:
+            with self._lock:
+                self._streams.discard(response)
+
+    def _list_all(self, path: str, **params) -> list[dict]:
+        """Follow next_cursor through every page of a list endpoint."""
+        items = []
+        params["limit"] = PAGE_SIZE
+        while True:
+            page = self._request("GET", path, params=params).json()
+            items += page["items"]
+            if not page["next_cursor"]:
+                return items
+            params["cursor"] = page["next_cursor"]
+
+    def invalidate(self, tasks: bool = True, goals: bool = True):
+        with self._lock:
+            if tasks:
+                self._tasks = None
+            if goals:
+                self._goals = None
+
+    def _load(self, kind: str, path: str, **params) -> list[dict]:
+        with self._lock:
+            rows = self._tasks if kind == "task" else self._goals
+            if rows is not None:
+                return list(rows.values())
+            if self._backlog[kind] is None:
+                self._backlog[kind] = []
+
+        rows = {row["id"]: row for row in self._list_all(path, **params)}
+        with self._lock:
+            if kind == "task":
+                self._tasks = rows
+            else:
+                self._goals = rows
+            backlog, self._backlog[kind] = self._backlog[kind] or [], None
+            for event, data in backlog:
+                self._apply(kind, event, data)
+            return list(rows.values())
+
+    def cached_active(self):
+        """
+        (active tasks, active goals) from the cache without calling the API, or
+        None if either isn't loaded. Loaded rows keep the API's order; rows
+        added by change events since come last.
+        """
+        with self._lock:
+            if self._tasks is None or self._goals is None:
+                return None
+            return list(self._tasks.values()), list(self._goals.values())
+
+    # --- change events ---
+
+    def apply_change(self, event: str, data: dict):
+        """
+        Apply one change event ({"id": ..., "data": {...}}) to the cached lists.
+        Lists that are not loaded ignore it; lists still loading replay it after.
+        """
+        if not event.startswith(("task.", "goal.")):
+            return
+        deltas = []
+        with self._lock:
+            for kind in ("task", "goal"):
+                if (self._tasks if kind == "task" else self._goals) is not None:
+                    deltas += self._apply(kind, event, data)
+                elif self._backlog[kind] is not None:
+                    self._backlog[kind].append((event, data))
+        if deltas and self.on_change:
+            self.on_change(deltas)
+
+    def _apply(self, kind: str, event: str, data: dict) -> list[tuple]:
+        """Apply event to the loaded kind list (lock held). Rows are replaced, never mutated."""
+        event_kind, _, action = event.partition(".")
+        row_id, row = data["id"], data["data"]
+
+        if kind == "goal":
+            if event_kind != "goal":
+                return []
+            return self._replace("goal", self._goals, row_id, None if action == "deleted" or row["accomplished"] else row)
+
+        if event_kind == "task":
+            return self._replace("task", self._tasks, row_id, None if action == "deleted" or row["completed"] else row)
+
+        # Tasks embed their goal's title, and lose the goal when it is deleted
+        goal_fields = {"goal_id": None, "goal_title": None} if action == "deleted" else {"goal_title": row["goal"]}
+        deltas = []
+        for task in [task for task in self._tasks.values() if task["goal_id"] == row_id]:
+            if any(task[key] != value for key, value in goal_fields.items()):
+                deltas += self._replace("task", self._tasks, task["id"], {**task, **goal_fields})
+        return deltas
+
+    @staticmethod
+    def _replace(kind: str, rows: dict, row_id: int, new: dict | None) -> list[tuple]:
+        # Replacing in place keeps the row where the API put it
+        old = rows.pop(row_id, None) if new is None else rows.get(row_id)
+        if new is not None:
+            rows[row_id] = new
+        return [(kind, old, new)] if old is not None or new is not None else []
+
+    def stream_changes(self):
+        """Yield (event, data) from /changes/stream; ("keepalive", None) while idle."""
+        with self._stream("/changes/stream", timeout=(5, CHANGES_READ_TIMEOUT)) as response:
+            event = None
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith("event: "):
+                    event = line[len("event: "):]
+                elif line.startswith("data: "):
+                    yield event, json.loads(line[len("data: "):])
+                elif line.startswith(":"):
+                    yield "keepalive", None
+                elif not line:
+                    event = None
+
+    # --- auth ---
+
+    def login(self, username: str, password: str) -> dict:
+        data = self._request("POST", "/auth/login", json={"username": username, "password": password}).json()
+        self.session.headers["Authorization"] = f"Bearer {data['access_token']}"
+        self.user_id = data["user_id"]
+        self.username = data["username"]
+        self.invalidate()
+        return data
+
+    # --- tasks ---
+
+    def active_tasks(self) -> list[dict]:
+        """Active tasks, each with its goal's title embedded, by priority then newest first (sorted by the API)."""
+        return self._load("task", "/tasks/", completed="false", sort="priority", order="desc")
+
+    def get_task(self, task_id: int) -> dict:
+        with self._lock:
+            task = self._tasks.get(task_id) if self._tasks is not None else None
+        return task or self._request("GET", f"/tasks/{task_id}").json()
+
+    # Writes apply their own result right away; the same event from the stream is then a no-op
+
+    def create_task(self, data: dict) -> dict:
+        task = self._request("POST", "/tasks/", json=data).json()
+        self.apply_change("task.created", {"id": task["id"], "data": task})
+        return task
+
+    def update_task(self, task_id: int, data: dict) -> dict:
+        task = self._request("PATCH", f"/tasks/{task_id}", json=data).json()
+        self.apply_change("task.updated", {"id": task_id, "data": task})
+        return task
+
+    def delete_task(self, task_id: int):
+        self._request("DELETE", f"/tasks/{task_id}")
+        self.apply_change("task.deleted", {"id": task_id, "data": None})
+
+    # --- goals ---
+
+    def active_goals(self) -> list[dict]:
+        """Active goals by priority, then longer forecasts, then newest first (sorted by the API)."""
+        return self._load("goal", "/goals/", accomplished="false", sort="priority", order="desc")
+
+    def get_goal(self, goal_id: int) -> dict:
+        with self._lock:
+            goal = self._goals.get(goal_id) if self._goals is not None else None
+        return goal or self._request("GET", f"/goals/{goal_id}").json()
+
+    def create_goal(self, data: dict) -> dict:
+        goal = self._request("POST", "/goals/", json=data).json()
+        self.apply_change("goal.created", {"id": goal["id"], "data": goal})
+        return goal
+
+    def update_goal(self, goal_id: int, data: dict) -> dict:
+        goal = self._request("PATCH", f"/goals/{goal_id}", json=data).json()
+        self.apply_change("goal.updated", {"id": goal_id, "data": goal})
+        return goal
+
+    def delete_goal(self, goal_id: int):
+        self._request("DELETE", f"/goals/{goal_id}")
+        self.apply_change("goal.deleted", {"id": goal_id, "data": None})
+
+    # --- calendar sync and analysis ---
+
+    def start_sync_job(self) -> dict:
+        return self._request("POST", "/events/sync/jobs").json()
+
+    def get_sync_job(self, job_id: str) -> dict:
+        return self._request("GET", f"/events/sync/jobs/{job_id}").json()
+
+    def stream_analysis(self, narrative: bool = False, start_date: date | None = None, end_date: date | None = None):
+        """
+        Yield (event, data) for each server-sent event from /analysis/stream.
+        narrative=True asks for a GPT analysis even when the local score is clear;
+        start_date / end_date (inclusive) analyze a range of days instead of today.
+        """
+        params = {}
+        if narrative:
+            params["narrative"] = "true"
+        if start_date:
+            params["start_date"] = start_date.isoformat()
+        if end_date:
+            params["end_date"] = end_date.isoformat()
+        # A range sends nothing while its days are summarized, so allow a longer wait
+        read_timeout = 300 if start_date or end_date else 120
+        with self._stream("/analysis/stream", params=params, timeout=(5, read_timeout)) as response:
+            event = None
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith("event: "):
+                    event = line[len("event: "):]
+                elif line.startswith("data: "):
+                    yield event, json.loads(line[len("data: "):])
+                elif not line:
+                    event = None
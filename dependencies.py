@@ -1,23 +1,106 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect
 
-from db import User, get_db
+from db import AsyncSessionLocal, User
 from services.auth import decode_access_token
 
 # This extracts the Bearer token from the Authorization header
 security = HTTPBearer()
 
+# Verified tokens are cached so most requests skip JWT decoding and the user lookup.
+# Entries never outlive the token's own expiry. AUTH_CACHE_TTL=0 disables the cache.
+AUTH_CACHE_TTL = int(os.getenv("AUTH_CACHE_TTL", 300))  # seconds
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", 1024))
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Lightweight principal for the authenticated user (not an ORM object)."""
+    id: int
+    username: str
+
+
+_cache_lock = threading.Lock()
+_token_cache: "OrderedDict[str, tuple[CurrentUser, float]]" = OrderedDict()  # token hash -> (user, expires_at)
+_tokens_by_user: dict[int, set[str]] = {}
+
+
+def _cache_get(token_hash: str) -> CurrentUser | None:
+    with _cache_lock:
+        entry = _token_cache.get(token_hash)
+        if entry is None:
+            return None
+        user, expires_at = entry
+        if time.time() >= expires_at:
+            _cache_drop(token_hash)
+            return None
+        _token_cache.move_to_end(token_hash)
+        return user
+
+
+def _cache_put(token_hash: str, user: CurrentUser, expires_at: float) -> None:
+    with _cache_lock:
+        _token_cache[token_hash] = (user, expires_at)
+        _token_cache.move_to_end(token_hash)
+        _tokens_by_user.setdefault(user.id, set()).add(token_hash)
+        while len(_token_cache) > AUTH_CACHE_SIZE:
+            _cache_drop(next(iter(_token_cache)))
+
+
+def _cache_drop(token_hash: str) -> None:
+    """Remove one entry. Call with _cache_lock held."""
+    user, _ = _token_cache.pop(token_hash)
+    hashes = _tokens_by_user.get(user.id)
+    if hashes is not None:
+        hashes.discard(token_hash)
+        if not hashes:
+            del _tokens_by_user[user.id]
+
+
+def invalidate_user(user_id: int) -> None:
+    """Forget every cached token for a user (deleted, renamed or password changed)."""
+    with _cache_lock:
+        for token_hash in list(_tokens_by_user.get(user_id, ())):
+            _cache_drop(token_hash)
 
-def get_current_user(
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target):
+    invalidate_user(target.id)
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target):
+    attrs = inspect(target).attrs
+    if attrs.hashed_password.history.has_changes() or attrs.username.history.has_changes():
+        invalidate_user(target.id)
+
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
+) -> CurrentUser:
     """
     Dependency that validates JWT token and returns the current user.
-    Use in route functions: current_user: User = Depends(get_current_user)
+    Use in route functions: current_user: CurrentUser = Depends(get_current_user)
+
+    A cache miss checks the user still exists with its own short-lived
+    async session, so long-running routes don't hold a pooled connection
+    and the check never takes a threadpool slot.
     """
     token = credentials.credentials
+    token_hash = hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    user = _cache_get(token_hash)
+    if user is not None:
+        return user
 
     # Decode and validate token
     payload = decode_access_token(token)
@@ -30,13 +113,22 @@ def get_current_user(
 
     # Get user from database
     user_id = int(payload["sub"])
-    user = db.get(User, user_id)
+    async with AsyncSessionLocal() as db:
+        db_user = await db.get(User, user_id)
+        if db_user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        user = CurrentUser(id=db_user.id, username=db_user.username)
 
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    if AUTH_CACHE_TTL > 0:
+        _cache_put(token_hash, user, min(time.time() + AUTH_CACHE_TTL, payload["exp"]))
 
     return user
+
+
+def get_current_user_id(current_user: CurrentUser = Depends(get_current_user)) -> int:
+    """Dependency for routes that only need the authenticated user's ID."""
+    return current_user.id
@@ -1,11 +1,23 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
-from routers import auth, tasks, goals, events, analysis
+from db import async_engine
+from routers import auth, tasks, goals, events, analysis, changes
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # The async driver's connections hold threads (aiosqlite) or sockets open until disposed
+    await async_engine.dispose()
+
 
-app = FastAPI(title="Busyness Buster API")
+app = FastAPI(title="Busyness Buster API", lifespan=lifespan)
 
 app.include_router(auth.router)
 app.include_router(tasks.router)
 app.include_router(goals.router)
 app.include_router(events.router)
-app.include_router(analysis.router)
\ No newline at end of file
+app.include_router(analysis.router)
+app.include_router(changes.router)
@@ -1,16 +1,181 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from datetime import date, timedelta
 
-from db import User, get_db
-from dependencies import get_current_user
-from services.analysis import gpt_analyze
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import get_async_db
+from dependencies import get_current_user_id
+from schemas.analysis import BusynessScore
+from services.analysis import (
+    MAX_ANALYSIS_DAYS,
+    analyze_range,
+    gpt_analyze,
+    load_analysis_inputs_async,
+    range_prompt,
+    stream_analysis,
+    summarize_days,
+    uses_gpt,
+)
+from services.busyness import (
+    DayScore,
+    load_day_score,
+    load_day_scores_async,
+    range_score,
+    summarize,
+    today,
+    verdict_for,
+)
+from services.changes import format_sse
+from services.prompt import Prompt, build_prompt
 
 router = APIRouter(prefix="/analysis", tags=["analysis"])
 
 
+def _prompt_size(prompt: Prompt) -> dict:
+    return {"tokens": prompt.tokens, "items": prompt.items, "omitted": prompt.omitted}
+
+
+def _score_summary(score: DayScore) -> dict:
+    return {"score": score.score, "verdict": score.verdict}
+
+
+def _range_summary(scores: list[DayScore], summaries: list[str], narrative: bool) -> dict:
+    # Dates as ISO strings so the stream's done event can carry this too
+    score = range_score(scores)
+    return {
+        "start_date": scores[0].day.isoformat(),
+        "end_date": scores[-1].day.isoformat(),
+        "score": score,
+        "verdict": verdict_for(score),
+        "days": [
+            {
+                "day": day.day.isoformat(),
+                **_score_summary(day),
+                "source": "gpt" if uses_gpt(day, narrative) else "local",
+                "summary": summary,
+            }
+            for day, summary in zip(scores, summaries)
+        ],
+    }
+
+
+def _analysis_days(start_date: date | None, end_date: date | None) -> list[date | None]:
+    """
+    The days an analysis covers: [None] (today) without a range, else
+    start_date through end_date inclusive. end_date defaults to today and
+    start_date to end_date.
+    """
+    if start_date is None and end_date is None:
+        return [None]
+    end_date = end_date or today()
+    start_date = start_date or end_date
+    if end_date < start_date:
+        raise HTTPException(status_code=422, detail="end_date must not be before start_date")
+    count = (end_date - start_date).days + 1
+    if count > MAX_ANALYSIS_DAYS:
+        raise HTTPException(status_code=422, detail=f"An analysis covers at most {MAX_ANALYSIS_DAYS} days")
+    return [start_date + timedelta(days=i) for i in range(count)]
+
+
+@router.get("/score", response_model=BusynessScore)
+async def busyness_score(
+    day: date | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id),
+):
+    """
+    Local busyness score for a day (today by default): the share of
+    scheduled time in events that match an open task or goal, with each
+    event's best match. No GPT call.
+    """
+    return await load_day_score(db, user_id, day)
+
+
 @router.get("/")
-def analyze(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def analyze(
+    start_date: date | None = None,
+    end_date: date | None = None,
+    narrative: bool = False,
+    user_id: int = Depends(get_current_user_id),
 ):
-    return {"analysis": gpt_analyze(db, current_user.id)}
\ No newline at end of file
+    """
+    Analysis of today's plan, or of start_date through end_date (inclusive;
+    end_date defaults to today, start_date to end_date).
+
+    For one day: when the local score is a clear call the verdict is
+    written locally ("source": "local") without calling GPT; ambiguous
+    days, or narrative=true, get a GPT analysis ("source": "gpt") along
+    with the size of its prompt: estimated tokens, items included and items
+    left out to fit PROMPT_TOKEN_BUDGET.
+
+    For several days (at most MAX_ANALYSIS_DAYS): each day is summarized,
+    locally or by GPT by the same rule, and one more GPT call combines the
+    summaries into a verdict for the range. The response has the range's
+    score and verdict, each day's score, source and summary under "days",
+    and the size of the combining prompt. Day summaries and the combined
+    verdict are cached by their inputs, so repeating a review after one
+    day changed costs about two GPT calls.
+    """
+    days = _analysis_days(start_date, end_date)
+    scores = await load_day_scores_async(user_id, days)
+    if len(scores) == 1:
+        score = scores[0]
+        if not uses_gpt(score, narrative):
+            return {"analysis": summarize(score), "source": "local", **_score_summary(score)}
+
+        analysis, prompt = await gpt_analyze(user_id, days[0])
+        return {"analysis": analysis, "source": "gpt", **_score_summary(score), "prompt": _prompt_size(prompt)}
+
+    analysis, summaries, prompt = await analyze_range(user_id, scores, narrative)
+    return {"analysis": analysis, "source": "gpt", **_range_summary(scores, summaries, narrative),
+            "prompt": _prompt_size(prompt)}
+
+
+@router.get("/stream")
+async def analyze_stream(
+    start_date: date | None = None,
+    end_date: date | None = None,
+    narrative: bool = False,
+    user_id: int = Depends(get_current_user_id),
+):
+    """
+    Stream the analysis as server-sent events while it is generated. Takes
+    the same parameters as GET /analysis/.
+    Each event carries {"text": "..."}; the stream ends with a "done" event
+    carrying everything GET /analysis/ returns except the analysis text, or
+    an "error" event if generation fails part way. A local verdict arrives
+    as a single text event. For a range, the day summaries are made first
+    (nothing is sent meanwhile) and then the combined verdict is streamed.
+    """
+    # Load inputs up front so no DB session is held open while streaming
+    days = _analysis_days(start_date, end_date)
+    scores = await load_day_scores_async(user_id, days)
+    day_prompt = None
+    if len(scores) == 1 and uses_gpt(scores[0], narrative):
+        day_prompt = build_prompt(*await load_analysis_inputs_async(user_id, days[0]), day=days[0])
+
+    async def events():
+        try:
+            if len(scores) == 1 and day_prompt is None:
+                yield format_sse({"text": summarize(scores[0])})
+                yield format_sse({"source": "local", **_score_summary(scores[0])}, event="done")
+                return
+            if len(scores) == 1:
+                prompt, done = day_prompt, _score_summary(scores[0])
+            else:
+                # Day summaries are made here, not up front: each opens its own short session
+                summaries = await summarize_days(user_id, scores, narrative)
+                prompt, done = range_prompt(scores, summaries), _range_summary(scores, summaries, narrative)
+
+            async for text in stream_analysis(user_id, prompt):
+                yield format_sse({"text": text})
+            yield format_sse({"source": "gpt", **done, "prompt": _prompt_size(prompt)}, event="done")
+        except Exception as e:
+            yield format_sse({"detail": f"Analysis failed: {str(e)}"}, event="error")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,32 +1,67 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import math
 
-from db import User, get_db
+from fastapi import APIRouter, HTTPException, Request, status
+from sqlalchemy import select, update
+
+from db import AsyncSessionLocal, User
 from schemas.auth import LoginRequest, LoginResponse
-from services.auth import verify_password, create_access_token
+from services.auth import create_access_token, hash_password_async, needs_rehash, verify_password_async
+from services.rate_limit import check_login_attempt, login_succeeded
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+async def _find_user(username: str) -> tuple | None:
+    """(id, username, hashed_password) for the username, or None."""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(User.id, User.username, User.hashed_password).where(User.username == username))
+        return result.first()
+
+
+async def _store_rehash(user_id: int, old_hash: str, new_hash: str) -> None:
+    # A Core UPDATE skips the ORM hook that drops the user's cached tokens on a
+    # password change: the password is the same, so their sessions stay valid.
+    # Matching the old hash leaves a password changed in the meantime alone.
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(User).where(User.id == user_id, User.hashed_password == old_hash).values(hashed_password=new_hash))
+        await db.commit()
+
+
 @router.post("/login", response_model=LoginResponse)
-def login(payload: LoginRequest, db: Session = Depends(get_db)):
-    """Authenticate user and return JWT token."""
-    # Find user by username
-    user = db.query(User).filter(User.username == payload.username).first()
+async def login(payload: LoginRequest, request: Request):
+    """
+    Authenticate user and return JWT token.
 
-    if not user:
+    Password checks run on their own small executor, so a burst of logins
+    waits on each other instead of tying up the threads every other route
+    needs. Too many attempts for a username/IP get 429 with Retry-After.
+    """
+    client_ip = request.client.host if request.client else "unknown"
+    retry_after = check_login_attempt(payload.username, client_ip)
+    if retry_after:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid username or password",
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts. Try again later.",
+            headers={"Retry-After": str(math.ceil(retry_after))},
         )
 
-    # Verify password
-    if not verify_password(payload.password, user.hashed_password):
+    # Find user by username
+    user = await _find_user(payload.username)
+
+    # Verify password (an unknown user is checked against a dummy hash, taking as long)
+    if not await verify_password_async(payload.password, user.hashed_password if user else None):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password",
         )
 
+    login_succeeded(payload.username, client_ip)
+
+    # Upgrade hashes made with an old BCRYPT_ROUNDS now that we have the password
+    if needs_rehash(user.hashed_password):
+        new_hash = await hash_password_async(payload.password)
+        await _store_rehash(user.id, user.hashed_password, new_hash)
+
     # Create and return token
     access_token = create_access_token(user.id, user.username)
 
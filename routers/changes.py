@@ -0,0 +1,50 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+
+from dependencies import get_current_user_id
+from services.changes import KEEPALIVE_INTERVAL, format_sse, subscribe, unsubscribe
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+
+@router.get("/stream")
+async def change_stream(
+    request: Request,
+    user_id: int = Depends(get_current_user_id),
+):
+    """
+    Server-sent events for every change to the user's data, as it is committed.
+
+    The stream opens with a "ready" event. Then each event is named after the
+    change ("task.created", "task.updated", "task.deleted", the same for
+    "goal", and "sync.completed") and carries {"id": ..., "data": {...}} with
+    the row as the single-item routes return it (data is null for deletes).
+    Deleting a goal also clears goal_id on its tasks without separate task
+    events. A "resync" event means changes were dropped and the client should
+    reload its lists. Idle streams get a keepalive comment every few seconds.
+    """
+    subscription = subscribe(user_id)
+
+    async def events():
+        try:
+            yield format_sse({}, event="ready")
+            while True:
+                try:
+                    change = await asyncio.wait_for(subscription.queue.get(), KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keepalive\n\n"
+                    continue
+                event = change.pop("type")
+                yield format_sse(change, event=event)
+        finally:
+            unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
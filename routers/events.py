@@ -1,86 +1,130 @@
-from fastapi import APIRouter, Depends, status, HTTPException
-from sqlalchemy.orm import Session
-from dateutil import parser
+from datetime import date, datetime, time, timedelta
+from typing import Literal
 
-from db import Event, User, get_db
-from dependencies import get_current_user
-from schemas.events import EventCreate, EventRead
-from services.google_calendar import fetch_events
+from fastapi import APIRouter, Depends, Query, Request, Response, status, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import Event, get_async_db
+from dependencies import CurrentUser, get_current_user
+from schemas.events import EventCreate, EventPage, EventRead, EventSyncResult, SyncJobRead
+from services.conditional import conditional_get, last_modified, make_etag
+from services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursor, paginate_async
+from services.sync_jobs import get_sync_job, run_sync_job, submit_sync_job
 
 router = APIRouter(prefix="/events", tags=["events"])
 
 
-@router.post("/sync", response_model=list[EventRead])
-def sync_events(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+@router.post("/sync", response_model=EventSyncResult)
+async def sync_events(
+    start_date: date | None = None,
+    end_date: date | None = None,
+    calendar_id: list[str] = Query(default=["primary"]),
+    full: bool = False,
+    current_user: CurrentUser = Depends(get_current_user),
 ):
+    """
+    Sync Google Calendar into the events table.
+
+    Only changes since the last sync are fetched unless full=true, a date
+    range is given, or Google asks for a full resync. The full-sync window
+    defaults to the previous day through the next 7 days (end_date inclusive).
+    Repeat calendar_id to sync several calendars.
+
+    Runs as a sync job and waits for it, so it never overlaps another sync
+    for the same user; if one is already running it finishes first.
+    """
+    if start_date and end_date and end_date < start_date:
+        raise HTTPException(status_code=422, detail="end_date must not be before start_date")
+
+    # An explicit range only makes sense as a full fetch of that range
+    full = full or start_date is not None or end_date is not None
+
+    job = await run_sync_job(current_user.id, calendar_id, start_date, end_date, full=full)
+    if job.status == "failed":
+        raise HTTPException(status_code=job.error_status, detail=job.error)
+    return job.counts
+
+
+@router.post("/sync/jobs", response_model=SyncJobRead, status_code=status.HTTP_202_ACCEPTED)
+async def start_sync_job(
+    start_date: date | None = None,
+    end_date: date | None = None,
+    calendar_id: list[str] = Query(default=["primary"]),
+    full: bool = False,
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Start a sync in the background and return the job right away.
+    Takes the same parameters as POST /events/sync. If a sync is already
+    queued or running for this user, that job is returned instead.
+    """
+    if start_date and end_date and end_date < start_date:
+        raise HTTPException(status_code=422, detail="end_date must not be before start_date")
+
+    full = full or start_date is not None or end_date is not None
+    job, _ = submit_sync_job(current_user.id, calendar_id, start_date, end_date, full=full)
+    return job
+
+
+@router.get("/sync/jobs/{job_id}", response_model=SyncJobRead)
+async def read_sync_job(
+    job_id: str,
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    job = get_sync_job(job_id, current_user.id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Sync job not found")
+
+    return job
+
+
+@router.get("/", response_model=EventPage)
+async def list_events(
+    start_date: date | None = None,
+    end_date: date | None = None,
+    sort: Literal["start_time"] = "start_time",
+    order: Literal["asc", "desc"] = "asc",
+    cursor: str | None = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    List events starting between start_date and end_date (both inclusive),
+    one page at a time. Pass the returned next_cursor as cursor to get the
+    next page.
+    """
+    if start_date and end_date and end_date < start_date:
+        raise HTTPException(status_code=422, detail="end_date must not be before start_date")
+
+    query = select(Event).where(Event.user_id == current_user.id)
+    if start_date:
+        query = query.where(Event.start_time >= datetime.combine(start_date, time.min))
+    if end_date:
+        query = query.where(Event.start_time < datetime.combine(end_date + timedelta(days=1), time.min))
+
     try:
-        google_events = fetch_events()
-    except Exception as e:
-        error_msg = str(e).lower()
-
-        # Check if it's a stale token issue
-        if any(keyword in error_msg for keyword in [
-            "invalid_grant", "token_expired", "stale", "invalid_token", "unauthorized", "authentication"
-        ]):
-            raise HTTPException(
-                status_code=401,
-                detail="Google Calendar authentication expired. Please delete 'token.json' and try again to re-authenticate."
-            )
-        else:
-            raise HTTPException(status_code=500, detail=f"Failed to fetch events from Google Calendar: {str(e)}")
-
-    stored_events = []
-    try:
-        for g_event in google_events:
-            google_id = g_event["id"]
-            summary = g_event.get("summary", "No Title")
-
-            # Parse RFC3339 strings safely
-            start_raw = g_event["start"].get("dateTime") or g_event["start"].get("date")
-            end_raw = g_event["end"].get("dateTime") or g_event["end"].get("date")
-
-            start_time = parser.parse(start_raw) if start_raw else None
-            end_time = parser.parse(end_raw) if end_raw else None
-
-            # upsert: check if event already exists for this user
-            event = db.query(Event).filter(
-                Event.google_id == google_id,
-                Event.user_id == current_user.id
-            ).first()
-
-            if event:
-                event.summary = summary
-                event.start_time = start_time
-                event.end_time = end_time
-            else:
-                event = Event(
-                    google_id=google_id,
-                    summary=summary,
-                    start_time=start_time,
-                    end_time=end_time,
-                    user_id=current_user.id,
-                )
-                db.add(event)
-            stored_events.append(event)
-
-        db.commit()
-        return stored_events
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=500, detail=f"Failed to sync events to database: {str(e)}")
+        items, next_cursor = await paginate_async(db, query, sort, [getattr(Event, sort)], Event.id, order == "desc", cursor, limit)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"items": items, "next_cursor": next_cursor}
 
 
 @router.get("/{event_id}", response_model=EventRead)
-def read_event(
+async def read_event(
     event_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    event = db.query(Event).filter(Event.id == event_id, Event.user_id == current_user.id).first()
+    """Sends ETag and Last-Modified; If-None-Match / If-Modified-Since get a 304 when nothing changed."""
+    event = await db.scalar(select(Event).where(Event.id == event_id, Event.user_id == current_user.id))
 
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    return event
+    return conditional_get(request, response, event, make_etag(event), last_modified(event))
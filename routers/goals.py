@@ -1,73 +1,189 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status, HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from db import Goal, User, get_db
-from dependencies import get_current_user
-from schemas.goals import GoalCreate, GoalRead, GoalUpdate
+from db import Goal, Task, get_async_db, get_db
+from dependencies import CurrentUser, get_current_user
+from schemas.batch import BatchRequest, BatchResult
+from schemas.goals import ForecastEnum, GoalCreate, GoalPage, GoalRead, GoalUpdate
+from services.batch import apply_batch
+from services.changes import change, publish, publish_batch
+from services.conditional import check_if_match, conditional_get, last_modified, make_etag, validator_headers
+from services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursor, paginate_async
 
 router = APIRouter(prefix="/goals", tags=["goals"])
 
+# Sort keys for GET /goals/: the named column first, the other to break ties
+GOAL_SORTS = {
+    "priority": [Goal.priority, Goal.forecast_rank],
+    "forecast": [Goal.forecast_rank, Goal.priority],
+}
+
+
+def _detach_tasks(db: Session, goal_ids: list[int]):
+    # Bulk deletes skip the ORM, which would otherwise null out Task.goal_id itself
+    db.execute(update(Task).where(Task.goal_id.in_(goal_ids)).values(goal_id=None))
+
+
+async def _get_goal(db: AsyncSession, goal_id: int, user_id: int) -> Goal | None:
+    # populate_existing re-reads a row the session already holds, e.g. after an UPDATE statement
+    return await db.scalar(
+        select(Goal).where(Goal.id == goal_id, Goal.user_id == user_id).execution_options(populate_existing=True)
+    )
+
 
 @router.post("/", response_model=GoalRead, status_code=status.HTTP_201_CREATED)
-def create_goal(
+async def create_goal(
     payload: GoalCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     goal = Goal(**payload.model_dump(), user_id=current_user.id)
     db.add(goal)
-    db.commit()
-    db.refresh(goal)
+    await db.commit()
+    await db.refresh(goal)
+    publish(current_user.id, change("goal", "created", goal.id, goal, GoalRead))
     return goal
 
 
+@router.post("/batch", response_model=BatchResult)
+def batch_goals(
+    payload: BatchRequest,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Create, update and delete many goals in one request and one transaction.
+    Each operation is {"op": "create" | "update" | "delete", "id": ..., "data": {...}};
+    data is validated like the single-item routes. With atomic=false the
+    valid operations are applied even if others fail.
+
+    Stays a sync route on the threadpool: validating and flushing a big
+    batch is CPU-bound work that would stall the event loop.
+    """
+    result = apply_batch(
+        db, Goal, GoalCreate, GoalUpdate, current_user.id, payload.operations,
+        atomic=payload.atomic, before_delete=_detach_tasks,
+    )
+
+    if result["committed"]:
+        db.commit()
+    else:
+        db.rollback()
+
+    publish_batch(db, current_user.id, "goal", Goal, GoalRead, result)
+    return result
+
+
+@router.get("/", response_model=GoalPage)
+async def list_goals(
+    accomplished: bool | None = None,
+    priority_min: int | None = Query(default=None, ge=0, le=10),
+    priority_max: int | None = Query(default=None, ge=0, le=10),
+    forecast: ForecastEnum | None = None,
+    sort: Literal["priority", "forecast"] = "priority",
+    order: Literal["asc", "desc"] = "desc",
+    cursor: str | None = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    List goals one page at a time. Pass the returned next_cursor as cursor
+    to get the next page. Forecast sorts by horizon (Short < Medium < Long).
+    """
+    if priority_min is not None and priority_max is not None and priority_max < priority_min:
+        raise HTTPException(status_code=422, detail="priority_max must not be below priority_min")
+
+    query = select(Goal).where(Goal.user_id == current_user.id)
+    if accomplished is not None:
+        query = query.where(Goal.accomplished == accomplished)
+    if priority_min is not None:
+        query = query.where(Goal.priority >= priority_min)
+    if priority_max is not None:
+        query = query.where(Goal.priority <= priority_max)
+    if forecast is not None:
+        query = query.where(Goal.forecast == forecast.value)
+
+    try:
+        items, next_cursor = await paginate_async(db, query, sort, GOAL_SORTS[sort], Goal.id, order == "desc", cursor, limit)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"items": items, "next_cursor": next_cursor}
+
+
 @router.get("/{goal_id}", response_model=GoalRead)
-def read_goal(
+async def read_goal(
     goal_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    goal = db.query(Goal).filter(Goal.id == goal_id, Goal.user_id == current_user.id).first()
+    """Sends ETag and Last-Modified; If-None-Match / If-Modified-Since get a 304 when nothing changed."""
+    goal = await _get_goal(db, goal_id, current_user.id)
 
     if not goal:
         raise HTTPException(status_code=404, detail="Goal not found")
 
-    return goal
+    return conditional_get(request, response, goal, make_etag(goal), last_modified(goal))
 
 
 @router.patch("/{goal_id}", response_model=GoalRead)
-def update_goal(
+async def update_goal(
     goal_id: int,
     payload: GoalUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    goal = db.query(Goal).filter(Goal.id == goal_id, Goal.user_id == current_user.id).first()
+    """With If-Match, only applies if the goal's ETag still matches (412 otherwise)."""
+    goal = await _get_goal(db, goal_id, current_user.id)
     if not goal:
         raise HTTPException(status_code=404, detail="Goal not found")
 
+    conditional = check_if_match(request, make_etag(goal))
     updates = payload.model_dump(exclude_unset=True)
-
-    for key, value in updates.items():
-        setattr(goal, key, value)
-
-    db.commit()
-    db.refresh(goal)
+    if "forecast" in updates and updates["forecast"] is not None:
+        updates["forecast"] = updates["forecast"].value
+
+    if updates:
+        statement = update(Goal).where(Goal.id == goal.id)
+        if conditional:
+            # Someone may have written between the check and here
+            statement = statement.where(Goal.version == goal.version)
+        result = await db.execute(statement.values(**updates).execution_options(synchronize_session=False))
+        if not result.rowcount:
+            await db.rollback()
+            raise HTTPException(status_code=412, detail="Precondition failed: the resource has changed")
+
+    await db.commit()
+    goal = await _get_goal(db, goal_id, current_user.id)
+    response.headers.update(validator_headers(make_etag(goal), last_modified(goal)))
+    publish(current_user.id, change("goal", "updated", goal.id, goal, GoalRead))
 
     return goal
 
 
 @router.delete("/{goal_id}", status_code=204)
-def delete_goal(
+async def delete_goal(
     goal_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    goal = db.query(Goal).filter(Goal.id == goal_id, Goal.user_id == current_user.id).first()
+    goal = await _get_goal(db, goal_id, current_user.id)
     if not goal:
         raise HTTPException(status_code=404, detail="Goal not found")
 
-    db.delete(goal)
-    db.commit()
+    # One UPDATE instead of loading goal.tasks to null them out one by one
+    await db.run_sync(_detach_tasks, [goal_id])
+    await db.delete(goal)
+    await db.commit()
+    publish(current_user.id, change("goal", "deleted", goal_id))
 
     return None
\ No newline at end of file
@@ -1,73 +1,205 @@
-from fastapi import APIRouter, Depends, status, HTTPException
-from sqlalchemy.orm import Session
-
-from db import Task, User, get_db
-from dependencies import get_current_user
-from schemas.tasks import TaskCreate, TaskRead, TaskUpdate
+from datetime import date, datetime, time, timedelta
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status, HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+
+from db import Goal, Task, get_async_db, get_db
+from dependencies import CurrentUser, get_current_user
+from schemas.batch import BatchRequest, BatchResult
+from schemas.tasks import TaskCreate, TaskPage, TaskRead, TaskUpdate
+from services.batch import apply_batch
+from services.changes import change, publish, publish_batch
+from services.conditional import check_if_match, conditional_get, last_modified, make_etag, validator_headers
+from services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursor, paginate_async
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
+def _validators(task: Task) -> tuple:
+    # The representation embeds the goal's title, so the goal's version is part of the ETag
+    return make_etag(task, task.goal), last_modified(task, task.goal)
+
+
+async def _get_task(db: AsyncSession, task_id: int, user_id: int) -> Task | None:
+    # The goal is loaded up front: TaskRead embeds its title, and async sessions can't lazy-load.
+    # populate_existing re-reads a row the session already holds, e.g. after an UPDATE statement.
+    result = await db.execute(
+        select(Task).options(joinedload(Task.goal)).where(Task.id == task_id, Task.user_id == user_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
+
+async def _check_goal(db: AsyncSession, goal_id: int | None, user_id: int) -> None:
+    # TaskRead shows the goal's title, so a task may only link one of the user's own goals
+    if goal_id is not None and await db.scalar(
+        select(Goal.id).where(Goal.id == goal_id, Goal.user_id == user_id)
+    ) is None:
+        raise HTTPException(status_code=422, detail="goal_id: Goal not found")
+
+
 @router.post("/", response_model=TaskRead, status_code=status.HTTP_201_CREATED)
-def create_task(
+async def create_task(
     payload: TaskCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
+    await _check_goal(db, payload.goal_id, current_user.id)
     task = Task(**payload.model_dump(), user_id=current_user.id)
     db.add(task)
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    task = await _get_task(db, task.id, current_user.id)
+    publish(current_user.id, change("task", "created", task.id, task, TaskRead))
     return task
 
 
+@router.post("/batch", response_model=BatchResult)
+def batch_tasks(
+    payload: BatchRequest,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Create, update and delete many tasks in one request and one transaction.
+    Each operation is {"op": "create" | "update" | "delete", "id": ..., "data": {...}};
+    data is validated like the single-item routes. With atomic=false the
+    valid operations are applied even if others fail.
+
+    Stays a sync route on the threadpool: validating and flushing a big
+    batch is CPU-bound work that would stall the event loop.
+    """
+    result = apply_batch(
+        db, Task, TaskCreate, TaskUpdate, current_user.id, payload.operations,
+        atomic=payload.atomic, references={"goal_id": Goal},
+    )
+
+    if result["committed"]:
+        db.commit()
+    else:
+        db.rollback()
+
+    publish_batch(db, current_user.id, "task", Task, TaskRead, result, options=[joinedload(Task.goal)])
+    return result
+
+
+@router.get("/", response_model=TaskPage)
+async def list_tasks(
+    completed: bool | None = None,
+    priority_min: int | None = Query(default=None, ge=0, le=10),
+    priority_max: int | None = Query(default=None, ge=0, le=10),
+    goal_id: int | None = None,
+    due_from: date | None = None,
+    due_to: date | None = None,
+    sort: Literal["priority", "due_date"] = "priority",
+    order: Literal["asc", "desc"] | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    List tasks one page at a time. Pass the returned next_cursor as cursor
+    to get the next page. due_from/due_to are inclusive dates. order defaults
+    to desc for priority and asc for due_date.
+    """
+    if priority_min is not None and priority_max is not None and priority_max < priority_min:
+        raise HTTPException(status_code=422, detail="priority_max must not be below priority_min")
+    if due_from and due_to and due_to < due_from:
+        raise HTTPException(status_code=422, detail="due_to must not be before due_from")
+
+    # Goal titles come back in the same query (a LEFT JOIN), not one lookup per task
+    query = select(Task).options(joinedload(Task.goal)).where(Task.user_id == current_user.id)
+    if completed is not None:
+        query = query.where(Task.completed == completed)
+    if priority_min is not None:
+        query = query.where(Task.priority >= priority_min)
+    if priority_max is not None:
+        query = query.where(Task.priority <= priority_max)
+    if goal_id is not None:
+        query = query.where(Task.goal_id == goal_id)
+    if due_from:
+        query = query.where(Task.due_date >= datetime.combine(due_from, time.min))
+    if due_to:
+        query = query.where(Task.due_date < datetime.combine(due_to + timedelta(days=1), time.min))
+
+    descending = (order or ("desc" if sort == "priority" else "asc")) == "desc"
+    try:
+        items, next_cursor = await paginate_async(db, query, sort, [getattr(Task, sort)], Task.id, descending, cursor, limit)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"items": items, "next_cursor": next_cursor}
+
+
 @router.get("/{task_id}", response_model=TaskRead)
-def read_task(
+async def read_task(
     task_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    task = db.query(Task).filter(Task.id == task_id, Task.user_id == current_user.id).first()
+    """Sends ETag and Last-Modified; If-None-Match / If-Modified-Since get a 304 when nothing changed."""
+    task = await _get_task(db, task_id, current_user.id)
 
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    return task
+    return conditional_get(request, response, task, *_validators(task))
 
 
 @router.patch("/{task_id}", response_model=TaskRead)
-def update_task(
+async def update_task(
     task_id: int,
     payload: TaskUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    task = db.query(Task).filter(Task.id == task_id, Task.user_id == current_user.id).first()
+    """With If-Match, only applies if the task's ETag still matches (412 otherwise)."""
+    task = await _get_task(db, task_id, current_user.id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
+    conditional = check_if_match(request, _validators(task)[0])
     updates = payload.model_dump(exclude_unset=True)
-
-    for key, value in updates.items():
-        setattr(task, key, value)
-
-    db.commit()
-    db.refresh(task)
+    if "goal_id" in updates:
+        await _check_goal(db, updates["goal_id"], current_user.id)
+
+    if updates:
+        statement = update(Task).where(Task.id == task.id)
+        if conditional:
+            # Someone may have written between the check and here
+            statement = statement.where(Task.version == task.version)
+        result = await db.execute(statement.values(**updates).execution_options(synchronize_session=False))
+        if not result.rowcount:
+            await db.rollback()
+            raise HTTPException(status_code=412, detail="Precondition failed: the resource has changed")
+
+    await db.commit()
+    task = await _get_task(db, task_id, current_user.id)
+    response.headers.update(validator_headers(*_validators(task)))
+    publish(current_user.id, change("task", "updated", task.id, task, TaskRead))
 
     return task
 
 
 @router.delete("/{task_id}", status_code=204)
-def delete_task(
+async def delete_task(
     task_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    task = db.query(Task).filter(Task.id == task_id, Task.user_id == current_user.id).first()
+    task = await db.scalar(select(Task).where(Task.id == task_id, Task.user_id == current_user.id))
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    db.delete(task)
-    db.commit()
+    await db.delete(task)
+    await db.commit()
+    publish(current_user.id, change("task", "deleted", task_id))
 
     return
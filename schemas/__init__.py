@@ -1,3 +1,5 @@
-from .tasks import TaskCreate, TaskRead, TaskUpdate
-from .goals import GoalCreate, GoalRead, GoalUpdate
-from .events import EventCreate, EventRead
\ No newline at end of file
+from .tasks import TaskCreate, TaskPage, TaskRead, TaskUpdate
+from .goals import GoalCreate, GoalPage, GoalRead, GoalUpdate
+from .events import EventCreate, EventPage, EventRead, EventSyncResult, SyncJobRead
+from .batch import BatchItemResult, BatchOperation, BatchRequest, BatchResult
+from .analysis import BusynessBlock, BusynessScore
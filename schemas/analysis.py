@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import date, datetime
+
+
+class BusynessBlock(BaseModel):
+    id: int
+    summary: str
+    start_time: Optional[datetime]
+    end_time: Optional[datetime]
+    minutes: float
+    linked: bool
+    similarity: float
+    match_kind: Optional[str]  # "task" or "goal" when linked
+    match_id: Optional[int]
+    match_title: Optional[str]
+
+class BusynessScore(BaseModel):
+    day: date
+    score: Optional[float]  # linked share of scheduled minutes; None when nothing is scheduled
+    verdict: str  # "business", "busyness", "ambiguous" or "empty"
+    ambiguous: bool
+    scheduled_minutes: float
+    linked_minutes: float
+    blocks: list[BusynessBlock]
+
+    class Config:
+        from_attributes = True
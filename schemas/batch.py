@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
+
+MAX_BATCH_OPERATIONS = 10_000
+
+class BatchOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    id: Optional[int] = None  # required for update and delete
+    data: Optional[dict] = None  # create/update body, validated per item against the resource's schema
+
+class BatchRequest(BaseModel):
+    operations: list[BatchOperation] = Field(max_length=MAX_BATCH_OPERATIONS)
+    atomic: bool = True  # all-or-nothing; false applies the valid items and reports the rest
+
+class BatchItemResult(BaseModel):
+    index: int
+    op: str
+    status: int  # HTTP-style: 201 created, 200 updated, 204 deleted, 404/409/422 failed, 424 not applied
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class BatchResult(BaseModel):
+    committed: bool
+    succeeded: int
+    failed: int
+    items: list[BatchItemResult]
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, conint
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime
 
 class EventCreate(BaseModel):
     google_id: str
@@ -11,9 +11,39 @@ class EventCreate(BaseModel):
 class EventRead(BaseModel):
     id: int
     google_id:str
+    calendar_id: str
     summary:str
     start_time: Optional[datetime]
     end_time: Optional[datetime]
 
     class Config:
         from_attributes = True
+
+class EventPage(BaseModel):
+    items: list[EventRead]
+    next_cursor: Optional[str]
+
+class EventSyncResult(BaseModel):
+    inserted: int
+    updated: int
+    unchanged: int
+    deleted: int = 0
+    full_sync: bool = True
+
+class SyncJobRead(BaseModel):
+    id: str
+    status: str
+    calendar_ids: list[str]
+    start_date: Optional[date]
+    end_date: Optional[date]
+    full: bool
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    pages: int
+    counts: Optional[EventSyncResult]
+    error: Optional[str]
+    error_status: Optional[int]
+
+    class Config:
+        from_attributes = True
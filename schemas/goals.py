@@ -26,6 +26,10 @@ class GoalRead(BaseModel):
     class Config:
         from_attributes = True
 
+class GoalPage(BaseModel):
+    items: list[GoalRead]
+    next_cursor: Optional[str]
+
 class GoalUpdate(BaseModel):
     goal: Optional[str] = None
     priority: Optional[int] = None
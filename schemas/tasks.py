@@ -18,6 +18,7 @@ class TaskRead(BaseModel):
     priority: int 
     completed: bool
     goal_id: Optional[int]
+    goal_title: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -28,3 +29,7 @@ class TaskUpdate(BaseModel):
     priority: Optional[int] = None
     completed: Optional[bool] = None
     goal_id: Optional[int] = None
+
+class TaskPage(BaseModel):
+    items: list[TaskRead]
+    next_cursor: Optional[str]  # pass as ?cursor= for the next page; None on the last page
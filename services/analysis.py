@@ -1,59 +1,276 @@
-from datetime import datetime, timedelta
+import asyncio
+import os
+from datetime import date, datetime
 
-import pytz
-from openai import OpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, Timeout
 
-from db import Task, Goal, Event
-from schemas import TaskRead, GoalRead, EventRead
+try:
+    import httpx
+except ImportError:  # newer openai releases ship httpx as httpx2
+    import httpx2 as httpx
 
-client = OpenAI()
+from typing import NamedTuple
 
+from sqlalchemy import Boolean, DateTime, Integer, String, and_, cast, func, literal_column, null, select, type_coerce, union_all
 
-def gpt_analyze(db, user_id: int):
-    """Analyze user's goals, tasks, and events using GPT."""
-    goals = db.query(Goal).filter(
-        Goal.accomplished == False,
-        Goal.user_id == user_id
-    ).all()
+from db import AsyncSessionLocal, Task, Goal, Event
+from services.analysis_cache import AnalysisCache, analysis_cache_key
+from services.busyness import DayScore, day_window, summarize
+from services.prompt import DAY_SUMMARY_INSTRUCTIONS, Prompt, build_prompt, build_range_prompt
 
-    tasks = db.query(Task).filter(
+MODEL = "gpt-4o-mini"
+MAX_TOKENS = 1500
+DAY_SUMMARY_MAX_TOKENS = 300  # per-day summaries in a range analysis
+
+# Bump whenever the prompt text changes so cached analyses are not reused
+PROMPT_VERSION = 3
+
+# Upper bound on OpenAI calls in flight; extra analyses wait their turn
+ANALYSIS_MAX_CONCURRENCY = int(os.getenv("ANALYSIS_MAX_CONCURRENCY", 16))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", 60))  # seconds per request
+MAX_ANALYSIS_DAYS = int(os.getenv("MAX_ANALYSIS_DAYS", 31))  # longest date range one analysis covers
+# Days of one range analysis summarized at once, so a long range doesn't take every OpenAI slot
+ANALYSIS_DAY_CONCURRENCY = int(os.getenv("ANALYSIS_DAY_CONCURRENCY", 4))
+
+# One shared client so connections are pooled and kept alive across requests
+async_client = AsyncOpenAI(
+    timeout=Timeout(OPENAI_TIMEOUT, connect=5.0),
+    max_retries=2,
+    http_client=DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=ANALYSIS_MAX_CONCURRENCY,
+            max_keepalive_connections=ANALYSIS_MAX_CONCURRENCY,
+        ),
+    ),
+)
+_llm_slots = asyncio.Semaphore(ANALYSIS_MAX_CONCURRENCY)
+
+analysis_cache = AnalysisCache()
+
+
+class GoalRow(NamedTuple):
+    goal: str
+    priority: int | None
+    forecast: str | None
+
+
+class TaskRow(NamedTuple):
+    title: str
+    priority: int
+    due_date: datetime | None
+    completed: bool
+    goal_title: str | None
+
+
+class EventRow(NamedTuple):
+    summary: str
+    start_time: datetime | None
+    end_time: datetime | None
+
+
+_GOAL, _TASK, _EVENT = 0, 1, 2
+
+
+def _kind(kind: int):
+    # Inline rather than a bind parameter, which Postgres can't type in a select list
+    return literal_column(str(kind), Integer)
+
+
+def _analysis_inputs_query(user_id: int, day: date | None = None):
+    """
+    One UNION ALL over goals, tasks and events, selecting only the columns
+    the prompt uses. Every branch has the same columns: kind, rank, id,
+    text, priority, extra (forecast or goal title), start, end, completed.
+    Rows come back goals (highest priority first), then tasks (highest
+    priority first, soonest due first), then events in start order.
+    """
+    # Result types come from the first branch, so its NULLs are typed for the rest
+    goals = select(
+        _kind(_GOAL).label("kind"),
+        (-func.coalesce(Goal.priority, 0)).label("rank"),
+        Goal.id.label("id"),
+        Goal.goal.label("text"),
+        Goal.priority.label("priority"),
+        cast(Goal.forecast, String).label("extra"),
+        type_coerce(null(), DateTime).label("start"),
+        type_coerce(null(), DateTime).label("end"),
+        type_coerce(null(), Boolean).label("completed"),
+    ).where(Goal.accomplished == False, Goal.user_id == user_id)
+
+    # Joined on the goal's owner too: older tasks may point at another user's goal
+    top_tasks = select(
+        (-Task.priority).label("rank"),
+        Task.id,
+        Task.title,
+        Task.priority,
+        Goal.goal,
+        Task.due_date,
+        Task.completed,
+    ).outerjoin(Goal, and_(Task.goal_id == Goal.id, Goal.user_id == user_id)).where(
         Task.user_id == user_id
-    ).order_by(Task.priority.desc()).limit(10).all()
-
-    est = pytz.timezone("US/Eastern")
-    today_start = datetime.now(est).replace(hour=0, minute=0, second=0, microsecond=0)
-    today_end = today_start + timedelta(days=1)
-    events = db.query(Event).filter(
-        Event.start_time >= today_start,
-        Event.start_time < today_end,
+    ).order_by(Task.priority.desc(), Task.id).limit(10).subquery()
+    tasks = select(_kind(_TASK), *top_tasks.c[:6], null(), top_tasks.c.completed)
+
+    day_start, day_end = day_window(day)
+    events = select(
+        _kind(_EVENT), literal_column("0", Integer), Event.id, Event.summary, null(), null(),
+        Event.start_time, Event.end_time, null(),
+    ).where(
+        Event.start_time >= day_start,
+        Event.start_time < day_end,
         Event.user_id == user_id
     )
 
-    tasks_out = [TaskRead.model_validate(t).model_dump() for t in tasks]
-    goals_out = [GoalRead.model_validate(g).model_dump() for g in goals]
-    events_out = [EventRead.model_validate(e).model_dump() for e in events]
+    query = union_all(goals, tasks, events).subquery()
+    return select(query).order_by(query.c.kind, query.c.rank, query.c.start, query.c.id)
+
+
+async def load_analysis_inputs(db, user_id: int, day: date | None = None):
+    """
+    Load the user's open goals, top tasks and the events of day (today by
+    default) as GoalRow,
+    TaskRow and EventRow tuples, in a single query and without building
+    ORM objects or schemas.
+    """
+    # On the session's connection, so rows skip the ORM result layer
+    rows = await (await db.connection()).execute(_analysis_inputs_query(user_id, day))
+
+    goals_out, tasks_out, events_out = [], [], []
+    for kind, _, _, text, priority, extra, start, end, completed in rows:
+        if kind == _GOAL:
+            goals_out.append(GoalRow(text, priority, extra))
+        elif kind == _TASK:
+            tasks_out.append(TaskRow(text, priority, start, bool(completed), extra))
+        else:
+            events_out.append(EventRow(text, start, end))
+
+    return goals_out, tasks_out, events_out
 
-    prompt = f"""
-    Unaccomplished Goals:
-    {goals_out}
 
-    Top Tasks for the Week (max 10, by priority):
-    {tasks_out}
+def _cache_key(user_id: int, prompt: Prompt) -> str:
+    # Keyed on the rendered prompt: items cut to fit the budget don't change the answer
+    return analysis_cache_key(user_id, MODEL, PROMPT_VERSION, prompt=prompt.text)
 
-    Today's Planned Work:
-    {events_out}
 
-    Please analyze whether today's work align with my tasks and goals,
-    and point out anything that looks like busywork rather than working towards my tasks , and thus my important goals ! The idea is to identify 'busyness' (bad) versus 'business' (good). 
+async def load_analysis_inputs_async(user_id: int, day: date | None = None):
+    """Run load_analysis_inputs with its own short-lived async session."""
+    async with AsyncSessionLocal() as db:
+        return await load_analysis_inputs(db, user_id, day)
 
-    Finish with a sentence that gives a final verdict on if today's plan is good, and if not what changes to make to nudge me towards acutally accomplishing my goals. Identify any flaws on the daily work side, how tasks are organized and related to goals, or even hihg level goals.
 
+async def gpt_analyze(user_id: int, day: date | None = None) -> tuple[str, Prompt]:
     """
+    Analyze user's goals, tasks, and events (today's, or day's) using GPT.
+    Returns the analysis and the prompt it was made from.
+    """
+    prompt = build_prompt(*await load_analysis_inputs_async(user_id, day), day=day)
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=1500,
-    )
+    key = _cache_key(user_id, prompt)
+    analysis = await analysis_cache.get_or_compute_async(key, lambda: _complete(prompt))
+    return analysis, prompt
+
+
+def uses_gpt(score: DayScore, narrative: bool = False) -> bool:
+    """Whether a day's analysis goes to GPT: always with narrative, else only when its score is ambiguous."""
+    return narrative or score.ambiguous
+
+
+async def summarize_day(user_id: int, day: date) -> str:
+    """
+    Short GPT summary of one day, the map step of a range analysis. Cached
+    like any analysis, by the day's prompt, so an unchanged day is reused.
+    """
+    prompt = build_prompt(*await load_analysis_inputs_async(user_id, day), day=day,
+                          instructions=DAY_SUMMARY_INSTRUCTIONS)
+
+    key = _cache_key(user_id, prompt)
+    return await analysis_cache.get_or_compute_async(key, lambda: _complete(prompt, DAY_SUMMARY_MAX_TOKENS))
+
+
+async def summarize_days(user_id: int, scores: list[DayScore], narrative: bool = False) -> list[str]:
+    """
+    One summary per scored day, in order. Clear-cut days are summarized
+    locally unless narrative is set; the rest go to GPT, at most
+    ANALYSIS_DAY_CONCURRENCY at a time.
+    """
+    slots = asyncio.Semaphore(ANALYSIS_DAY_CONCURRENCY)
+
+    async def one(score: DayScore) -> str:
+        if not uses_gpt(score, narrative):
+            return summarize(score)
+        async with slots:
+            return await summarize_day(user_id, score.day)
+
+    return list(await asyncio.gather(*(one(score) for score in scores)))
+
+
+def range_prompt(scores: list[DayScore], summaries: list[str]) -> Prompt:
+    """The reduce-step prompt combining the day summaries of a range analysis."""
+    headings = []
+    for score in scores:
+        if score.score is None:
+            headings.append(f"{score.day:%a %Y-%m-%d} (nothing scheduled)")
+        else:
+            hours = score.scheduled_minutes / 60
+            headings.append(f"{score.day:%a %Y-%m-%d} ({score.score:.0%} of {hours:.1f} scheduled hours linked)")
+    return build_range_prompt(list(zip(headings, summaries)))
+
+
+async def analyze_range(user_id: int, scores: list[DayScore], narrative: bool = False) -> tuple[str, list[str], Prompt]:
+    """
+    Map-reduce analysis of several days: a summary per day (see
+    summarize_days), then one GPT call that combines them into a verdict
+    for the whole range. Returns the verdict, the day summaries and the
+    reduce-step prompt. The verdict is cached by that prompt, so a range
+    whose days are all unchanged costs no OpenAI call, and one changed day
+    costs its own summary plus the reduce step.
+    """
+    summaries = await summarize_days(user_id, scores, narrative)
+    prompt = range_prompt(scores, summaries)
+
+    key = _cache_key(user_id, prompt)
+    analysis = await analysis_cache.get_or_compute_async(key, lambda: _complete(prompt))
+    return analysis, summaries, prompt
+
+
+async def stream_analysis(user_id: int, prompt: Prompt):
+    """
+    Async generator yielding the analysis text piece by piece as OpenAI
+    streams it. A cached analysis is yielded in one piece; a completed
+    stream is cached for later requests.
+    """
+    key = _cache_key(user_id, prompt)
+    cached = await analysis_cache.get_async(key)
+    if cached is not None:
+        yield cached
+        return
+
+    async with _llm_slots:
+        stream = await async_client.chat.completions.create(
+            model=MODEL,
+            messages=[{"role": "user", "content": prompt.text}],
+            max_tokens=MAX_TOKENS,
+            stream=True,
+        )
+
+        parts = []
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+
+    await analysis_cache.set_async(key, "".join(parts))
+
+
+async def _complete(prompt: Prompt, max_tokens: int = MAX_TOKENS) -> str:
+    async with _llm_slots:
+        response = await async_client.chat.completions.create(
+            model=MODEL,
+            messages=[{"role": "user", "content": prompt.text}],
+            max_tokens=max_tokens,
+        )
 
-    return response.choices[0].message.content
\ No newline at end of file
+    return response.choices[0].message.content
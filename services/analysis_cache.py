@@ -0,0 +1,141 @@
+"""
+Cache for GPT analysis results.
+
+Entries are keyed by a content hash of the user, model, prompt version and
+the rendered prompt text, so a repeat analysis of an unchanged prompt is
+served without calling OpenAI. In-memory entries expire
+after a TTL and are evicted LRU-first; optionally they are also written to a
+small SQLite file so they survive restarts. Concurrent requests for the same
+key share a single upstream call. Async callers go through get_async /
+set_async, which run the SQLite reads and writes on a worker thread so they
+never block the event loop.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+ANALYSIS_CACHE_TTL = int(os.getenv("ANALYSIS_CACHE_TTL", 60 * 60))  # seconds
+ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", 256))
+ANALYSIS_CACHE_PATH = os.getenv("ANALYSIS_CACHE_PATH")  # unset = memory only
+
+
+def analysis_cache_key(user_id: int, model: str, prompt_version: int, **content) -> str:
+    """Stable hash of the analysis inputs."""
+    payload = json.dumps(
+        {"user_id": user_id, "model": model, "prompt_version": prompt_version, **content},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    def __init__(self, ttl: int = ANALYSIS_CACHE_TTL, max_entries: int = ANALYSIS_CACHE_SIZE,
+                 path: str | None = ANALYSIS_CACHE_PATH):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS analysis_cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if now - created_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    return value
+                del self._entries[key]
+
+            if self._conn is None:
+                return None
+
+            row = self._conn.execute(
+                "SELECT value, created_at FROM analysis_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if now - created_at >= self.ttl:
+                self._conn.execute("DELETE FROM analysis_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+            self._remember(key, created_at, value)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        created_at = time.time()
+        with self._lock:
+            self._remember(key, created_at, value)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO analysis_cache (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, value, created_at),
+                )
+                # Expired rows are dead weight on disk
+                self._conn.execute(
+                    "DELETE FROM analysis_cache WHERE created_at < ?", (created_at - self.ttl,)
+                )
+                self._conn.commit()
+
+    async def get_async(self, key: str) -> str | None:
+        """get() for async callers; touching the SQLite file happens on a worker thread."""
+        if self._conn is None:
+            return self.get(key)
+        return await asyncio.to_thread(self.get, key)
+
+    async def set_async(self, key: str, value: str) -> None:
+        """set() for async callers; touching the SQLite file happens on a worker thread."""
+        if self._conn is None:
+            self.set(key, value)
+            return
+        await asyncio.to_thread(self.set, key, value)
+
+    async def get_or_compute_async(self, key: str, compute) -> str:
+        """
+        Return the cached value for key, or await compute() once to produce it.
+        Callers arriving while compute() runs await that same task instead of
+        starting their own. Failures are not cached.
+        """
+        value = await self.get_async(key)
+        if value is not None:
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._compute_and_store(key, compute))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shielded so one client disconnecting doesn't cancel the shared call
+        return await asyncio.shield(task)
+
+    async def _compute_and_store(self, key: str, compute) -> str:
+        value = await compute()
+        await self.set_async(key, value)
+        return value
+
+    def _remember(self, key: str, created_at: float, value: str) -> None:
+        """Store in memory, evicting least recently used entries. Call with _lock held."""
+        self._entries[key] = (created_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
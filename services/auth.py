@@ -1,3 +1,6 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 import bcrypt
@@ -9,15 +12,29 @@ SECRET_KEY = "busyness-buster-local-secret-key-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours for local convenience
 
+# bcrypt cost factor: each step doubles hashing time (12 is about 250 ms per check).
+# Stored hashes with another cost are rehashed at the user's next login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+# Threads for hashing and checking passwords, kept apart from the pool that serves
+# every other route so a burst of logins can only queue up behind each other
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+
+_password_executor = ThreadPoolExecutor(max_workers=PASSWORD_WORKERS, thread_name_prefix="password")
+
 
 def hash_password(password: str) -> str:
     """Hash a plain text password using bcrypt."""
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
 
+# Checked against when the username doesn't exist, so both cases take as long.
+# Made at import so no login pays for hashing it.
+_dummy_hash = hash_password("dummy-password")
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain text password against a hashed password."""
     password_bytes = plain_password.encode('utf-8')
@@ -25,6 +42,33 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
+def needs_rehash(hashed_password: str) -> bool:
+    """True if the hash was made with a cost other than BCRYPT_ROUNDS ("$2b$<cost>$...")."""
+    try:
+        return int(hashed_password.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the password executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str | None) -> bool:
+    """
+    verify_password on the password executor. With hashed_password=None
+    (unknown user) it checks against a dummy hash and returns False, so
+    response times don't reveal which usernames exist.
+    """
+    if hashed_password is None:
+        await verify_password_async(plain_password, _dummy_hash)
+        return False
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, verify_password, plain_password, hashed_password)
+
+
 def create_access_token(user_id: int, username: str) -> str:
     """Create a JWT access token for a user."""
     expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -0,0 +1,202 @@
+from pydantic import ValidationError
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+LOOKUP_CHUNK_SIZE = 5000
+
+
+def _chunks(items: list, size: int = LOOKUP_CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'data'}: {err['msg']}" for err in error.errors()
+    )
+
+
+def _begin_write(db) -> None:
+    """
+    pysqlite only opens a transaction at the first INSERT/UPDATE/DELETE, and
+    RELEASE of an outermost SAVEPOINT commits. Open the transaction up front
+    so the per-stage savepoints nest inside it and rollback() undoes them.
+    """
+    connection = db.connection()
+    if connection.dialect.name == "sqlite" and not connection.connection.dbapi_connection.in_transaction:
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def _run_stage(db, items: list, bulk, single) -> dict:
+    """
+    Write a stage with one bulk statement. If a row violates a constraint,
+    redo the stage row by row (each in its own savepoint) to find out which.
+    Returns {index: error} for the rows that failed.
+    """
+    if not items:
+        return {}
+    try:
+        with db.begin_nested():
+            bulk(items)
+        return {}
+    except IntegrityError:
+        pass
+
+    errors = {}
+    for item in items:
+        try:
+            with db.begin_nested():
+                single(item)
+        except IntegrityError as e:
+            errors[item[0]] = str(e.orig)
+    return errors
+
+
+def apply_batch(db, model, create_schema, update_schema, user_id: int, operations,
+                atomic: bool = True, before_delete=None, references: dict | None = None) -> dict:
+    """
+    Apply mixed create/update/delete operations for one user in a single
+    transaction: one bulk INSERT, one bulk UPDATE by primary key and one
+    DELETE per chunk of ids.
+
+    Each item is validated against create_schema/update_schema on its own and
+    gets its own result. With atomic=True any failure writes nothing;
+    otherwise the valid items are applied. The caller commits when the
+    result says committed, and rolls back otherwise.
+
+    before_delete(db, ids) runs before each chunk of deletes (e.g. to
+    detach rows that reference them).
+
+    references maps a column to the model it points at, e.g.
+    {"goal_id": Goal}: creates and updates may only set it to one of the
+    user's own rows (422 otherwise).
+    """
+    results = [None] * len(operations)
+    creates = []  # (index, row)
+    updates = []  # (index, {"id": ..., changed columns})
+    deletes = []  # (index, id)
+    seen_ids = {}
+
+    def fail(index, operation, status, error):
+        results[index] = {"index": index, "op": operation.op, "status": status, "id": operation.id, "error": error}
+
+    for index, operation in enumerate(operations):
+        if operation.op == "create":
+            if operation.id is not None:
+                fail(index, operation, 422, "id is not allowed for create")
+                continue
+            try:
+                payload = create_schema.model_validate(operation.data or {})
+            except ValidationError as e:
+                fail(index, operation, 422, _validation_message(e))
+                continue
+            creates.append((index, {**payload.model_dump(), "user_id": user_id}))
+            continue
+
+        if operation.id is None:
+            fail(index, operation, 422, f"id is required for {operation.op}")
+            continue
+        if operation.id in seen_ids:
+            fail(index, operation, 409, f"id {operation.id} is already used by operation {seen_ids[operation.id]}")
+            continue
+        seen_ids[operation.id] = index
+
+        if operation.op == "update":
+            try:
+                payload = update_schema.model_validate(operation.data or {})
+            except ValidationError as e:
+                fail(index, operation, 422, _validation_message(e))
+                continue
+            updates.append((index, {"id": operation.id, **payload.model_dump(exclude_unset=True)}))
+        else:
+            deletes.append((index, operation.id))
+
+    _begin_write(db)
+
+    # Updates and deletes may only touch the user's own rows
+    owned = set()
+    for chunk in _chunks(list(seen_ids)):
+        owned.update(db.execute(
+            select(model.id).where(model.user_id == user_id, model.id.in_(chunk))
+        ).scalars())
+    not_found = f"{model.__name__} not found"
+    for index, row in updates:
+        if row["id"] not in owned:
+            fail(index, operations[index], 404, not_found)
+    for index, row_id in deletes:
+        if row_id not in owned:
+            fail(index, operations[index], 404, not_found)
+
+    # Nor point at another user's rows
+    for column, target in (references or {}).items():
+        rows = [(index, row) for index, row in creates + updates
+                if results[index] is None and row.get(column) is not None]
+        targets = set()
+        for chunk in _chunks(list({row[column] for _, row in rows})):
+            targets.update(db.execute(
+                select(target.id).where(target.user_id == user_id, target.id.in_(chunk))
+            ).scalars())
+        for index, row in rows:
+            if row[column] not in targets:
+                fail(index, operations[index], 422, f"{column}: {target.__name__} not found")
+    creates = [(index, row) for index, row in creates if results[index] is None]
+    updates = [(index, row) for index, row in updates if results[index] is None]
+    deletes = [(index, row_id) for index, row_id in deletes if results[index] is None]
+
+    if not (atomic and any(results)):
+        create_ids = {}
+
+        def insert_all(items):
+            ids = db.execute(
+                insert(model).returning(model.id, sort_by_parameter_order=True), [row for _, row in items]
+            ).scalars().all()
+            create_ids.update(zip((index for index, _ in items), ids))
+
+        def insert_one(item):
+            create_ids[item[0]] = db.execute(insert(model).returning(model.id), item[1]).scalar_one()
+
+        def delete_ids(ids):
+            for chunk in _chunks(ids):
+                if before_delete is not None:
+                    before_delete(db, chunk)
+                db.execute(delete(model).where(model.user_id == user_id, model.id.in_(chunk)))
+
+        # Rows with nothing to change need no UPDATE
+        changed = [(index, row) for index, row in updates if len(row) > 1]
+        errors = _run_stage(db, creates, insert_all, insert_one)
+        errors.update(_run_stage(
+            db, changed,
+            lambda items: db.execute(update(model), [row for _, row in items]),
+            lambda item: db.execute(update(model), [item[1]]),
+        ))
+        errors.update(_run_stage(
+            db, deletes,
+            lambda items: delete_ids([row_id for _, row_id in items]),
+            lambda item: delete_ids([item[1]]),
+        ))
+
+        for index, error in errors.items():
+            fail(index, operations[index], 409, error)
+        for index, _ in creates:
+            if results[index] is None:
+                results[index] = {"index": index, "op": "create", "status": 201, "id": create_ids[index], "error": None}
+        for index, row in updates:
+            if results[index] is None:
+                results[index] = {"index": index, "op": "update", "status": 200, "id": row["id"], "error": None}
+        for index, row_id in deletes:
+            if results[index] is None:
+                results[index] = {"index": index, "op": "delete", "status": 204, "id": row_id, "error": None}
+
+    failed = sum(1 for result in results if result is not None and result["error"])
+    committed = not (atomic and failed)
+    if not committed:
+        for index, operation in enumerate(operations):
+            if results[index] is None or not results[index]["error"]:
+                fail(index, operation, 424, "Not applied: another operation in this atomic batch failed")
+
+    return {
+        "committed": committed,
+        "succeeded": len(operations) - failed if committed else 0,
+        "failed": failed,
+        "items": results,
+    }
@@ -0,0 +1,254 @@
+"""
+Local "busyness score" for a day's calendar.
+
+Each event summary is compared with the user's open task titles and goals
+by TF-IDF cosine similarity (NumPy, no model calls), computed only for
+event/reference pairs that share a term. An event is linked to
+its best match if the similarity reaches LINK_THRESHOLD; the score is the
+fraction of scheduled minutes spent in linked events. Scores at or above
+BUSYNESS_CLEAR_HIGH or at or below BUSYNESS_CLEAR_LOW are clear calls;
+anything between is ambiguous and worth a GPT analysis.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+import pytz
+from sqlalchemy import select
+
+from db import AsyncSessionLocal, Event, Goal, Task
+
+LINK_THRESHOLD = float(os.getenv("LINK_THRESHOLD", 0.2))  # cosine similarity
+BUSYNESS_CLEAR_LOW = float(os.getenv("BUSYNESS_CLEAR_LOW", 0.3))  # linked fraction
+BUSYNESS_CLEAR_HIGH = float(os.getenv("BUSYNESS_CLEAR_HIGH", 0.7))
+# Terms in more than this share of the references (and in over MIN_COMMON_REFS
+# of them) say little about which one an event belongs to; leaving them out
+# of the similarity keeps a common word from pairing every event with every task
+MAX_REF_SHARE = 0.5
+MIN_COMMON_REFS = 10
+SCORE_BLOCK_CELLS = 1 << 20  # events x references similarities held at once
+TIMEZONE = pytz.timezone("US/Eastern")
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset("""
+    a an and are as at be by for from in into is it of on or the to with w my our your me we i you
+    re via vs about over up out per am pm
+""".split())
+
+
+def today() -> date:
+    """The current date in the user's timezone."""
+    return datetime.now(TIMEZONE).date()
+
+
+def day_window(day: date | None = None) -> tuple[datetime, datetime]:
+    """Start and end of a calendar day (today by default) in the user's timezone."""
+    day = day or today()
+    start = TIMEZONE.localize(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def day_label(day: date) -> str:
+    """"today" for the current day in the user's timezone, else e.g. "Mon 2026-10-12"."""
+    return "today" if day == today() else f"{day:%a %Y-%m-%d}"
+
+
+def verdict_for(score: float | None) -> str:
+    """Verdict for a linked fraction of scheduled minutes (None with nothing scheduled)."""
+    if score is None:
+        return "empty"
+    if score >= BUSYNESS_CLEAR_HIGH:
+        return "business"
+    if score <= BUSYNESS_CLEAR_LOW:
+        return "busyness"
+    return "ambiguous"
+
+
+def terms(text: str) -> list[str]:
+    """Lowercased words without stopwords, plural "s" dropped ("meetings" -> "meeting")."""
+    return [
+        word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+        for word in _WORD_RE.findall(text.lower())
+        if word not in STOPWORDS
+    ]
+
+
+@dataclass
+class DayScore:
+    day: date
+    score: float | None  # linked fraction of scheduled minutes; None with nothing scheduled
+    verdict: str  # "business", "busyness", "ambiguous" or "empty"
+    scheduled_minutes: float
+    linked_minutes: float
+    blocks: list = field(default_factory=list)  # one dict per event, in start order
+
+    @property
+    def ambiguous(self) -> bool:
+        return self.verdict == "ambiguous"
+
+    def unlinked(self) -> list:
+        return [block for block in self.blocks if not block["linked"]]
+
+
+def _tfidf(docs: list[list[str]], vocab: dict) -> tuple:
+    """
+    (doc index, term id, weight) arrays of the L2-normalized TF-IDF vectors
+    of docs. vocab maps term -> id and is extended with new terms.
+    """
+    pair_docs, pair_terms = [], []
+    for i, doc in enumerate(docs):
+        for term in doc:
+            pair_docs.append(i)
+            pair_terms.append(vocab.setdefault(term, len(vocab)))
+    if not pair_docs:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0)
+
+    # Collapse repeats into (doc, term) counts
+    keys, counts = np.unique(np.array(pair_docs, dtype=np.int64) * len(vocab) + pair_terms, return_counts=True)
+    doc_idx, term_idx = np.divmod(keys, len(vocab))
+
+    df = np.bincount(term_idx, minlength=len(vocab))
+    idf = np.log((1 + len(docs)) / (1 + df)) + 1
+    weights = (1 + np.log(counts)) * idf[term_idx]
+    norms = np.sqrt(np.bincount(doc_idx, weights ** 2, minlength=len(docs)))
+    return doc_idx, term_idx, weights / norms[doc_idx]
+
+
+def best_matches(summaries: list[str], references: list[str]) -> tuple:
+    """
+    For each summary, the index of the most similar reference text and the
+    cosine similarity (0 when nothing shares a term). Identical summaries
+    are scored once.
+    """
+    if not references:
+        return np.zeros(len(summaries), dtype=np.int64), np.zeros(len(summaries))
+
+    unique = list(dict.fromkeys(summaries))
+    best_index = np.zeros(len(unique), dtype=np.int64)
+    best_similarity = np.zeros(len(unique))
+
+    ref_docs = [terms(text) for text in references]
+    # Document frequencies come from events and references together
+    doc_idx, term_idx, weights = _tfidf(ref_docs + [terms(text) for text in unique], {})
+    is_ref = doc_idx < len(ref_docs)
+
+    # Postings: the references that use each term, grouped by term
+    ref_df = np.bincount(term_idx[is_ref], minlength=int(term_idx.max(initial=-1)) + 1)
+    common = ref_df > max(MAX_REF_SHARE * len(references), MIN_COMMON_REFS)
+    posted = is_ref & ~common[term_idx]
+    order = np.argsort(term_idx[posted], kind="stable")
+    post_terms, post_refs, post_weights = term_idx[posted][order], doc_idx[posted][order], weights[posted][order]
+    event_rows, event_terms, event_weights = doc_idx[~is_ref] - len(ref_docs), term_idx[~is_ref], weights[~is_ref]
+    first = np.searchsorted(post_terms, event_terms, side="left")
+    count = np.searchsorted(post_terms, event_terms, side="right") - first
+
+    # Cosine similarity is a sum over shared terms, so each event term only
+    # touches the references in its postings. Sums go into a dense
+    # events x references block, a chunk of events at a time.
+    chunk = max(1, SCORE_BLOCK_CELLS // len(references))
+    for start in range(0, len(unique), chunk):
+        stop = min(start + chunk, len(unique))
+        lo, hi = np.searchsorted(event_rows, [start, stop])
+        counts = count[lo:hi]
+        offsets = np.repeat(first[lo:hi] - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+        cells = np.repeat(event_rows[lo:hi] - start, counts) * len(references) + post_refs[offsets]
+        products = np.repeat(event_weights[lo:hi], counts) * post_weights[offsets]
+        similarity = np.bincount(cells, products, minlength=(stop - start) * len(references))
+        similarity = similarity.reshape(stop - start, len(references))
+        best_index[start:stop] = similarity.argmax(axis=1)
+        best_similarity[start:stop] = np.minimum(similarity.max(axis=1), 1.0)
+
+    position = {summary: i for i, summary in enumerate(unique)}
+    order = np.fromiter((position[summary] for summary in summaries), dtype=np.int64, count=len(summaries))
+    return best_index[order], best_similarity[order]
+
+
+def score_day(day: date, events: list, tasks: list, goals: list, threshold: float = LINK_THRESHOLD) -> DayScore:
+    """
+    Score a day. events are (id, summary, start_time, end_time) rows in
+    start order, tasks (id, title) and goals (id, goal) rows. Events
+    without both times count as unscheduled (0 minutes).
+    """
+    references = [("task", row.id, row.title) for row in tasks] + [("goal", row.id, row.goal) for row in goals]
+    index, similarity = best_matches([row.summary or "" for row in events], [text for _, _, text in references])
+    minutes = np.array([
+        max((row.end_time - row.start_time).total_seconds() / 60, 0) if row.start_time and row.end_time else 0
+        for row in events
+    ])
+    linked = similarity >= threshold
+
+    scheduled = float(minutes.sum())
+    linked_minutes = float(minutes[linked].sum())
+    score = linked_minutes / scheduled if scheduled else None
+
+    blocks = []
+    for row, row_minutes, is_linked, best, row_similarity in zip(events, minutes, linked, index, similarity):
+        kind, ref_id, text = references[best] if is_linked else (None, None, None)
+        blocks.append({
+            "id": row.id,
+            "summary": row.summary,
+            "start_time": row.start_time,
+            "end_time": row.end_time,
+            "minutes": float(row_minutes),
+            "linked": bool(is_linked),
+            "similarity": round(float(row_similarity), 3),
+            "match_kind": kind,
+            "match_id": ref_id,
+            "match_title": text,
+        })
+    return DayScore(day, score, verdict_for(score), scheduled, linked_minutes, blocks)
+
+
+async def load_day_score(db, user_id: int, day: date | None = None) -> DayScore:
+    """Score the user's events on day (today by default) against their open tasks and goals."""
+    start, end = day_window(day)
+    events = (await db.execute(
+        select(Event.id, Event.summary, Event.start_time, Event.end_time)
+        .where(Event.user_id == user_id, Event.start_time >= start, Event.start_time < end)
+        .order_by(Event.start_time)
+    )).all()
+    tasks = (await db.execute(
+        select(Task.id, Task.title).where(Task.user_id == user_id, Task.completed == False)
+    )).all()
+    goals = (await db.execute(
+        select(Goal.id, Goal.goal).where(Goal.user_id == user_id, Goal.accomplished == False)
+    )).all()
+    return score_day(start.date(), events, tasks, goals)
+
+
+async def load_day_scores_async(user_id: int, days: list[date | None]) -> list[DayScore]:
+    """Run load_day_score for each day (None = today) on one short-lived async session."""
+    async with AsyncSessionLocal() as db:
+        return [await load_day_score(db, user_id, day) for day in days]
+
+
+def range_score(scores: list[DayScore]) -> float | None:
+    """Linked fraction of all scheduled minutes across several days."""
+    scheduled = sum(score.scheduled_minutes for score in scores)
+    return sum(score.linked_minutes for score in scores) / scheduled if scheduled else None
+
+
+def summarize(score: DayScore, max_blocks: int = 5) -> str:
+    """A short plain-text verdict for a clear-cut day, used instead of a GPT analysis."""
+    when = day_label(score.day)
+    if score.verdict == "empty":
+        return f"Nothing with a start and end time is scheduled {when}, so there is no plan to judge yet."
+
+    hours = score.scheduled_minutes / 60
+    lines = [f"{score.score:.0%} of the {hours:.1f} hours scheduled {when} are linked to your open tasks and goals."]
+    unlinked = sorted(score.unlinked(), key=lambda block: -block["minutes"])
+    if unlinked:
+        lines.append("Blocks not linked to any task or goal:")
+        lines += [f"- {block['summary']} ({block['minutes']:.0f} min)" for block in unlinked[:max_blocks]]
+        if len(unlinked) > max_blocks:
+            lines.append(f"- and {len(unlinked) - max_blocks} more")
+    if score.verdict == "business":
+        lines.append("Verdict: business. The plan is working towards your goals.")
+    else:
+        lines.append("Verdict: busyness. Most of the plan isn't tied to your goals; "
+                     "swap the biggest unlinked blocks for work on your top-priority tasks.")
+    return "\n".join(lines)
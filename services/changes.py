@@ -0,0 +1,116 @@
+"""
+Per-user change feed behind GET /changes/stream.
+
+Routers publish a change after they commit (task/goal created, updated or
+deleted, calendar sync finished) and every open stream for that user gets
+it through its own asyncio queue. publish() is thread-safe, since sync
+routes run in the threadpool and sync jobs on their own threads. A
+subscriber that falls SUBSCRIBER_QUEUE_SIZE changes behind gets a single
+"resync" event in place of its backlog and should reload everything.
+
+The feed is in-process: with several API workers, a stream only sees the
+changes made through its own worker.
+"""
+
+import asyncio
+import json
+import threading
+
+from sqlalchemy.orm import Session
+
+from services.batch import LOOKUP_CHUNK_SIZE
+
+SUBSCRIBER_QUEUE_SIZE = 1000
+KEEPALIVE_INTERVAL = 10  # seconds between keepalive comments on an idle stream
+
+
+class Subscription:
+    def __init__(self, user_id: int, loop: asyncio.AbstractEventLoop):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def _put(self, changes: list[dict]) -> None:
+        """Runs on the subscriber's event loop."""
+        for change in changes:
+            try:
+                self.queue.put_nowait(change)
+            except asyncio.QueueFull:
+                # Too far behind to catch up change by change
+                while not self.queue.empty():
+                    self.queue.get_nowait()
+                self.queue.put_nowait({"type": "resync"})
+                return
+
+
+_lock = threading.Lock()
+_subscribers: dict[int, set[Subscription]] = {}
+
+
+def subscribe(user_id: int) -> Subscription:
+    """Start receiving a user's changes. Call from the event loop that will read them."""
+    subscription = Subscription(user_id, asyncio.get_running_loop())
+    with _lock:
+        _subscribers.setdefault(user_id, set()).add(subscription)
+    return subscription
+
+
+def unsubscribe(subscription: Subscription) -> None:
+    with _lock:
+        subscriptions = _subscribers.get(subscription.user_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del _subscribers[subscription.user_id]
+
+
+def has_subscribers(user_id: int) -> bool:
+    with _lock:
+        return user_id in _subscribers
+
+
+def publish(user_id: int, *changes: dict) -> None:
+    """Send changes to every open stream of the user, in order."""
+    with _lock:
+        subscriptions = list(_subscribers.get(user_id, ()))
+    for subscription in subscriptions:
+        try:
+            subscription.loop.call_soon_threadsafe(subscription._put, list(changes))
+        except RuntimeError:
+            # Its event loop has shut down
+            unsubscribe(subscription)
+
+
+def change(kind: str, action: str, item_id: int, item=None, schema=None) -> dict:
+    """One change event, e.g. change("task", "updated", task.id, task, TaskRead)."""
+    data = schema.model_validate(item).model_dump(mode="json") if item is not None else None
+    return {"type": f"{kind}.{action}", "id": item_id, "data": data}
+
+
+def sync_change(job_id: str | None, status: str, counts: dict | None, error: str | None = None) -> dict:
+    """A calendar sync finished; events only change through syncs, so this stands in for them."""
+    return {"type": "sync.completed", "id": job_id, "data": {"status": status, "counts": counts, "error": error}}
+
+
+def publish_batch(db: Session, user_id: int, kind: str, model, schema, result: dict, options=()) -> None:
+    """Publish the changes a committed apply_batch() result made, re-reading created and updated rows."""
+    if not result["committed"] or not has_subscribers(user_id):
+        return
+
+    applied = [item for item in result["items"] if not item["error"]]
+    changed_ids = [item["id"] for item in applied if item["op"] != "delete"]
+    rows = {}
+    for i in range(0, len(changed_ids), LOOKUP_CHUNK_SIZE):
+        chunk = changed_ids[i:i + LOOKUP_CHUNK_SIZE]
+        rows.update((row.id, row) for row in db.query(model).options(*options).filter(model.id.in_(chunk)))
+
+    action = {"create": "created", "update": "updated", "delete": "deleted"}
+    publish(user_id, *(
+        change(kind, action[item["op"]], item["id"], rows.get(item["id"]), schema) for item in applied
+    ))
+
+
+def format_sse(data: dict, event: str | None = None) -> str:
+    """Format one server-sent event. Data is JSON so newlines in text are safe."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
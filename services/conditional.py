@@ -0,0 +1,85 @@
+"""
+HTTP conditional requests for single-item routes.
+
+ETags are built from the row version columns (bumped by every write), so
+checking one costs nothing beyond loading the row. GET routes answer
+If-None-Match / If-Modified-Since with a bare 304 and skip serialization;
+PATCH routes honour If-Match and refuse stale writes with 412.
+"""
+
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import HTTPException, Request, Response
+
+
+def make_etag(*rows) -> str:
+    """
+    Strong ETag over the versions of every row a representation is built
+    from, e.g. a task and the goal whose title it embeds.
+    """
+    return '"' + ".".join(str(row.version) for row in rows if row is not None) + '"'
+
+
+def last_modified(*rows) -> datetime | None:
+    stamps = [row.updated_at for row in rows if row is not None and row.updated_at is not None]
+    return max(stamps) if stamps else None
+
+
+def _etags(header: str) -> list[str]:
+    return [tag.strip().removeprefix("W/") for tag in header.split(",")]
+
+
+def _not_modified(request: Request, etag: str, modified: datetime | None) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison, as RFC 9110 asks for If-None-Match
+        tags = _etags(if_none_match)
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            return False
+        # HTTP dates have one-second resolution
+        return modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+    return False
+
+
+def validator_headers(etag: str, modified: datetime | None) -> dict:
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if modified is not None:
+        headers["Last-Modified"] = format_datetime(modified.replace(tzinfo=timezone.utc), usegmt=True)
+    return headers
+
+
+def conditional_get(request: Request, response: Response, item, etag: str, modified: datetime | None):
+    """
+    Return item for the route to serialize, with ETag/Last-Modified set, or
+    a bare 304 Not Modified if the client's copy is still current.
+    """
+    headers = validator_headers(etag, modified)
+    if _not_modified(request, etag, modified):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return item
+
+
+def check_if_match(request: Request, etag: str) -> bool:
+    """
+    Raise 412 if the request has an If-Match that the current ETag fails.
+    Returns whether an If-Match was given, so the write can be made
+    conditional on the version that was checked.
+    """
+    if_match = request.headers.get("if-match")
+    if if_match is None:
+        return False
+    tags = [tag.strip() for tag in if_match.split(",")]
+    # Strong comparison: weak tags never match
+    if "*" not in tags and etag not in tags:
+        raise HTTPException(status_code=412, detail="Precondition failed: the resource has changed")
+    return True
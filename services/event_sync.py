@@ -0,0 +1,313 @@
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+
+from dateutil import parser
+from sqlalchemy import delete, insert, select, update
+
+from db import CalendarSyncState, Event
+from services.google_calendar import SyncTokenExpired, iter_event_pages, sync_window
+
+LOOKUP_CHUNK_SIZE = 5000
+
+# Upper bound on calendars fetched at once (Google rate limits per user)
+MAX_FETCH_WORKERS = 4
+
+# Days a full fetch reaches past the requested window. The sync token it returns
+# then still covers the default window (which slides a day each day) for this long.
+SYNC_WINDOW_PADDING_DAYS = int(os.getenv("SYNC_WINDOW_PADDING_DAYS", 7))
+
+
+def parse_google_event(g_event: dict) -> dict:
+    """Turn a Google Calendar event resource into Event column values."""
+    # Parse RFC3339 strings safely
+    start_raw = g_event["start"].get("dateTime") or g_event["start"].get("date")
+    end_raw = g_event["end"].get("dateTime") or g_event["end"].get("date")
+
+    return {
+        "google_id": g_event["id"],
+        "summary": g_event.get("summary", "No Title"),
+        "start_time": parser.parse(start_raw) if start_raw else None,
+        "end_time": parser.parse(end_raw) if end_raw else None,
+    }
+
+
+def _as_stored(value):
+    """SQLite drops tzinfo on write, so compare datetimes the way they are stored."""
+    if value is not None and value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    return value
+
+
+def _is_unchanged(existing, row: dict) -> bool:
+    return (
+        existing.summary == row["summary"]
+        and _as_stored(existing.start_time) == _as_stored(row["start_time"])
+        and _as_stored(existing.end_time) == _as_stored(row["end_time"])
+    )
+
+
+def upsert_google_events(db, user_id: int, google_events, calendar_id: str = "primary") -> dict:
+    """
+    Upsert a batch of Google Calendar events from one of a user's calendars.
+
+    Existing rows are loaded with a single query, then new rows are written
+    with one bulk INSERT and changed rows with one bulk UPDATE. Rows whose
+    values match what is stored are left alone. The caller commits.
+    Returns inserted/updated/unchanged counts.
+    """
+    # Dedupe by google_id, last one wins (Google can repeat ids across pages)
+    rows = {}
+    for g_event in google_events:
+        row = parse_google_event(g_event)
+        rows[row["google_id"]] = row
+
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    if not rows:
+        return counts
+
+    # One SELECT per chunk of ids (keeps us under SQLite's bound-parameter limit)
+    existing = {}
+    google_ids = list(rows)
+    for i in range(0, len(google_ids), LOOKUP_CHUNK_SIZE):
+        result = db.execute(
+            select(Event.id, Event.google_id, Event.summary, Event.start_time, Event.end_time).where(
+                Event.user_id == user_id,
+                Event.calendar_id == calendar_id,
+                Event.google_id.in_(google_ids[i:i + LOOKUP_CHUNK_SIZE]),
+            )
+        )
+        existing.update((e.google_id, e) for e in result)
+
+    to_insert = []
+    to_update = []
+    for google_id, row in rows.items():
+        current = existing.get(google_id)
+        if current is None:
+            to_insert.append({**row, "user_id": user_id, "calendar_id": calendar_id})
+        elif _is_unchanged(current, row):
+            counts["unchanged"] += 1
+        else:
+            to_update.append({**row, "id": current.id})
+
+    if to_insert:
+        db.execute(insert(Event), to_insert)
+    if to_update:
+        # Bulk UPDATE by primary key (executemany)
+        db.execute(update(Event), to_update)
+
+    counts["inserted"] = len(to_insert)
+    counts["updated"] = len(to_update)
+    return counts
+
+
+class CalendarFetchError(Exception):
+    """Fetching from Google Calendar failed (as opposed to writing to the DB)."""
+
+    def __init__(self, calendar_id: str, error: Exception):
+        super().__init__(str(error))
+        self.calendar_id = calendar_id
+        self.error = error
+
+
+def apply_event_page(db, user_id: int, items, calendar_id: str = "primary") -> dict:
+    """Delete cancelled events and upsert the rest of one page of a calendar. The caller commits."""
+    cancelled_ids = [item["id"] for item in items if item.get("status") == "cancelled"]
+    live = [item for item in items if item.get("status") != "cancelled"]
+
+    counts = upsert_google_events(db, user_id, live, calendar_id)
+
+    counts["deleted"] = 0
+    for i in range(0, len(cancelled_ids), LOOKUP_CHUNK_SIZE):
+        result = db.execute(
+            delete(Event).where(
+                Event.user_id == user_id,
+                Event.calendar_id == calendar_id,
+                Event.google_id.in_(cancelled_ids[i:i + LOOKUP_CHUNK_SIZE]),
+            )
+        )
+        counts["deleted"] += result.rowcount
+
+    return counts
+
+
+def _fetch_calendar(out: queue.Queue, stop: threading.Event, calendar_id: str,
+                    sync_token: str | None, time_min: str, time_max: str) -> None:
+    """
+    Worker: page through one calendar, putting each page on the queue as
+    ("page", calendar_id, items, next_sync_token, full_sync) and finishing
+    with ("done", calendar_id) or ("error", calendar_id, exc).
+    """
+    try:
+        full_sync = sync_token is None
+        try:
+            pages = iter_event_pages(calendar_id, time_min, time_max, sync_token=sync_token)
+            for items, next_sync_token in pages:
+                if stop.is_set():
+                    return
+                out.put(("page", calendar_id, items, next_sync_token, full_sync))
+        except SyncTokenExpired:
+            # Token invalidated by Google: fall back to a full fetch of the window
+            full_sync = True
+            for items, next_sync_token in iter_event_pages(calendar_id, time_min, time_max):
+                if stop.is_set():
+                    return
+                out.put(("page", calendar_id, items, next_sync_token, full_sync))
+        out.put(("done", calendar_id))
+    except Exception as e:
+        out.put(("error", calendar_id, e))
+
+
+def _delete_missing(db, user_id: int, calendar_id: str, window: tuple, seen: set) -> int:
+    """
+    After a full fetch of a window, delete the calendar's stored events
+    starting in it that Google no longer returned. Returns how many.
+    """
+    window_start, window_end = window
+    result = db.execute(
+        select(Event.id, Event.google_id).where(
+            Event.user_id == user_id,
+            Event.calendar_id == calendar_id,
+            Event.start_time >= window_start,
+            Event.start_time < window_end,
+        )
+    )
+    stale_ids = [row.id for row in result if row.google_id not in seen]
+    for i in range(0, len(stale_ids), LOOKUP_CHUNK_SIZE):
+        db.execute(delete(Event).where(Event.id.in_(stale_ids[i:i + LOOKUP_CHUNK_SIZE])))
+    return len(stale_ids)
+
+
+def sync_calendars(db, user_id: int, calendar_ids=("primary",), start_date: date | None = None,
+                   end_date: date | None = None, full: bool = False, on_page=None) -> dict:
+    """
+    Sync one or more Google Calendars into the events table.
+
+    Calendars are fetched concurrently on a bounded thread pool and each page
+    is applied to the DB as soon as it arrives, so the DB writes overlap with
+    the remaining fetches. A calendar whose stored syncToken covers the date
+    window only fetches what changed. The others (or all of them with
+    full=True, or after Google expires a token) fetch the whole window plus
+    SYNC_WINDOW_PADDING_DAYS, and stored events in that span that the fetch
+    didn't return are deleted.
+    Fetch failures are raised as CalendarFetchError. The caller commits.
+
+    on_page, if given, is called with the running totals after each page.
+    """
+    calendar_ids = list(dict.fromkeys(calendar_ids))
+    time_min, time_max = sync_window(start_date, end_date)
+    window = (_as_stored(parser.parse(time_min)), _as_stored(parser.parse(time_max)))
+    # What a full fetch covers, and so the window its token tracks
+    fetch_min, fetch_max = sync_window(start_date, end_date, extra_days=SYNC_WINDOW_PADDING_DAYS)
+    fetch_window = (_as_stored(parser.parse(fetch_min)), _as_stored(parser.parse(fetch_max)))
+
+    states = {}
+    if not full:
+        states = {
+            state.calendar_id: state
+            for state in db.query(CalendarSyncState).filter(
+                CalendarSyncState.user_id == user_id,
+                CalendarSyncState.calendar_id.in_(calendar_ids),
+            )
+        }
+    # A token only tracks events in the window it was fetched for; a window
+    # that reaches past it needs a full fetch
+    tokens = {
+        calendar_id: state.sync_token
+        for calendar_id, state in states.items()
+        if state.sync_token and state.window_start is not None and state.window_end is not None
+        and state.window_start <= window[0] and window[1] <= state.window_end
+    }
+
+    totals = {"inserted": 0, "updated": 0, "unchanged": 0, "deleted": 0, "full_sync": False}
+    next_tokens = {}
+    seen = {calendar_id: set() for calendar_id in calendar_ids}
+    fully_fetched = set()
+
+    # Bounded so a slow DB can't let fetched pages pile up in memory
+    pages = queue.Queue(maxsize=MAX_FETCH_WORKERS * 2)
+    stop = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(calendar_ids)))
+    try:
+        for calendar_id in calendar_ids:
+            executor.submit(_fetch_calendar, pages, stop, calendar_id,
+                            tokens.get(calendar_id), fetch_min, fetch_max)
+
+        remaining = len(calendar_ids)
+        while remaining:
+            message = pages.get()
+            kind, calendar_id = message[0], message[1]
+
+            if kind == "error":
+                raise CalendarFetchError(calendar_id, message[2])
+            if kind == "done":
+                remaining -= 1
+                if calendar_id in fully_fetched:
+                    totals["deleted"] += _delete_missing(db, user_id, calendar_id, fetch_window, seen[calendar_id])
+                continue
+
+            items, next_sync_token, full_sync = message[2:]
+            counts = apply_event_page(db, user_id, items, calendar_id)
+            for key, value in counts.items():
+                totals[key] += value
+            totals["full_sync"] = totals["full_sync"] or full_sync
+            if full_sync:
+                fully_fetched.add(calendar_id)
+                seen[calendar_id].update(item["id"] for item in items if item.get("status") != "cancelled")
+            if next_sync_token:
+                # A full fetch's token covers what it fetched; an incremental one keeps its own
+                state = states.get(calendar_id)
+                token_window = fetch_window if full_sync else (state.window_start, state.window_end)
+                next_tokens[calendar_id] = (next_sync_token, token_window)
+            if on_page:
+                on_page(dict(totals))
+    finally:
+        stop.set()
+        # Unblock any worker waiting on a full queue
+        while not pages.empty():
+            pages.get_nowait()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    _save_sync_tokens(db, user_id, next_tokens)
+    return totals
+
+
+def sync_error_detail(error: Exception) -> tuple[int, str]:
+    """Map a sync failure to (HTTP status code, user-facing message)."""
+    if isinstance(error, CalendarFetchError):
+        error_msg = str(error).lower()
+
+        # Check if it's a stale token issue
+        if any(keyword in error_msg for keyword in [
+            "invalid_grant", "token_expired", "stale", "invalid_token", "unauthorized", "authentication"
+        ]):
+            return 401, "Google Calendar authentication expired. Please delete 'token.json' and try again to re-authenticate."
+        return 500, f"Failed to fetch events from Google Calendar: {str(error)}"
+
+    return 500, f"Failed to sync events to database: {str(error)}"
+
+
+def _save_sync_tokens(db, user_id: int, next_tokens: dict) -> None:
+    """Store each calendar's (sync token, window it covers) from next_tokens."""
+    if not next_tokens:
+        return
+
+    states = {
+        state.calendar_id: state
+        for state in db.query(CalendarSyncState).filter(
+            CalendarSyncState.user_id == user_id,
+            CalendarSyncState.calendar_id.in_(list(next_tokens)),
+        )
+    }
+    now = datetime.now(timezone.utc)
+    for calendar_id, (sync_token, (window_start, window_end)) in next_tokens.items():
+        state = states.get(calendar_id)
+        if state is None:
+            state = CalendarSyncState(user_id=user_id, calendar_id=calendar_id)
+            db.add(state)
+        state.sync_token = sync_token
+        state.window_start = window_start
+        state.window_end = window_end
+        state.last_synced_at = now
@@ -1,72 +1,184 @@
 import os
 import os.path
+import threading
+import httplib2
 import pytz
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 
 SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
 
+TOKEN_FILE = "token.json"
+
+# Refresh a little before Google's expiry so in-flight requests don't race it
+REFRESH_MARGIN = timedelta(minutes=5)
+
+# Process-wide cache: the parsed credentials, the built API client, and the
+# token.json contents/mtime they came from. Guarded by _lock.
+_lock = threading.Lock()
+_credentials = None
+_service = None
+_saved_token = None
+_token_mtime = None
+
+# httplib2.Http is not thread-safe, so each thread gets its own authorized Http
+_local = threading.local()
+
+
+def _token_file_mtime():
+    try:
+        return os.path.getmtime(TOKEN_FILE)
+    except OSError:
+        return None
+
+
+def _needs_refresh(creds) -> bool:
+    if not creds.valid:
+        return True
+    return creds.expiry is not None and creds.expiry - datetime.utcnow() < REFRESH_MARGIN
+
+
+def _save_token(creds) -> None:
+    """Write token.json only when the credentials actually changed."""
+    global _saved_token, _token_mtime
+
+    token = creds.to_json()
+    if token == _saved_token:
+        return
+    with open(TOKEN_FILE, "w") as f:
+        f.write(token)
+    _saved_token = token
+    _token_mtime = _token_file_mtime()
+
+
+def get_credentials():
+    """Return cached Google credentials, refreshing them only near expiry."""
+    global _credentials, _service, _saved_token, _token_mtime
+
+    with _lock:
+        # Reload if token.json was deleted or replaced behind our back
+        # (e.g. the user removed it to force re-authentication)
+        if _credentials is not None and _token_file_mtime() != _token_mtime:
+            _credentials = None
+            _service = None
+
+        creds = _credentials
+
+        # 1. Try loading saved user credentials (token.json)
+        if creds is None and os.path.exists(TOKEN_FILE):
+            creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
+            _saved_token = creds.to_json()
+            _token_mtime = _token_file_mtime()
+
+        # 2. If no valid creds (or about to expire), refresh or go through OAuth flow
+        if not creds or _needs_refresh(creds):
+            if creds and creds.refresh_token:
+                creds.refresh(Request())
+            else:
+                flow = InstalledAppFlow.from_client_secrets_file(
+                    "credentials.json",
+                    SCOPES
+                )
+                creds = flow.run_local_server(port=8080)
+                _service = None
+
+        # Save creds for next time (no-op if unchanged)
+        _save_token(creds)
+
+        _credentials = creds
+        return creds
+
+
 def get_calendar_service():
-    """Return an authenticated Google Calendar API service object."""
-    creds = None
-
-    # 1. Try loading saved user credentials (token.json)
-    if os.path.exists("token.json"):
-        creds = Credentials.from_authorized_user_file("token.json", SCOPES)
-
-    # 2. If no valid creds, refresh or go through OAuth flow
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(
-                "credentials.json",
-                SCOPES
+    """Return an authenticated Google Calendar API service object (cached per process)."""
+    global _service
+
+    creds = get_credentials()
+    with _lock:
+        if _service is None:
+            # Use the discovery document bundled with google-api-python-client
+            # instead of fetching it over the network
+            _service = build(
+                "calendar", "v3",
+                credentials=creds,
+                static_discovery=True,
+                cache_discovery=False,
             )
-            creds = flow.run_local_server(port=8080)
+        return _service
 
-        # Save creds for next time
-        with open("token.json", "w") as token:
-            token.write(creds.to_json())
 
-    # 3. Build and return the Calendar API client
-    service = build("calendar", "v3", credentials=creds)
-    return service
+def authorized_http():
+    """Return this thread's authorized Http, rebuilt if the credentials changed."""
+    creds = get_credentials()
+    if getattr(_local, "credentials", None) is not creds:
+        _local.http = AuthorizedHttp(creds, http=httplib2.Http())
+        _local.credentials = creds
+    return _local.http
 
-def fetch_events():
-    """Fetch events for the current day in EST (America/New_York)."""
-    try:
-        service = get_calendar_service()
 
-        # Define timezone
-        est = pytz.timezone("America/New_York")
+class SyncTokenExpired(Exception):
+    """Google invalidated the stored syncToken (HTTP 410); a full sync is required."""
+
+
+# Google allows up to 2500 events per page; fewer pages means fewer round-trips
+PAGE_SIZE = 2500
+
+SYNC_TIMEZONE = "America/New_York"
+
+
+def sync_window(start_date: date | None = None, end_date: date | None = None, extra_days: int = 0):
+    """
+    Return (time_min, time_max) as RFC3339 strings for a date range in EST.
+
+    Defaults to the previous day through the next 7 days. end_date is
+    inclusive; extra_days extends the window past it.
+    """
+    est = pytz.timezone(SYNC_TIMEZONE)
+    today = datetime.now(est).date()
+    start_date = start_date or today - timedelta(days=1)
+    end_date = (end_date or today + timedelta(days=7)) + timedelta(days=extra_days)
+
+    # Midnight at the start of start_date through midnight after end_date
+    time_min = est.localize(datetime.combine(start_date, time.min))
+    time_max = est.localize(datetime.combine(end_date + timedelta(days=1), time.min))
+    return time_min.isoformat(), time_max.isoformat()
 
-        # Get "now" in EST
-        now_est = datetime.now(est)
 
-        # Start of today (midnight)
-        start_of_day = now_est.replace(hour=0, minute=0, second=0, microsecond=0)
+def iter_event_pages(calendar_id: str = "primary", time_min: str | None = None,
+                     time_max: str | None = None, sync_token: str | None = None):
+    """
+    Yield (items, next_sync_token) one page at a time for a calendar.
 
-        # End of today (23:59:59)
-        end_of_day = start_of_day + timedelta(days=1)
+    With sync_token only events changed since that token are returned
+    (including cancelled ones); otherwise everything between time_min and
+    time_max. next_sync_token is only set on the last page.
+    Raises SyncTokenExpired if Google no longer accepts the token.
+    """
+    service = get_calendar_service()
 
-        # Convert to RFC3339 format (Google Calendar API expects this)
-        time_min = start_of_day.isoformat()
-        time_max = end_of_day.isoformat()
+    params = {"calendarId": calendar_id, "singleEvents": True, "maxResults": PAGE_SIZE}
+    if sync_token:
+        # timeMin/timeMax/orderBy are not allowed together with syncToken
+        params["syncToken"] = sync_token
+    else:
+        params["timeMin"] = time_min
+        params["timeMax"] = time_max
 
-        events_result = service.events().list(
-            calendarId="primary",
-            timeMin=time_min,
-            timeMax=time_max,
-            singleEvents=True,
-            orderBy="startTime"
-        ).execute()
+    page_token = None
+    while True:
+        try:
+            events_result = service.events().list(pageToken=page_token, **params).execute(http=authorized_http())
+        except HttpError as e:
+            if sync_token and e.resp.status == 410:
+                raise SyncTokenExpired() from e
+            raise
 
-        return events_result.get("items", [])
-    
-    except Exception:
-        print("Try deleting token and try again.")
-        raise   # keeps original traceback
+        page_token = events_result.get("nextPageToken")
+        yield events_result.get("items", []), events_result.get("nextSyncToken")
+        if not page_token:
+            return
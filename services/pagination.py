@@ -0,0 +1,117 @@
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import DateTime, and_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(sort: str, values: list, row_id: int) -> str:
+    """Opaque cursor pointing just past the (sort values, id) of the last row returned."""
+    values = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps([sort, values, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, columns) -> tuple:
+    """Return (sort values, id) from a cursor made by encode_cursor for the same sort."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, values, row_id = json.loads(raw)
+        if cursor_sort != sort or len(values) != len(columns) or not isinstance(row_id, int):
+            raise InvalidCursor("Cursor does not match the requested sort")
+        values = [
+            datetime.fromisoformat(value) if value is not None and isinstance(column.type, DateTime) else value
+            for column, value in zip(columns, values)
+        ]
+    except InvalidCursor:
+        raise
+    except (ValueError, TypeError):
+        raise InvalidCursor("Malformed cursor")
+    return values, row_id
+
+
+def _after(column, value, descending: bool) -> list:
+    """Filters for values strictly after value in page order (NULLs sort lowest)."""
+    if value is None:
+        return [] if descending else [column.is_not(None)]
+    if descending:
+        return [column < value, column.is_(None)]
+    return [column > value]
+
+
+def _segments(columns, id_column, values, row_id, descending: bool) -> list:
+    """
+    Filters selecting the rows after (values, row_id), in page order.
+
+    Each one fixes a prefix of the sort key to the cursor's values and takes
+    a range on the next column, which the composite index can seek to
+    directly. A single OR'd filter (or a row-value comparison, which SQLite
+    only seeks on by its first column) would scan every row sharing the
+    cursor's leading value instead. NULLs sort before every value (the
+    SQLite default for ascending order), so they come first ascending and
+    last descending.
+    """
+    keys = list(zip(columns, values))
+    equal = [column.is_(None) if value is None else column == value for column, value in keys]
+
+    segments = [and_(*equal, id_column < row_id if descending else id_column > row_id)]
+    for depth in range(len(keys) - 1, -1, -1):
+        column, value = keys[depth]
+        segments += [and_(*equal[:depth], after) for after in _after(column, value, descending)]
+    return segments
+
+
+def _segment_queries(query, sort: str, columns, id_column, descending: bool, cursor: str | None) -> list:
+    """The query in page order, split into the segments after the cursor (see _segments)."""
+    if descending:
+        query = query.order_by(*(column.desc().nulls_last() for column in columns), id_column.desc())
+    else:
+        query = query.order_by(*(column.asc().nulls_first() for column in columns), id_column.asc())
+
+    if not cursor:
+        return [query]
+    values, row_id = decode_cursor(cursor, sort, columns)
+    return [query.filter(f) for f in _segments(columns, id_column, values, row_id, descending)]
+
+
+def _page(rows: list, sort: str, columns, limit: int):
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(sort, [getattr(last, column.key) for column in columns], last.id)
+
+
+def paginate(query, sort: str, columns, id_column, descending: bool, cursor: str | None, limit: int):
+    """
+    Keyset pagination: order by (*columns, id) and continue from the cursor
+    instead of using OFFSET, so every page costs an index seek no matter
+    how deep it is. Returns (rows, next_cursor); next_cursor is None on the
+    last page.
+    """
+    # One extra row tells us whether there is another page
+    rows = []
+    for segment in _segment_queries(query, sort, columns, id_column, descending, cursor):
+        rows += segment.limit(limit + 1 - len(rows)).all()
+        if len(rows) > limit:
+            break
+    return _page(rows, sort, columns, limit)
+
+
+async def paginate_async(db, statement, sort: str, columns, id_column, descending: bool, cursor: str | None, limit: int):
+    """paginate() for a select() statement run on an AsyncSession."""
+    rows = []
+    for segment in _segment_queries(statement, sort, columns, id_column, descending, cursor):
+        result = await db.execute(segment.limit(limit + 1 - len(rows)))
+        rows += result.unique().scalars().all()
+        if len(rows) > limit:
+            break
+    return _page(rows, sort, columns, limit)
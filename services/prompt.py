@@ -0,0 +1,167 @@
+"""
+Prompt building for the GPT analysis.
+
+Goals, tasks and events are rendered one per line in a compact format,
+without IDs, nulls or Python reprs, and the whole prompt is held to an
+input token budget. If the items don't fit, the least important ones are
+left out (lowest priority first, tasks before goals at a tie, the day's
+latest events last) and each section says how many it is missing.
+
+Analyses of a date range are map-reduce: each day gets a short summary
+from its own prompt (DAY_SUMMARY_INSTRUCTIONS), and build_range_prompt
+combines the summaries into one prompt for the overall verdict.
+
+Token counts are estimated offline with a tokenizer-shaped heuristic that
+errs on the high side, so the budget holds without fetching an encoding.
+"""
+
+import math
+import os
+import re
+from dataclasses import dataclass
+from datetime import date
+
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", 2000))  # estimated input tokens
+MAX_TITLE_CHARS = 120  # longer titles are cut with "…"
+
+INSTRUCTIONS = """\
+Analyze whether the day's planned work aligns with my tasks and goals. Point out anything that looks like busywork rather than progress on my tasks, and so on my important goals: 'busyness' (bad) versus 'business' (good).
+Flag any flaws in the daily plan, in how tasks are organized and tied to goals, or in the goals themselves.
+Finish with one sentence giving a verdict on the day's plan and, if it falls short, what to change to actually accomplish my goals."""
+
+DAY_SUMMARY_INSTRUCTIONS = """\
+Summarize in at most four sentences how the day's planned work lines up with my tasks and goals: name the blocks that move my goals forward and the ones that look like busywork.
+End with "Verdict: business" or "Verdict: busyness" for the day."""
+
+RANGE_INSTRUCTIONS = """\
+Above are summaries of each day in the period. Judge the period as a whole: is my time going to my tasks and goals ('business', good) or to busywork ('busyness', bad)?
+Name the recurring patterns across days, the days that went best and worst, and any goal that got no time at all.
+Finish with one sentence giving a verdict on the period and the most important change to make next."""
+
+LEGEND = "Format: P = priority (0-10, higher first); goal horizon in parentheses."
+
+# Words, digit groups (numbers split into 1-3 digit tokens), punctuation, line breaks
+_TOKEN_RE = re.compile(r" ?[^\W\d_]+| ?\d{1,3}|\n+|[^\w\s]")
+_CHARS_PER_WORD_TOKEN = 6
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimated token count of text; a little above what OpenAI's tokenizers give for English."""
+    count = 0
+    for piece in _TOKEN_RE.findall(text):
+        if piece[-1].isalpha():
+            count += math.ceil(len(piece.lstrip()) / _CHARS_PER_WORD_TOKEN)
+        else:
+            count += 1
+    return count
+
+
+@dataclass(frozen=True)
+class Prompt:
+    text: str
+    tokens: int  # estimated
+    items: int  # goals, tasks and events included
+    omitted: int  # items left out to fit the budget
+
+
+def _clip(title: str) -> str:
+    title = " ".join(title.split())
+    return title if len(title) <= MAX_TITLE_CHARS else title[:MAX_TITLE_CHARS - 1] + "…"
+
+
+def goal_line(goal) -> str:
+    line = f"- P{goal.priority or 0} {_clip(goal.goal)}"
+    return f"{line} ({goal.forecast})" if goal.forecast else line
+
+
+def task_line(task) -> str:
+    parts = [f"- P{task.priority} {_clip(task.title)}"]
+    if task.due_date:
+        parts.append(f"due {task.due_date:%a %Y-%m-%d}")
+    if task.goal_title:
+        parts.append(f"goal: {_clip(task.goal_title)}")
+    if task.completed:
+        parts.append("done")
+    return " | ".join(parts)
+
+
+def event_line(event) -> str:
+    start, end = event.start_time, event.end_time
+    if start is None:
+        when = "all day"
+    elif end is None:
+        when = f"{start:%H:%M}"
+    else:
+        when = f"{start:%H:%M}-{end:%H:%M}"
+    return f"- {when} {_clip(event.summary)}"
+
+
+@dataclass
+class _Section:
+    title: str
+    lines: list
+    costs: list
+    kept: list
+
+    def omitted(self) -> int:
+        return len(self.lines) - sum(self.kept)
+
+    def render(self) -> str:
+        body = [line for line, keep in zip(self.lines, self.kept) if keep]
+        if self.omitted():
+            body.append(f"- ({self.omitted()} more not shown)")
+        return "\n".join([f"{self.title}:", *(body or ["- none"])])
+
+
+def _section(title: str, lines: list[str]) -> _Section:
+    return _Section(title, lines, [estimate_tokens("\n" + line) for line in lines], [True] * len(lines))
+
+
+def build_prompt(goals_out, tasks_out, events_out, budget: int = PROMPT_TOKEN_BUDGET,
+                 day: date | None = None, instructions: str = INSTRUCTIONS) -> Prompt:
+    """
+    Prompt for the analysis of goals_out / tasks_out / events_out (the
+    GoalRow / TaskRow / EventRow records load_analysis_inputs returns, or
+    anything with the same attributes), at most about budget tokens long.
+    The events are today's unless day is given.
+    """
+    goals = _section("Unaccomplished goals", [goal_line(g) for g in goals_out])
+    tasks = _section("Top tasks (max 10, by priority)", [task_line(t) for t in tasks_out])
+    events = _section("Today's planned work" if day is None else f"Planned work on {day:%a %Y-%m-%d}",
+                      [event_line(e) for e in events_out])
+    sections = [goals, tasks, events]
+
+    # Least important first: tasks before goals at equal priority (goals are
+    # what the plan is judged against), and events last, latest of the day first.
+    # Within a priority the items listed last go first, so what is left is a
+    # prefix of each list as displayed.
+    candidates = sorted(
+        [(t.priority, 0, -i, tasks) for i, t in enumerate(tasks_out)]
+        + [(g.priority or 0, 1, -i, goals) for i, g in enumerate(goals_out)]
+        + [(math.inf, 2, -i, events) for i in range(len(events_out))],
+        key=lambda candidate: candidate[:3],
+    )
+
+    total = estimate_tokens("\n\n".join([LEGEND, *(s.render() for s in sections), instructions]))
+    note = estimate_tokens("\n- (999 more not shown)")
+    for _, _, index, section in candidates:
+        if total <= budget:
+            break
+        index = abs(index)
+        if section.omitted() == 0:
+            total += note
+        section.kept[index] = False
+        total -= section.costs[index]
+
+    text = "\n\n".join([LEGEND, *(s.render() for s in sections), instructions])
+    omitted = sum(s.omitted() for s in sections)
+    return Prompt(text, estimate_tokens(text), len(goals_out) + len(tasks_out) + len(events_out) - omitted, omitted)
+
+
+def build_range_prompt(days: list[tuple[str, str]]) -> Prompt:
+    """
+    Reduce-step prompt over (heading, summary) pairs, one per day in order.
+    Not cut to a budget: each summary is already short.
+    """
+    text = "\n\n".join([*(f"{heading}:\n{summary.strip()}" for heading, summary in days), RANGE_INSTRUCTIONS])
+    return Prompt(text, estimate_tokens(text), len(days), 0)
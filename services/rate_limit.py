@@ -0,0 +1,86 @@
+"""
+Login attempt limits.
+
+Each login attempt counts against its (username, client IP) pair and its
+client IP over a sliding window; once either is used up, further attempts
+get 429 until the oldest attempt ages out. Attempts are counted when they
+start, not when they fail, so a parallel burst can't slip past the limit
+while its password checks are still running. A successful login then takes
+its IP attempt back and clears its pair, so only failures use up the
+budgets: many people logging in fine from one office IP never hit the limit,
+and a user who mistypes once isn't held to the stricter one.
+
+Counters live in process memory. Behind a reverse proxy every client shares
+the proxy's IP, so raise LOGIN_IP_MAX_ATTEMPTS (or run uvicorn with
+--proxy-headers) in that setup.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+LOGIN_WINDOW = float(os.getenv("LOGIN_WINDOW", 300))  # seconds
+LOGIN_MAX_ATTEMPTS = int(os.getenv("LOGIN_MAX_ATTEMPTS", 5))  # per username and IP
+LOGIN_IP_MAX_ATTEMPTS = int(os.getenv("LOGIN_IP_MAX_ATTEMPTS", 50))  # per IP, across usernames
+LIMITER_MAX_KEYS = 10_000  # counters kept before idle ones are swept
+
+
+class AttemptLimiter:
+    """Sliding-window attempt counter per key. Thread-safe."""
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self._lock = threading.Lock()
+        self._attempts: dict = {}
+
+    def hit(self, key) -> float:
+        """Record an attempt. Returns 0 if allowed, else seconds until the next one would be (not recorded)."""
+        now = time.monotonic()
+        with self._lock:
+            attempts = self._attempts.get(key)
+            if attempts is None:
+                if len(self._attempts) >= LIMITER_MAX_KEYS:
+                    self._sweep(now)
+                attempts = self._attempts[key] = deque()
+            while attempts and attempts[0] <= now - self.window:
+                attempts.popleft()
+            if len(attempts) >= self.limit:
+                return attempts[0] + self.window - now
+            attempts.append(now)
+            return 0.0
+
+    def forget(self, key) -> None:
+        with self._lock:
+            self._attempts.pop(key, None)
+
+    def undo(self, key) -> None:
+        """Take back one recorded attempt for key."""
+        with self._lock:
+            attempts = self._attempts.get(key)
+            if attempts:
+                attempts.pop()
+
+    def _sweep(self, now: float) -> None:
+        """Drop keys with no attempts left in the window. Call with _lock held."""
+        for key in [key for key, attempts in self._attempts.items() if not attempts or attempts[-1] <= now - self.window]:
+            del self._attempts[key]
+
+
+_pair_limiter = AttemptLimiter(LOGIN_MAX_ATTEMPTS, LOGIN_WINDOW)
+_ip_limiter = AttemptLimiter(LOGIN_IP_MAX_ATTEMPTS, LOGIN_WINDOW)
+
+
+def check_login_attempt(username: str, client_ip: str) -> float:
+    """Count a login attempt. Returns 0 if it may go ahead, else seconds to wait."""
+    retry_after = _ip_limiter.hit(client_ip)
+    if retry_after:
+        return retry_after
+    return _pair_limiter.hit((username.lower(), client_ip))
+
+
+def login_succeeded(username: str, client_ip: str) -> None:
+    """Stop counting a login that turned out to be legitimate."""
+    _ip_limiter.undo(client_ip)
+    _pair_limiter.forget((username.lower(), client_ip))
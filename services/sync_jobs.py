@@ -0,0 +1,159 @@
+"""
+In-process background jobs for Google Calendar sync.
+
+Jobs run on a small thread pool owned by the API process, so no external
+broker is needed. Each user has at most one queued/running sync at a time:
+submitting while one is active returns the active job instead of starting
+another. Finished jobs are kept in memory (up to JOB_HISTORY_LIMIT) so
+clients can poll for the result. POST /events/sync runs through here too
+(run_sync_job), so a user never has two syncs writing at once.
+"""
+
+import asyncio
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+
+from db import SessionLocal
+from services.changes import publish, sync_change
+from services.event_sync import sync_calendars, sync_error_detail
+
+SYNC_JOB_WORKERS = 2
+JOB_HISTORY_LIMIT = 200
+
+
+@dataclass
+class SyncJob:
+    id: str
+    user_id: int
+    calendar_ids: list[str]
+    start_date: date | None
+    end_date: date | None
+    full: bool
+    status: str = "queued"  # queued -> running -> succeeded | failed
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    pages: int = 0
+    counts: dict | None = None
+    error: str | None = None
+    error_status: int | None = None
+    future: Future | None = field(default=None, repr=False, compare=False)  # resolves when the job finishes
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+
+_executor = ThreadPoolExecutor(max_workers=SYNC_JOB_WORKERS, thread_name_prefix="sync-job")
+_lock = threading.Lock()
+_jobs: "OrderedDict[str, SyncJob]" = OrderedDict()
+_active_by_user: dict[int, str] = {}
+
+
+def submit_sync_job(user_id: int, calendar_ids, start_date: date | None = None,
+                    end_date: date | None = None, full: bool = False) -> tuple[SyncJob, bool]:
+    """
+    Queue a sync for a user. Returns (job, created); created is False when
+    an already queued/running job for the same user was returned instead.
+    """
+    with _lock:
+        active_id = _active_by_user.get(user_id)
+        if active_id is not None:
+            return _jobs[active_id], False
+
+        job = SyncJob(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            calendar_ids=list(calendar_ids),
+            start_date=start_date,
+            end_date=end_date,
+            full=full,
+        )
+        _jobs[job.id] = job
+        _active_by_user[user_id] = job.id
+        _prune()
+        # Under the lock, so a caller handed this job as the active one can always wait on it
+        job.future = _executor.submit(_run, job)
+
+    # Outside the lock: a future that is already done runs the callback right here
+    job.future.add_done_callback(lambda future: _on_cancelled(job, future))
+    return job, True
+
+
+async def run_sync_job(user_id: int, calendar_ids, start_date: date | None = None,
+                       end_date: date | None = None, full: bool = False) -> SyncJob:
+    """
+    Run a sync for a user and wait for it to finish. If another sync is
+    already active for the user, wait for that one first, then run this one.
+    """
+    while True:
+        job, created = submit_sync_job(user_id, calendar_ids, start_date, end_date, full=full)
+        # Shielded: a client that disconnects stops waiting, but the job still runs
+        await asyncio.shield(asyncio.wrap_future(job.future))
+        if created:
+            return job
+
+
+def get_sync_job(job_id: str, user_id: int) -> SyncJob | None:
+    """Return the job if it exists and belongs to the user."""
+    with _lock:
+        job = _jobs.get(job_id)
+    if job is None or job.user_id != user_id:
+        return None
+    return job
+
+
+def _prune() -> None:
+    """Drop the oldest finished jobs beyond JOB_HISTORY_LIMIT. Call with _lock held."""
+    excess = len(_jobs) - JOB_HISTORY_LIMIT
+    for job_id in [job_id for job_id, job in _jobs.items() if not job.active][:max(excess, 0)]:
+        del _jobs[job_id]
+
+
+def _on_cancelled(job: SyncJob, future: Future) -> None:
+    """
+    A job cancelled before it ran (e.g. by the pool shutting down) never
+    reaches _run's cleanup; fail it so the user's next sync isn't handed it.
+    """
+    if not future.cancelled():
+        return
+    job.status = "failed"
+    job.error_status, job.error = 503, "Sync was cancelled before it started"
+    job.finished_at = datetime.now(timezone.utc)
+    with _lock:
+        if _active_by_user.get(job.user_id) == job.id:
+            del _active_by_user[job.user_id]
+    publish(job.user_id, sync_change(job.id, job.status, job.counts, job.error))
+
+
+def _run(job: SyncJob) -> None:
+    job.status = "running"
+    job.started_at = datetime.now(timezone.utc)
+
+    def on_page(totals: dict) -> None:
+        job.pages += 1
+        job.counts = totals
+
+    db = SessionLocal()
+    try:
+        job.counts = sync_calendars(
+            db, job.user_id, job.calendar_ids, job.start_date, job.end_date,
+            full=job.full, on_page=on_page,
+        )
+        db.commit()
+        job.status = "succeeded"
+    except Exception as e:
+        db.rollback()
+        job.error_status, job.error = sync_error_detail(e)
+        job.status = "failed"
+    finally:
+        db.close()
+        job.finished_at = datetime.now(timezone.utc)
+        with _lock:
+            if _active_by_user.get(job.user_id) == job.id:
+                del _active_by_user[job.user_id]
+        publish(job.user_id, sync_change(job.id, job.status, job.counts, job.error))
@@ -0,0 +1,136 @@
+"""
+GET /analysis/stream end to end against benchmarks/stub_llm_server.py.
+
+The stub streams its canned analysis one word per chunk, so the route has to
+pass several text events through before the done event, and then leave the
+joined text in the analysis cache (including its SQLite file) under the key
+of the prompt it sent.
+
+Usage: python -m pytest tests
+"""
+
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+from datetime import timedelta
+
+import pytest
+import requests
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "benchmarks"))
+
+from _util import free_port, wait_for  # noqa: E402
+from stub_llm_server import CANNED_ANALYSIS  # noqa: E402
+
+
+def read_sse(lines) -> list[tuple[str | None, dict]]:
+    """(event name, data) for each server-sent event in a line iterator."""
+    events, name = [], None
+    for line in lines:
+        if line.startswith("event: "):
+            name = line[len("event: "):]
+        elif line.startswith("data: "):
+            events.append((name, json.loads(line[len("data: "):])))
+            name = None
+    return events
+
+
+@pytest.fixture(scope="module")
+def stub_url(tmp_path_factory):
+    workdir = tmp_path_factory.mktemp("stub")
+    port = free_port()
+    stub = subprocess.Popen(
+        [sys.executable, os.path.join(REPO_DIR, "benchmarks", "stub_llm_server.py"),
+         "--port", str(port), "--delay", "0", "--chunk-delay", "0"],
+        cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        url = f"http://127.0.0.1:{port}"
+        wait_for(f"{url}/calls")
+        yield url
+    finally:
+        stub.terminate()
+        stub.wait()
+
+
+@pytest.fixture(scope="module")
+def api(stub_url, tmp_path_factory):
+    # The app reads these at import, so set them before the first import of it
+    workdir = tmp_path_factory.mktemp("api")
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'busyness.db'}"
+    os.environ["ANALYSIS_CACHE_PATH"] = str(workdir / "analysis_cache.db")
+    os.environ["OPENAI_BASE_URL"] = f"{stub_url}/v1"
+    os.environ["OPENAI_API_KEY"] = "stub"
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import insert
+
+    from db import Event, Goal, Task, User, engine
+    from main import app
+    from services.auth import create_access_token
+    from services.busyness import day_window
+
+    start = day_window()[0].replace(tzinfo=None, hour=9)
+    with engine.begin() as conn:
+        user_id = conn.execute(insert(User).values(username="stream", hashed_password="x")).inserted_primary_key[0]
+        goal_id = conn.execute(insert(Goal).values(goal="Ship the quarterly review", priority=8,
+                                                   accomplished=False, user_id=user_id)).inserted_primary_key[0]
+        conn.execute(insert(Task).values(title="Draft the review outline", priority=7, goal_id=goal_id,
+                                         user_id=user_id))
+        conn.execute(insert(Event).values(google_id="evt-1", summary="Status sync", start_time=start,
+                                          end_time=start + timedelta(hours=1), user_id=user_id))
+
+    headers = {"Authorization": f"Bearer {create_access_token(user_id, 'stream')}"}
+    with TestClient(app) as client:
+        yield client, user_id, headers, os.environ["ANALYSIS_CACHE_PATH"]
+
+
+def stream(client, headers) -> list[tuple[str | None, dict]]:
+    with client.stream("GET", "/analysis/stream", params={"narrative": "true"}, headers=headers) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        return read_sse(response.iter_lines())
+
+
+def test_stream_sends_chunks_then_caches_the_analysis(api, stub_url):
+    client, user_id, headers, cache_path = api
+    from services.analysis import _cache_key, analysis_cache, load_analysis_inputs_async
+    from services.prompt import build_prompt
+
+    calls = requests.get(f"{stub_url}/calls").json()["calls"]
+    events = stream(client, headers)
+
+    texts = [data["text"] for name, data in events if name is None]
+    assert len(texts) > 1, "expected the analysis in several chunks"
+    assert "".join(texts).strip() == CANNED_ANALYSIS
+    assert [name for name, _ in events][-1] == "done"
+    done = events[-1][1]
+    assert done["source"] == "gpt"
+    assert done["prompt"]["omitted"] == 0
+    assert requests.get(f"{stub_url}/calls").json()["calls"] == calls + 1
+
+    # Cached under the key of the prompt the route sent, in memory and on disk
+    prompt = build_prompt(*client.portal.call(load_analysis_inputs_async, user_id))
+    key = _cache_key(user_id, prompt)
+    assert analysis_cache.get(key) == "".join(texts)
+    with sqlite3.connect(cache_path) as conn:
+        row = conn.execute("SELECT value FROM analysis_cache WHERE key = ?", (key,)).fetchone()
+    assert row == ("".join(texts),)
+
+
+def test_repeat_stream_is_served_from_cache(api, stub_url):
+    client, _, headers, _ = api
+    stream(client, headers)  # make sure the analysis is cached whatever ran first
+    calls = requests.get(f"{stub_url}/calls").json()["calls"]
+
+    events = stream(client, headers)
+
+    texts = [data["text"] for name, data in events if name is None]
+    assert "".join(texts).strip() == CANNED_ANALYSIS
+    assert len(texts) == 1
+    assert events[-1][0] == "done"
+    assert requests.get(f"{stub_url}/calls").json()["calls"] == calls
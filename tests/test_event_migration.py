@@ -0,0 +1,104 @@
+"""
+Upgrading a database created by the original schema, whose events table has
+UNIQUE(google_id), to per-user, per-calendar event ids.
+
+db.py migrates at import, so each step runs in a fresh interpreter pointed
+at the database through DATABASE_URL.
+
+Usage: python -m pytest tests
+"""
+
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What the original db.py created, with one synced event
+BASELINE_SCHEMA = """
+CREATE TABLE users (
+    id INTEGER NOT NULL, username VARCHAR NOT NULL, hashed_password VARCHAR NOT NULL,
+    PRIMARY KEY (id), UNIQUE (username)
+);
+CREATE TABLE goals (
+    id INTEGER NOT NULL, goal VARCHAR NOT NULL, priority INTEGER, accomplished BOOLEAN,
+    forecast VARCHAR(6), user_id INTEGER NOT NULL, PRIMARY KEY (id),
+    CONSTRAINT goal_priority_range CHECK (priority >= 0 AND priority <= 10),
+    FOREIGN KEY(user_id) REFERENCES users (id)
+);
+CREATE TABLE events (
+    id INTEGER NOT NULL, google_id VARCHAR NOT NULL, summary VARCHAR NOT NULL, start_time DATETIME,
+    end_time DATETIME, user_id INTEGER NOT NULL, PRIMARY KEY (id), UNIQUE (google_id),
+    FOREIGN KEY(user_id) REFERENCES users (id)
+);
+CREATE TABLE tasks (
+    id INTEGER NOT NULL, title VARCHAR NOT NULL, due_date DATETIME, priority INTEGER, completed BOOLEAN,
+    goal_id INTEGER, user_id INTEGER NOT NULL, PRIMARY KEY (id),
+    CONSTRAINT task_priority_range CHECK (priority >= 0 AND priority <= 10),
+    FOREIGN KEY(goal_id) REFERENCES goals (id), FOREIGN KEY(user_id) REFERENCES users (id)
+);
+INSERT INTO users VALUES (1, 'alice', 'x'), (2, 'bob', 'x');
+INSERT INTO events (google_id, summary, start_time, end_time, user_id)
+VALUES ('evt-shared', 'Team offsite', '2026-03-02 09:00:00.000000', '2026-03-02 17:00:00.000000', 1);
+"""
+
+# Syncs the event that is already stored for alice's primary calendar again,
+# then for bob and for alice's second calendar
+SYNC_SCRIPT = """
+import json
+from db import SessionLocal
+from services.event_sync import upsert_google_events
+
+event = {"id": "evt-shared", "summary": "Team offsite",
+         "start": {"dateTime": "2026-03-02T09:00:00"}, "end": {"dateTime": "2026-03-02T17:00:00"}}
+counts = []
+with SessionLocal() as db:
+    for user_id, calendar_id in [(1, "primary"), (2, "primary"), (1, "team@group.calendar.google.com")]:
+        counts.append(upsert_google_events(db, user_id, [event], calendar_id=calendar_id))
+        db.commit()
+print(json.dumps(counts))
+"""
+
+
+def run_app_code(db_path, code: str) -> str:
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{db_path}", "OPENAI_API_KEY": "unused"}
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPO_DIR, env=env,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+def test_baseline_events_table_is_rebuilt_and_keeps_its_rows(tmp_path):
+    db_path = tmp_path / "busyness.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(BASELINE_SCHEMA)
+
+    counts = json.loads(run_app_code(db_path, SYNC_SCRIPT).splitlines()[-1])
+
+    # The stored row is matched, the same id for another user or calendar is a new row
+    assert [c["inserted"] for c in counts] == [0, 1, 1]
+    assert counts[0]["unchanged"] == 1
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute(
+            "SELECT id, user_id, calendar_id, summary FROM events ORDER BY id"
+        ).fetchall()
+        assert rows == [
+            (1, 1, "primary", "Team offsite"),
+            (2, 2, "primary", "Team offsite"),
+            (3, 1, "team@group.calendar.google.com", "Team offsite"),
+        ]
+        # Still one row per user, calendar and event id
+        try:
+            conn.execute("INSERT INTO events (google_id, calendar_id, summary, user_id) "
+                         "VALUES ('evt-shared', 'primary', 'Duplicate', 2)")
+        except sqlite3.IntegrityError:
+            pass
+        else:
+            raise AssertionError("duplicate (user, calendar, google_id) was accepted")
+
+    # Migrating an already upgraded database changes nothing
+    run_app_code(db_path, "import db")
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM events").fetchone() == (3,)
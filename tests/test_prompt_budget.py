@@ -0,0 +1,48 @@
+"""
+The analysis prompt for a large user: services/prompt.py keeps it within
+PROMPT_TOKEN_BUDGET by leaving items out, far below the size of the old
+f-string prompt over the same rows (benchmarks/legacy_prompt.py).
+
+The app reads DATABASE_URL at import, so the prompts are built in a fresh
+interpreter with a database of its own.
+
+Usage: python -m pytest tests
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The default size of benchmarks/bench_prompt.py's user
+GOALS, TASKS, EVENTS = 200, 2000, 40
+
+PROMPT_SCRIPT = """
+import json, sys
+sys.path.insert(0, "benchmarks")
+from bench_prompt import load_inputs, seed
+from legacy_prompt import legacy_inputs, legacy_prompt
+from services.prompt import PROMPT_TOKEN_BUDGET, build_prompt, estimate_tokens
+
+user_id = seed(*map(int, sys.argv[1:4]))
+inputs = load_inputs(user_id)
+prompt = build_prompt(*inputs)
+print(json.dumps({"legacy_tokens": estimate_tokens(legacy_prompt(*legacy_inputs(user_id, *inputs))),
+                  "tokens": prompt.tokens, "omitted": prompt.omitted, "budget": PROMPT_TOKEN_BUDGET}))
+"""
+
+
+def test_large_user_prompt_fits_the_budget(tmp_path):
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp_path / 'busyness.db'}", "OPENAI_API_KEY": "unused"}
+    env.pop("PROMPT_TOKEN_BUDGET", None)
+    result = subprocess.run([sys.executable, "-c", PROMPT_SCRIPT, str(GOALS), str(TASKS), str(EVENTS)],
+                            cwd=REPO_DIR, env=env, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    measured = json.loads(result.stdout.splitlines()[-1])
+
+    assert measured["tokens"] <= measured["budget"]
+    assert measured["omitted"] > 0
+    # About 7x at the default budget
+    assert measured["tokens"] * 5 <= measured["legacy_tokens"]
@@ -0,0 +1,59 @@
+"""
+Refreshing the GUI's Active Items lists: SQL statements and time per refresh
+stay within what benchmarks/bench_refresh.py reports against, and the API
+sends the rows in the order the list views keep them in.
+
+The app reads DATABASE_URL at import, so the refresh runs in a fresh
+interpreter with a database of its own.
+
+Usage: python -m pytest tests
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "benchmarks"))
+
+from _util import free_port  # noqa: E402
+from app import goal_sort_key, task_sort_key  # noqa: E402
+
+TASKS = 2000
+GOALS = 50
+BUDGET_MS_PER_1000_TASKS = 250
+
+REFRESH_SCRIPT = """
+import json, random, sys
+sys.path.insert(0, "benchmarks")
+from bench_refresh import allowed_statements, refresh, seed, start_api
+
+server, api, user_id, counter = start_api(int(sys.argv[1]))
+seed(user_id, int(sys.argv[2]), int(sys.argv[3]), random.Random(42))
+refresh(api, counter)  # warm up
+tasks, goals, elapsed_ms, statements = refresh(api, counter)
+server.should_exit = True
+print(json.dumps({"tasks": tasks, "goals": goals, "ms": elapsed_ms, "statements": statements,
+                  "allowed": allowed_statements(len(tasks), len(goals))}))
+"""
+
+
+def test_refresh_stays_within_its_statement_and_time_budget(tmp_path):
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp_path / 'busyness.db'}", "OPENAI_API_KEY": "unused"}
+    result = subprocess.run(
+        [sys.executable, "-c", REFRESH_SCRIPT, str(free_port()), str(TASKS), str(GOALS)],
+        cwd=REPO_DIR, env=env, capture_output=True, text=True, timeout=300,
+    )
+    assert result.returncode == 0, result.stderr
+    measured = json.loads(result.stdout.splitlines()[-1])
+
+    assert len(measured["tasks"]) == TASKS
+    assert len(measured["goals"]) == GOALS
+    assert measured["statements"] <= measured["allowed"]
+    assert measured["ms"] <= BUDGET_MS_PER_1000_TASKS * TASKS / 1000
+    # The list views keep the API's order and place changed rows by these keys
+    assert measured["tasks"] == sorted(measured["tasks"], key=task_sort_key)
+    assert measured["goals"] == sorted(measured["goals"], key=goal_sort_key)
+